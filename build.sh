@@ -13,3 +13,8 @@ python manage.py collectstatic --no-input
 
 # Apply any outstanding database migrations
 python manage.py migrate
+
+
+# Create the shared cache table and rebuild the dashboard counters
+python manage.py createcachetable
+python manage.py reconcile_counters
@@ -1,7 +1,7 @@
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin
 
-from kitchen.models import DishType, Cook, Dish
+from kitchen.models import DishType, Cook, Dish, Job
 
 
 @admin.register(Dish)
@@ -24,3 +24,10 @@ class CookAdmin(UserAdmin):
 
 
 admin.site.register(DishType)
+
+
+@admin.register(Job)
+class JobAdmin(admin.ModelAdmin):
+    list_display = ["id", "task", "status", "attempts", "created_by", "created_at", "finished_at"]
+    list_filter = ["status", "task"]
+    readonly_fields = ["created_at", "started_at", "finished_at"]
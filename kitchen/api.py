@@ -0,0 +1,156 @@
+"""
+Read-only JSON API (v1) for dishes, cooks and dish types.
+
+Rows are serialized straight from ``values()`` dicts, never model
+instances. Clients may pick columns with ``?fields=a,b``, page with
+``?cursor=`` / ``?limit=`` and revalidate with ``If-None-Match``.
+"""
+import hashlib
+import json
+
+from django.core.paginator import InvalidPage
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import HttpResponse, JsonResponse
+from django.utils.cache import get_conditional_response, patch_cache_control
+
+from kitchen.models import Cook, Dish, DishType
+from kitchen.pagination import CURSOR_PARAM, KeysetPaginator
+
+DEFAULT_LIMIT = 50
+MAX_LIMIT = 200
+
+
+class Resource:
+    """
+    Describe how one model is exposed: ``fields`` maps public field names to
+    ORM lookups passed to ``values()``; ``cooks`` is the only to-many field
+    and is loaded with a separate query for the whole page.
+    """
+
+    def __init__(self, queryset, fields, ordering, default_fields=None):
+        self.queryset = queryset
+        self.fields = fields
+        self.ordering = ordering
+        self.default_fields = tuple(default_fields or fields)
+
+    def select_fields(self, request):
+        requested = request.GET.get("fields")
+        if not requested:
+            return self.default_fields
+        names = tuple(dict.fromkeys(name.strip() for name in requested.split(",") if name.strip()))
+        unknown = [name for name in names if name not in self.fields]
+        if unknown:
+            raise ValueError(f"Unknown fields: {', '.join(unknown)}.")
+        return names
+
+    def rows(self, queryset, names):
+        lookups = [self.fields[name] for name in names if self.fields[name]]
+        # The paginator and the cooks lookup need these columns whatever
+        # the client selected.
+        lookups += [field for field in ("id",) + self.ordering if field not in lookups]
+        return queryset.values(*lookups)
+
+    def serialize(self, rows, names):
+        result = [{name: row[self.fields[name]] for name in names if self.fields[name]}
+                  for row in rows]
+        if "cooks" in names:
+            cooks = {}
+            for dish_id, cook_id in Dish.cooks.through.objects.filter(
+                dish_id__in=[row["id"] for row in rows]
+            ).order_by("cook_id").values_list("dish_id", "cook_id"):
+                cooks.setdefault(dish_id, []).append(cook_id)
+            for row, item in zip(rows, result):
+                item["cooks"] = cooks.get(row["id"], [])
+        return result
+
+
+RESOURCES = {
+    "dishes": Resource(
+        Dish.objects.all(),
+        {
+            "id": "id",
+            "name": "name",
+            "description": "description",
+            "price": "price",
+            "dish_type": "dish_type_id",
+            "dish_type_name": "dish_type__name",
+            "cooks": None,
+        },
+        ordering=("name", "id"),
+        default_fields=("id", "name", "price", "dish_type"),
+    ),
+    "cooks": Resource(
+        Cook.objects.all(),
+        {
+            "id": "id",
+            "username": "username",
+            "first_name": "first_name",
+            "last_name": "last_name",
+            "years_of_experience": "years_of_experience",
+            "dish_count": "dish_count",
+        },
+        ordering=("username", "id"),
+    ),
+    "dish-types": Resource(
+        DishType.objects.all(),
+        {"id": "id", "name": "name", "dish_count": "dish_count"},
+        ordering=("name", "id"),
+    ),
+}
+
+
+def _json_response(request, payload):
+    body = json.dumps(payload, cls=DjangoJSONEncoder).encode()
+    etag = f'"{hashlib.md5(body, usedforsecurity=False).hexdigest()}"'
+    response = get_conditional_response(request, etag=etag)
+    if response is None:
+        response = HttpResponse(body, content_type="application/json")
+    response["ETag"] = etag
+    patch_cache_control(response, private=True, no_cache=True)
+    return response
+
+
+def _error(status, detail):
+    return JsonResponse({"detail": detail}, status=status)
+
+
+def list_view(request, resource_name):
+    if not request.user.is_authenticated:
+        return _error(401, "Authentication credentials were not provided.")
+    resource = RESOURCES[resource_name]
+    try:
+        names = resource.select_fields(request)
+    except ValueError as e:
+        return _error(400, str(e))
+    try:
+        limit = min(int(request.GET.get("limit", DEFAULT_LIMIT)), MAX_LIMIT)
+    except ValueError:
+        limit = 0
+    if limit < 1:
+        return _error(400, f"limit must be a whole number from 1 to {MAX_LIMIT}.")
+    paginator = KeysetPaginator(
+        resource.rows(resource.queryset, names), limit, resource.ordering
+    )
+    try:
+        page = paginator.page(request.GET.get(CURSOR_PARAM))
+    except InvalidPage as e:
+        return _error(404, str(e))
+    return _json_response(request, {
+        "results": resource.serialize(page.object_list, names),
+        "next": page.next_cursor,
+        "previous": page.previous_cursor,
+    })
+
+
+def detail_view(request, resource_name, pk):
+    if not request.user.is_authenticated:
+        return _error(401, "Authentication credentials were not provided.")
+    resource = RESOURCES[resource_name]
+    try:
+        names = resource.select_fields(request)
+    except ValueError as e:
+        return _error(400, str(e))
+    rows = list(resource.rows(resource.queryset.filter(pk=pk), names))
+    if not rows:
+        return _error(404, "Not found.")
+    return _json_response(request, resource.serialize(rows, names)[0])
@@ -0,0 +1,76 @@
+from django.db import router, transaction
+from django.db.models.signals import m2m_changed
+
+from kitchen import board, dish_counts
+from kitchen.models import Dish
+
+Assignment = Dish.cooks.through
+
+
+def _send(action, cook, dish_ids, using):
+    # Sent from the cook side (reverse=True), so a batch of dishes costs one
+    # notification per cook instead of one per dish.
+    m2m_changed.send(
+        sender=Assignment,
+        action=action,
+        instance=cook,
+        reverse=True,
+        model=Dish,
+        pk_set=set(dish_ids),
+        using=using,
+    )
+
+
+def assign_cooks(dish_ids, cooks):
+    """
+    Assign every cook in ``cooks`` to every dish in ``dish_ids`` with one
+    bulk INSERT (conflicts ignored) inside a single transaction.
+
+    Return the number of assignments that did not exist yet.
+    """
+    dish_ids = set(dish_ids)
+    cooks = {cook.pk: cook for cook in cooks}
+    using = router.db_for_write(Assignment)
+    with transaction.atomic(using=using):
+        existing = {}
+        for dish_id, cook_id in Assignment.objects.using(using).filter(
+            dish_id__in=dish_ids, cook_id__in=cooks
+        ).values_list("dish_id", "cook_id"):
+            existing.setdefault(cook_id, set()).add(dish_id)
+        missing = {
+            cook_id: dish_ids - existing.get(cook_id, set()) for cook_id in cooks
+        }
+        missing = {cook_id: ids for cook_id, ids in missing.items() if ids}
+        for cook_id, ids in missing.items():
+            _send("pre_add", cooks[cook_id], ids, using)
+        Assignment.objects.using(using).bulk_create(
+            [Assignment(dish_id=dish_id, cook_id=cook_id)
+             for cook_id, ids in missing.items() for dish_id in ids],
+            ignore_conflicts=True,
+        )
+        with dish_counts.batched(), board.batched():
+            for cook_id, ids in missing.items():
+                _send("post_add", cooks[cook_id], ids, using)
+    return sum(len(ids) for ids in missing.values())
+
+
+def unassign_cooks(dish_ids, cooks):
+    """
+    Remove every cook in ``cooks`` from every dish in ``dish_ids`` with one
+    DELETE inside a single transaction.
+
+    Return the number of assignments removed.
+    """
+    dish_ids = set(dish_ids)
+    cooks = list(cooks)
+    using = router.db_for_write(Assignment)
+    with transaction.atomic(using=using):
+        for cook in cooks:
+            _send("pre_remove", cook, dish_ids, using)
+        deleted, _ = Assignment.objects.using(using).filter(
+            dish_id__in=dish_ids, cook_id__in=[cook.pk for cook in cooks]
+        ).delete()
+        with dish_counts.batched(), board.batched():
+            for cook in cooks:
+                _send("post_remove", cook, dish_ids, using)
+    return deleted
@@ -0,0 +1,149 @@
+"""
+Async versions of the read-only pages, for clients that poll often (kitchen
+display screens). Data is loaded with the async ORM; only template
+rendering, which may touch lazy auth/session state, runs in a thread.
+
+They render the same templates as the views in ``kitchen.views`` and share
+their page sizes. Serve them under ASGI (see README); under WSGI they
+work but gain nothing.
+"""
+from asgiref.sync import sync_to_async
+from django.contrib.auth.decorators import login_required
+from django.core.handlers.asgi import ASGIRequest
+from django.core.paginator import InvalidPage, Paginator
+from django.http import Http404, StreamingHttpResponse
+from django.shortcuts import aget_object_or_404, render
+
+from . import board, counters
+from .forms import DishSearchForm
+from .models import Cook, Dish
+from .pagination import CURSOR_PARAM, KeysetPaginator
+from .search import search_dishes
+from .views import CookListView, DishDetailView, DishListView
+from .visits import get_visit_counter
+
+
+async def _render(request, template_name, context):
+    # login_required loaded the user with request.auser(), which caches it
+    # apart from the lazy request.user the templates read; hand them the
+    # loaded user so it is not fetched twice.
+    request.user = await request.auser()
+    return await sync_to_async(render)(request, template_name, context)
+
+
+async def _keyset_context(request, queryset, per_page, ordering, cursor_param=CURSOR_PARAM):
+    paginator = KeysetPaginator(queryset, per_page, ordering)
+    try:
+        page = await paginator.apage(request.GET.get(cursor_param))
+    except InvalidPage as e:
+        raise Http404(str(e))
+    return {"paginator": paginator, "page_obj": page, "is_paginated": page.has_other_pages()}
+
+
+async def _offset_context(request, queryset, per_page):
+    paginator = Paginator(queryset, per_page)
+    # Fill the cached count asynchronously so page() does not query.
+    paginator.count = await queryset.acount()
+    try:
+        page = paginator.page(request.GET.get("page") or 1)
+    except InvalidPage as e:
+        raise Http404(str(e))
+    page.object_list = [obj async for obj in page.object_list]
+    return {
+        "paginator": paginator,
+        "page_obj": page,
+        "is_paginated": page.has_other_pages(),
+        "page_range": list(paginator.get_elided_page_range(
+            page.number,
+            on_each_side=DishListView.page_window_on_each_side,
+            on_ends=DishListView.page_window_on_ends,
+        )),
+    }
+
+
+@login_required
+async def index(request):
+    counts = await counters.aget_counts()
+    visit_counter = get_visit_counter()
+    num_visits = await sync_to_async(visit_counter.get)(request)
+    context = {"num_cooks": counts["cooks"], "num_dishes": counts["dishes"],
+               "num_dish_types": counts["dish_types"],
+               "num_visits": num_visits}
+    response = await _render(request, "kitchen/index.html", context)
+    await sync_to_async(visit_counter.record)(request, response, num_visits)
+    return response
+
+
+@login_required
+async def dish_list(request):
+    queryset = Dish.objects.select_related("dish_type")
+    name = request.GET.get("name", "")
+    if name:
+        context = await _offset_context(
+            request, search_dishes(queryset, name), DishListView.paginate_by
+        )
+    else:
+        context = await _keyset_context(
+            request, queryset, DishListView.paginate_by, DishListView.keyset_ordering
+        )
+    context["dish_list"] = context["page_obj"].object_list
+    context["search_form"] = DishSearchForm(initial={"name": name})
+    return await _render(request, "kitchen/dish_list.html", context)
+
+
+@login_required
+async def dish_detail(request, pk):
+    dish = await aget_object_or_404(Dish.objects.select_related("dish_type"), pk=pk)
+    cooks = await _keyset_context(
+        request,
+        dish.cooks.only("id", "username", "first_name", "last_name"),
+        DishDetailView.cooks_per_page,
+        ("username", "id"),
+        cursor_param="cooks_cursor",
+    )
+    user = await request.auser()
+    is_assigned = await Dish.cooks.through.objects.filter(
+        dish_id=dish.id, cook_id=user.id
+    ).aexists()
+    context = {"object": dish, "dish": dish, "cooks_page": cooks["page_obj"],
+               "is_assigned": is_assigned}
+    return await _render(request, "kitchen/dish_detail.html", context)
+
+
+@login_required
+async def cook_list(request):
+    context = await _keyset_context(
+        request, Cook.objects.all(), CookListView.paginate_by, CookListView.keyset_ordering
+    )
+    context["cook_list"] = context["page_obj"].object_list
+    return await _render(request, "kitchen/cook_list.html", context)
+
+
+@login_required
+async def cook_detail(request, pk):
+    cook = await aget_object_or_404(Cook.objects.prefetch_related("cooked_dishes"), pk=pk)
+    return await _render(request, "kitchen/cook_detail.html", {"object": cook, "cook": cook})
+
+
+@login_required
+async def board_events(request):
+    """
+    Server-sent events with the dish and assignment changes made after the
+    client's ``Last-Event-ID`` (or ``?after=``), for the kitchen board.
+    """
+    after = request.headers.get("Last-Event-ID") or request.GET.get("after")
+    try:
+        after = int(after)
+    except (TypeError, ValueError):
+        after = await board.alatest()
+    # Streaming an async iterator under WSGI (or a sync one under ASGI)
+    # would buffer the whole stream, so match the server. WSGI clients get
+    # what is there now and poll again, so no sync worker is held.
+    if isinstance(request, ASGIRequest):
+        content = board.astream(after)
+    else:
+        content = board.stream(after)
+    response = StreamingHttpResponse(content, content_type="text/event-stream")
+    response["Cache-Control"] = "no-cache"
+    response["X-Accel-Buffering"] = "no"
+    return response
@@ -0,0 +1,88 @@
+"""
+Authentication backend that loads the logged-in cook from the cache.
+
+``AuthenticationMiddleware`` resolves ``request.user`` through the session's
+backend on every request; ``CachedModelBackend`` answers from a per-user
+entry in the in-process ``users`` cache that lives
+``KITCHEN_USER_CACHE_TIMEOUT`` seconds, so a hit costs no query at all.
+Saving or deleting the cook (including password changes, deactivation and
+logins) drops the entry of the worker that made the change. Other workers
+serve theirs until it expires: checking a shared version on every request
+would cost as much as the row itself with the database cache, so the short
+timeout is what bounds how long they may serve a stale cook.
+"""
+from django.conf import settings
+from django.contrib.auth import BACKEND_SESSION_KEY, middleware
+from django.contrib.auth.backends import ModelBackend
+from django.core.cache import caches
+from django.db import transaction
+
+CACHE_ALIAS = "users"
+
+KEY_PREFIX = "kitchen:user:"
+
+DEFAULT_TIMEOUT = 10
+
+BACKEND = "kitchen.auth.CachedModelBackend"
+# Sessions that logged in before CachedModelBackend was installed.
+MODEL_BACKEND = "django.contrib.auth.backends.ModelBackend"
+
+
+def _key(user_id):
+    return f"{KEY_PREFIX}{user_id}"
+
+
+def _timeout():
+    return getattr(settings, "KITCHEN_USER_CACHE_TIMEOUT", DEFAULT_TIMEOUT)
+
+
+def _forget(user_id):
+    caches[CACHE_ALIAS].delete(_key(user_id))
+
+
+def invalidate(user_id):
+    """
+    Drop this worker's entry now and again once the current transaction
+    commits, in case a concurrent request cached the old row meanwhile.
+    """
+    _forget(user_id)
+    transaction.on_commit(lambda: _forget(user_id))
+
+
+class CachedModelBackend(ModelBackend):
+    def get_user(self, user_id):
+        timeout = _timeout()
+        if not timeout:
+            return super().get_user(user_id)
+        users = caches[CACHE_ALIAS]
+        user = users.get(_key(user_id))
+        if user is None:
+            user = super().get_user(user_id)
+            if user is not None:
+                users.set(_key(user_id), user, timeout)
+        return user
+
+    async def aget_user(self, user_id):
+        timeout = _timeout()
+        if not timeout:
+            return await super().aget_user(user_id)
+        users = caches[CACHE_ALIAS]
+        user = await users.aget(_key(user_id))
+        if user is None:
+            user = await super().aget_user(user_id)
+            if user is not None:
+                await users.aset(_key(user_id), user, timeout)
+        return user
+
+
+class AuthenticationMiddleware(middleware.AuthenticationMiddleware):
+    """
+    Django's ``AuthenticationMiddleware``, which also moves sessions started
+    under the plain ``ModelBackend`` onto ``CachedModelBackend`` (one session
+    save each), so they are served from the cache too.
+    """
+
+    def process_request(self, request):
+        super().process_request(request)
+        if request.session.get(BACKEND_SESSION_KEY) == MODEL_BACKEND:
+            request.session[BACKEND_SESSION_KEY] = BACKEND
@@ -0,0 +1,285 @@
+"""
+Event log behind the live kitchen board.
+
+Dish and assignment changes are appended to a short-lived log in the cache
+(shared between workers in production), numbered by a global sequence kept
+in the database, so concurrent publishers never get the same number.
+The board's event stream reads everything after the client's last seen
+sequence number and pushes it as server-sent events: as a long-lived stream
+under ASGI, and as one short response per poll under WSGI, where a stream
+would tie up a worker.
+"""
+import asyncio
+import json
+import time
+import weakref
+from contextlib import contextmanager
+from contextvars import Context, ContextVar
+
+from asgiref.sync import sync_to_async
+
+from django.core.cache import cache
+from django.db import close_old_connections, connections, router, transaction
+from django.db.models import F
+
+from kitchen.models import Sequence
+
+SEQUENCE_NAME = "board"
+EVENT_KEY_PREFIX = "kitchen:board:event:"
+
+# How long an event stays readable, and how far behind a client may fall
+# before it is told to reload instead of replaying the backlog.
+EVENT_TIMEOUT = 300
+MAX_BACKLOG = 500
+
+POLL_INTERVAL = 1
+HEARTBEAT_INTERVAL = 15
+# ASGI streams end after this long; EventSource reconnects with Last-Event-ID.
+STREAM_DURATION = 55
+# Seconds between the short polls of WSGI clients.
+SYNC_RETRY_INTERVAL = 3
+
+RELOAD = {"type": "reload"}
+
+# Events waiting inside batched(), or None outside of it.
+_pending = ContextVar("kitchen_board_pending", default=None)
+
+
+def _event_key(seq):
+    return f"{EVENT_KEY_PREFIX}{seq}"
+
+
+def _increment(using, count):
+    """
+    Add ``count`` to the board sequence and return the new value, or None
+    if its row does not exist yet. (The cache's incr() is a get followed by
+    a set on some backends, so two publishers could get the same numbers.)
+    """
+    connection = connections[using]
+    if connection.features.can_return_columns_from_insert:
+        # UPDATE ... RETURNING: one atomic statement (PostgreSQL, SQLite 3.35+).
+        table = connection.ops.quote_name(Sequence._meta.db_table)
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"UPDATE {table} SET value = value + %s WHERE name = %s RETURNING value",
+                [count, SEQUENCE_NAME],
+            )
+            row = cursor.fetchone()
+        return row[0] if row else None
+    sequence = Sequence.objects.using(using).filter(name=SEQUENCE_NAME)
+    with transaction.atomic(using=using):
+        # The UPDATE locks the row until commit, so the value read back is ours.
+        if not sequence.update(value=F("value") + count):
+            return None
+        return sequence.values_list("value", flat=True).get()
+
+
+def _reserve(count):
+    """Take ``count`` consecutive sequence numbers; return the last one."""
+    using = router.db_for_write(Sequence)
+    last = _increment(using, count)
+    if last is None:
+        Sequence.objects.using(using).get_or_create(name=SEQUENCE_NAME)
+        last = _increment(using, count)
+    return last
+
+
+def _store(events):
+    last = _reserve(len(events))
+    first = last - len(events) + 1
+    cache.set_many(
+        {_event_key(seq): event for seq, event in enumerate(events, first)}, EVENT_TIMEOUT
+    )
+
+
+def publish(event):
+    """Append ``event`` to the log once the current transaction commits."""
+    pending = _pending.get()
+    if pending is not None:
+        pending.append(event)
+    else:
+        transaction.on_commit(lambda: _store([event]))
+
+
+@contextmanager
+def batched():
+    """
+    Collect the events published inside the block and append them together
+    when it exits, taking their sequence numbers with one UPDATE, e.g. for
+    the per-cook signals of a bulk assignment. Nothing is published if the
+    block raises.
+    """
+    if _pending.get() is not None:
+        yield
+        return
+    pending = []
+    token = _pending.set(pending)
+    try:
+        yield
+    finally:
+        _pending.reset(token)
+    if pending:
+        transaction.on_commit(lambda: _store(pending))
+
+
+def latest():
+    sequence = Sequence.objects.filter(name=SEQUENCE_NAME).values_list("value", flat=True)
+    return sequence.first() or 0
+
+
+async def alatest():
+    sequence = Sequence.objects.filter(name=SEQUENCE_NAME).values_list("value", flat=True)
+    return await sequence.afirst() or 0
+
+
+def _collect(after, last, found):
+    """
+    Turn the cached events between ``after`` and ``last`` into a list of
+    ``(seq, event)``, stopping at the first gap: the writer may not have
+    stored it yet. A gap at the very start means the events expired.
+    """
+    events = []
+    for seq in range(after + 1, last + 1):
+        event = found.get(_event_key(seq))
+        if event is None:
+            if not events and any(_event_key(s) in found for s in range(seq + 1, last + 1)):
+                return [(last, RELOAD)]
+            break
+        events.append((seq, event))
+    return events
+
+
+def events_after(after):
+    last = latest()
+    if last < after:
+        # The client saw a sequence that has since been reset.
+        return [(last, RELOAD)]
+    if last == after:
+        return []
+    if last - after > MAX_BACKLOG:
+        return [(last, RELOAD)]
+    found = cache.get_many([_event_key(seq) for seq in range(after + 1, last + 1)])
+    return _collect(after, last, found)
+
+
+async def aevents_after(after):
+    last = await alatest()
+    if last < after:
+        return [(last, RELOAD)]
+    if last == after:
+        return []
+    if last - after > MAX_BACKLOG:
+        return [(last, RELOAD)]
+    found = await cache.aget_many([_event_key(seq) for seq in range(after + 1, last + 1)])
+    return _collect(after, last, found)
+
+
+def _format(seq, event):
+    return f"id: {seq}\ndata: {json.dumps(event)}\n\n"
+
+
+def stream(after):
+    """
+    Server-sent events for WSGI workers, as a short poll: the events after
+    ``after`` that exist now, then the response ends and EventSource
+    reconnects ``SYNC_RETRY_INTERVAL`` seconds later with Last-Event-ID. A
+    long-lived stream would hold a sync worker for its whole duration.
+    """
+    yield f"retry: {SYNC_RETRY_INTERVAL * 1000}\n\n"
+    for seq, event in events_after(after):
+        yield _format(seq, event)
+
+
+class _Feed:
+    """
+    Polls the event log once per ``POLL_INTERVAL`` for all the streams open
+    on an event loop, and hands every poll's events (possibly none) to each
+    of them, so the database and cache see one reader per process however
+    many boards are open. It stops when the last stream closes.
+    """
+
+    def __init__(self, sleep):
+        self.sleep = sleep
+        self.queues = set()
+        self.task = None
+
+    def subscribe(self):
+        queue = asyncio.Queue()
+        self.queues.add(queue)
+        if self.task is None:
+            # Outside the opening request's context: that request's
+            # thread-sensitive executor is shut down when it finishes.
+            self.task = asyncio.get_running_loop().create_task(
+                self._run(), context=Context()
+            )
+        return queue
+
+    def unsubscribe(self, queue):
+        self.queues.discard(queue)
+        if not self.queues and self.task is not None:
+            self.task.cancel()
+            self.task = None
+
+    async def _run(self):
+        try:
+            last = await alatest()
+            while True:
+                events = await aevents_after(last)
+                if events:
+                    last = events[-1][0]
+                for queue in self.queues:
+                    queue.put_nowait(events)
+                await self.sleep(POLL_INTERVAL)
+        except Exception as error:
+            for queue in self.queues:
+                queue.put_nowait(error)
+        finally:
+            # As at the end of a request: nothing else closes (or returns to
+            # the pool) the connection this poll used.
+            await sync_to_async(close_old_connections)()
+
+
+_feeds = weakref.WeakKeyDictionary()
+
+
+def _feed(sleep):
+    loop = asyncio.get_running_loop()
+    feed = _feeds.get(loop)
+    if feed is None or (feed.task is not None and feed.task.done()):
+        feed = _feeds[loop] = _Feed(sleep)
+    return feed
+
+
+async def astream(after, clock=time.monotonic, sleep=asyncio.sleep):
+    """
+    Server-sent event stream for ASGI servers. It catches up from the event
+    log itself, then follows the process's shared poll (see _Feed).
+    """
+    yield f"retry: {POLL_INTERVAL * 1000}\n\n"
+    feed = _feed(sleep)
+    queue = feed.subscribe()
+    try:
+        started = last_sent = clock()
+        events = await aevents_after(after)
+        while True:
+            if events and events[0][0] > after + 1 and events[0][1] is not RELOAD:
+                # The shared poll started after our catch-up read.
+                events = await aevents_after(after)
+            sent = False
+            for seq, event in events:
+                if seq > after or event is RELOAD:
+                    yield _format(seq, event)
+                    after = seq
+                    sent = True
+            if sent:
+                last_sent = clock()
+            elif clock() - last_sent >= HEARTBEAT_INTERVAL:
+                yield ": heartbeat\n\n"
+                last_sent = clock()
+            events = await queue.get()
+            if isinstance(events, Exception):
+                raise events
+            if clock() - started >= STREAM_DURATION:
+                break
+    finally:
+        feed.unsubscribe(queue)
@@ -0,0 +1,82 @@
+"""
+System check that templates reference static files only through
+``{% static %}``, so every URL is resolved through the staticfiles
+manifest (hashed, compressed, cached forever), and only to files that
+``collectstatic`` actually ships.
+"""
+import re
+from pathlib import Path
+
+from django.apps import apps
+from django.conf import settings
+from django.contrib.staticfiles import finders
+from django.contrib.staticfiles.utils import matches_patterns
+from django.core.checks import Error, Tags, register
+
+STATIC_TAG = re.compile(r"""\{%\s*static\s+(["'])(.+?)\1\s*%\}""")
+
+# A static path written out by hand (or via a context variable) bypasses
+# the manifest and is served unhashed.
+RAW_STATIC_URL = re.compile(
+    r"""(?:(?:src|href)\s*=\s*["']|url\(\s*["']?)"""
+    r"""/?(?:static/|\{\{\s*(?:STATIC_URL|ASSETS_ROOT)\b)""",
+)
+
+
+def _uses_app_directories(engine):
+    if engine.get("APP_DIRS"):
+        return True
+    # An explicit loader list may wrap it, e.g. in the cached loader.
+    loaders = engine.get("OPTIONS", {}).get("loaders", [])
+    return "app_directories" in repr(loaders)
+
+
+def _template_files():
+    directories = []
+    for engine in settings.TEMPLATES:
+        directories += [Path(directory) for directory in engine.get("DIRS", [])]
+        if _uses_app_directories(engine):
+            # Only this project's apps; third-party templates are not ours to fix.
+            directories += [
+                Path(app.path) / "templates" for app in apps.get_app_configs()
+                if Path(app.path).is_relative_to(settings.BASE_DIR)
+            ]
+    for directory in directories:
+        if directory.is_dir():
+            yield from directory.rglob("*.html")
+
+
+def _is_pruned(path):
+    patterns = apps.get_app_config("staticfiles").ignore_patterns
+    return any(
+        matches_patterns(part, patterns)
+        for part in [path, *Path(path).parts]
+    )
+
+
+@register(Tags.templates)
+def check_static_references(app_configs, **kwargs):
+    errors = []
+    for template in _template_files():
+        source = template.read_text(encoding="utf-8")
+        for number, line in enumerate(source.splitlines(), start=1):
+            where = f"{template}:{number}"
+            if RAW_STATIC_URL.search(line):
+                errors.append(Error(
+                    f"{where} references a static file without {{% static %}}.",
+                    hint="Use {% static 'path' %} so the hashed URL is served.",
+                    id="kitchen.E001",
+                ))
+            for _, path in STATIC_TAG.findall(line):
+                if finders.find(path) is None:
+                    errors.append(Error(
+                        f"{where} references missing static file {path!r}.",
+                        id="kitchen.E002",
+                    ))
+                elif _is_pruned(path):
+                    errors.append(Error(
+                        f"{where} references {path!r}, which collectstatic prunes.",
+                        hint="Remove it from PrunedStaticFilesConfig.ignore_patterns.",
+                        id="kitchen.E003",
+                    ))
+    return errors
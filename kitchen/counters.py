@@ -0,0 +1,101 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import DEFAULT_CACHE_ALIAS, cache, caches
+from django.core.cache.backends.base import BaseCache
+from django.db import transaction
+
+from kitchen.models import Dish, DishType
+
+KEY_PREFIX = "kitchen:counter:"
+
+COUNTERS = ("cooks", "dishes", "dish_types")
+
+# Counted values expire so that a count taken while a change was committing,
+# and stored after that change adjusted the counter, is corrected in time.
+TIMEOUT = 300
+
+
+def _querysets():
+    return {
+        "cooks": get_user_model().objects.filter(is_staff=False),
+        "dishes": Dish.objects.all(),
+        "dish_types": DishType.objects.all(),
+    }
+
+
+def _key(name):
+    return f"{KEY_PREFIX}{name}"
+
+
+def get_counts():
+    """
+    Return the dashboard counters from the cache, running ``COUNT(*)``
+    only for counters that are missing (cold cache or invalidated).
+    """
+    cached = cache.get_many([_key(name) for name in COUNTERS])
+    counts = {}
+    missing = {}
+    querysets = None
+    for name in COUNTERS:
+        value = cached.get(_key(name))
+        if value is None:
+            querysets = querysets or _querysets()
+            value = querysets[name].count()
+            missing[_key(name)] = value
+        counts[name] = value
+    if missing:
+        cache.set_many(missing, timeout=TIMEOUT)
+    return counts
+
+
+async def aget_counts():
+    """Async counterpart of :func:`get_counts`."""
+    cached = await cache.aget_many([_key(name) for name in COUNTERS])
+    counts = {}
+    missing = {}
+    querysets = None
+    for name in COUNTERS:
+        value = cached.get(_key(name))
+        if value is None:
+            querysets = querysets or _querysets()
+            value = await querysets[name].acount()
+            missing[_key(name)] = value
+        counts[name] = value
+    if missing:
+        await cache.aset_many(missing, timeout=TIMEOUT)
+    return counts
+
+
+def _incr_is_atomic(backend):
+    # BaseCache.incr() is a get() followed by a set(), so two workers
+    # adjusting at once lose an update (the database and file caches).
+    # Backends that override it (locmem, memcached, redis) add in one step.
+    return type(backend).incr is not BaseCache.incr
+
+
+def _apply(name, delta):
+    # ``cache`` is a proxy; check the class of the backend behind it.
+    if not _incr_is_atomic(caches[DEFAULT_CACHE_ALIAS]):
+        # Recount on the next read rather than risk drifting.
+        cache.delete(_key(name))
+        return
+    try:
+        cache.incr(_key(name), delta)
+    except ValueError:
+        # Not cached yet; the next read computes the exact value.
+        pass
+
+
+def adjust(name, delta):
+    """Shift a counter by ``delta`` once the current transaction commits."""
+    transaction.on_commit(lambda: _apply(name, delta))
+
+
+def invalidate(name):
+    transaction.on_commit(lambda: cache.delete(_key(name)))
+
+
+def reconcile():
+    """Recompute every counter from the database and store it."""
+    counts = {name: queryset.count() for name, queryset in _querysets().items()}
+    cache.set_many({_key(name): value for name, value in counts.items()}, timeout=TIMEOUT)
+    return counts
@@ -0,0 +1,70 @@
+"""
+Maintenance of the denormalized ``dish_count`` columns on ``DishType`` and
+``Cook``.
+
+Counts are recomputed from the source rows for the affected keys rather
+than shifted by deltas, so repeated or partial signals (e.g. removing a
+cook who was never assigned) cannot make them drift.
+"""
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.db.models import Count, IntegerField, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+from kitchen.models import Cook, Dish, DishType
+
+Assignment = Dish.cooks.through
+
+# Keys waiting for a recount inside batched(), or None outside of it.
+_pending = ContextVar("kitchen_dish_counts_pending", default=None)
+
+
+def _count(queryset, column):
+    counted = queryset.filter(**{column: OuterRef("pk")}).order_by().values(column)
+    return Coalesce(
+        Subquery(counted.annotate(n=Count("pk")).values("n"), output_field=IntegerField()),
+        Value(0),
+    )
+
+
+def recount_dish_types(ids=None):
+    """Recompute ``DishType.dish_count`` for ``ids`` (all types by default)."""
+    pending = _pending.get()
+    if pending is not None and ids is not None:
+        pending[DishType].update(ids)
+        return None
+    queryset = DishType.objects.all() if ids is None else DishType.objects.filter(pk__in=ids)
+    return queryset.update(dish_count=_count(Dish.objects.all(), "dish_type"))
+
+
+def recount_cooks(ids=None):
+    """Recompute ``Cook.dish_count`` for ``ids`` (all cooks by default)."""
+    pending = _pending.get()
+    if pending is not None and ids is not None:
+        pending[Cook].update(ids)
+        return None
+    queryset = Cook.objects.all() if ids is None else Cook.objects.filter(pk__in=ids)
+    return queryset.update(dish_count=_count(Assignment.objects.all(), "cook"))
+
+
+@contextmanager
+def batched():
+    """
+    Collect the recounts requested inside the block and run them as one
+    UPDATE per model when it exits, e.g. around the per-cook signals of a
+    bulk assignment. Nothing is recounted if the block raises.
+    """
+    if _pending.get() is not None:
+        yield
+        return
+    pending = {DishType: set(), Cook: set()}
+    token = _pending.set(pending)
+    try:
+        yield
+    finally:
+        _pending.reset(token)
+    if pending[DishType]:
+        recount_dish_types(pending[DishType])
+    if pending[Cook]:
+        recount_cooks(pending[Cook])
@@ -1,7 +1,9 @@
 from django import forms
 from django.contrib.auth import get_user_model
 from django.contrib.auth.forms import UserCreationForm
+from django.urls import reverse_lazy
 
+from kitchen import board
 from kitchen.models import Dish, Cook
 
 
@@ -36,15 +38,62 @@ class CookExperienceUpdateForm(forms.ModelForm):
         fields = ("years_of_experience",)
 
 
+class CookAutocompleteWidget(forms.SelectMultiple):
+    """
+    Multiple select that renders only the selected cooks; the rest are
+    fetched on demand from the cook autocomplete endpoint.
+    """
+
+    def __init__(self, attrs=None):
+        attrs = {"data-autocomplete-url": reverse_lazy("kitchen:cook-autocomplete"),
+                 **(attrs or {})}
+        super().__init__(attrs)
+
+    def optgroups(self, name, value, attrs=None):
+        selected = [pk for pk in value if str(pk).isdigit()]
+        if not selected:
+            return []
+        field = self.choices.field
+        queryset = self.choices.queryset.filter(pk__in=selected)
+        groups = []
+        for index, obj in enumerate(queryset):
+            option = self.create_option(
+                name, self.choices.choice(obj)[0], field.label_from_instance(obj),
+                True, index, attrs=attrs,
+            )
+            groups.append((None, [option], index))
+        return groups
+
+
 class DishForm(forms.ModelForm):
     cooks = forms.ModelMultipleChoiceField(queryset=get_user_model().objects.all(),
-                                           widget=forms.CheckboxSelectMultiple,
+                                           widget=CookAutocompleteWidget,
                                            required=False)
     class Meta:
         model = Dish
         fields = "__all__"
 
+    def save(self, commit=True):
+        # The dish and its cooks reach the board with one sequence update.
+        with board.batched():
+            return super().save(commit)
+
 
 class DishSearchForm(forms.Form):
     name = forms.CharField(max_length=255, required=False, label="",
                             widget=forms.TextInput(attrs={"placeholder": "Search by name"}))
+
+
+class BulkAssignmentForm(forms.Form):
+    ASSIGN = "assign"
+    REMOVE = "remove"
+
+    action = forms.ChoiceField(choices=[(ASSIGN, "Assign"), (REMOVE, "Remove")])
+    dishes = forms.ModelMultipleChoiceField(
+        queryset=Dish.objects.only("id"),
+        error_messages={"required": "Select at least one dish."},
+    )
+    cooks = forms.ModelMultipleChoiceField(queryset=get_user_model().objects.all(),
+                                           required=False)
+    # Queue the change as a job and answer 202 with its status URL.
+    background = forms.BooleanField(required=False)
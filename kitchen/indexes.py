@@ -0,0 +1,29 @@
+from django.contrib.postgres.indexes import GinIndex, OpClass
+from django.db.backends.ddl_references import Statement
+from django.db.models.functions import Upper
+
+
+class TrigramIndex(GinIndex):
+    """
+    A pg_trgm GIN index on ``UPPER(field)``, the expression Django emits for
+    ``icontains`` on PostgreSQL. Other databases skip it: dish search uses
+    FTS5 on SQLite and a plain scan elsewhere (see kitchen.search).
+    """
+
+    def __init__(self, field, *, name):
+        super().__init__(OpClass(Upper(field), name="gin_trgm_ops"), name=name)
+        self.field = field
+
+    def deconstruct(self):
+        path, _, kwargs = super().deconstruct()
+        return path, (self.field,), {"name": kwargs["name"]}
+
+    def create_sql(self, model, schema_editor, using="", **kwargs):
+        if schema_editor.connection.vendor != "postgresql":
+            return Statement("")
+        return super().create_sql(model, schema_editor, using=using, **kwargs)
+
+    def remove_sql(self, model, schema_editor, **kwargs):
+        if schema_editor.connection.vendor != "postgresql":
+            return Statement("")
+        return super().remove_sql(model, schema_editor, **kwargs)
@@ -0,0 +1,213 @@
+"""
+Per-request instrumentation: SQL query count and time, template render time
+and total latency for every view.
+
+Each request gets a ``RequestMetrics`` in a context variable; it follows the
+request into ``sync_to_async`` threads, so async views are measured too. A
+wrapper installed on every new database connection times the queries, and
+the template backend below times top-level renders (template time includes
+queries run lazily while rendering). The middleware reports the result as a
+``Server-Timing`` header and a log line, and keeps recent samples per view
+in process memory for percentiles.
+"""
+import contextvars
+import logging
+import statistics
+import threading
+import time
+from collections import defaultdict, deque
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+from django.template import TemplateDoesNotExist
+from django.template.backends import django as django_backend
+from django.utils.functional import SimpleLazyObject, empty
+
+logger = logging.getLogger(__name__)
+
+# Samples kept per view and per process.
+SAMPLE_SIZE = 1000
+
+_current = contextvars.ContextVar("kitchen_request_metrics", default=None)
+
+
+class RequestMetrics:
+    __slots__ = ("started", "queries", "db_time", "template_time", "rendering")
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.queries = 0
+        self.db_time = 0.0
+        self.template_time = 0.0
+        self.rendering = False
+
+
+def record_query(execute, sql, params, many, context):
+    metrics = _current.get()
+    if metrics is None:
+        return execute(sql, params, many, context)
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        metrics.queries += 1
+        metrics.db_time += time.perf_counter() - start
+
+
+@receiver(connection_created)
+def instrument_connection(sender, connection, **kwargs):
+    # The long-lived form of connection.execute_wrapper(): persistent and
+    # pooled connections keep the wrapper for their whole life.
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_query)
+
+
+class Template(django_backend.Template):
+    def render(self, context=None, request=None):
+        metrics = _current.get()
+        # Includes and form widgets render nested templates; only the
+        # outermost render is timed.
+        if metrics is None or metrics.rendering:
+            return super().render(context, request)
+        metrics.rendering = True
+        start = time.perf_counter()
+        try:
+            return super().render(context, request)
+        finally:
+            metrics.rendering = False
+            metrics.template_time += time.perf_counter() - start
+
+
+class DjangoTemplates(django_backend.DjangoTemplates):
+    """The Django template backend, with render times reported to the metrics."""
+
+    def from_string(self, template_code):
+        return Template(self.engine.from_string(template_code), self)
+
+    def get_template(self, template_name):
+        try:
+            return Template(self.engine.get_template(template_name), self)
+        except TemplateDoesNotExist as exc:
+            django_backend.reraise(exc, self)
+
+
+class Stats:
+    """Recent samples per view; each worker process keeps its own."""
+
+    FIELDS = ("total_ms", "db_ms", "template_ms", "queries")
+
+    def __init__(self, size=SAMPLE_SIZE):
+        self._samples = defaultdict(lambda: deque(maxlen=size))
+        self._lock = threading.Lock()
+
+    def add(self, view, sample):
+        with self._lock:
+            self._samples[view].append(sample)
+
+    def clear(self):
+        with self._lock:
+            self._samples.clear()
+
+    def percentiles(self):
+        with self._lock:
+            samples = {view: list(values) for view, values in self._samples.items()}
+        result = {}
+        for view, values in sorted(samples.items()):
+            result[view] = {"count": len(values)}
+            for index, field in enumerate(self.FIELDS):
+                column = [value[index] for value in values]
+                if len(column) > 1:
+                    cuts = statistics.quantiles(column, n=100, method="inclusive")
+                    p50, p95, p99 = cuts[49], cuts[94], cuts[98]
+                else:
+                    p50 = p95 = p99 = column[0]
+                result[view][field] = {
+                    "p50": round(p50, 2), "p95": round(p95, 2), "p99": round(p99, 2),
+                }
+        return result
+
+
+stats = Stats()
+
+
+def _shows_timing(request):
+    """Whether ``KITCHEN_SERVER_TIMING`` lets this client see the timings."""
+    audience = getattr(settings, "KITCHEN_SERVER_TIMING", "staff")
+    if audience == "all":
+        return True
+    if audience != "staff":
+        return False
+    user = getattr(request, "user", None)
+    # Only a user the view already loaded: resolving it here would add
+    # queries to pages that never needed one.
+    if user is None or (isinstance(user, SimpleLazyObject) and user._wrapped is empty):
+        return False
+    return user.is_staff
+
+
+class InstrumentationMiddleware:
+    """
+    Measure every request passed further down the stack. Place it right
+    after WhiteNoise so static files are not counted.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        metrics = RequestMetrics()
+        token = _current.set(metrics)
+        try:
+            response = self.get_response(request)
+        finally:
+            _current.reset(token)
+        self.report(request, response, metrics)
+        return response
+
+    async def __acall__(self, request):
+        metrics = RequestMetrics()
+        token = _current.set(metrics)
+        try:
+            response = await self.get_response(request)
+        finally:
+            _current.reset(token)
+        self.report(request, response, metrics)
+        return response
+
+    def report(self, request, response, metrics):
+        total_ms = (time.perf_counter() - metrics.started) * 1000
+        db_ms = metrics.db_time * 1000
+        template_ms = metrics.template_time * 1000
+        match = request.resolver_match
+        view = match.view_name if match else "unresolved"
+
+        stats.add(view, (total_ms, db_ms, template_ms, metrics.queries))
+        if _shows_timing(request):
+            response["Server-Timing"] = (
+                f'db;dur={db_ms:.1f};desc="{metrics.queries} queries", '
+                f"tpl;dur={template_ms:.1f}, total;dur={total_ms:.1f}"
+            )
+        logger.info(
+            "%s %s %s %s queries=%d db_ms=%.1f template_ms=%.1f total_ms=%.1f",
+            request.method, request.path, view, response.status_code,
+            metrics.queries, db_ms, template_ms, total_ms,
+            extra={
+                "view": view,
+                "method": request.method,
+                "path": request.path,
+                "status": response.status_code,
+                "queries": metrics.queries,
+                "db_ms": round(db_ms, 2),
+                "template_ms": round(template_ms, 2),
+                "total_ms": round(total_ms, 2),
+            },
+        )
@@ -0,0 +1,184 @@
+"""
+Background jobs stored in the database, for work too heavy for a request.
+
+Views call ``enqueue()`` with the name of a task registered below and a
+JSON payload, and return at once. ``manage.py run_kitchen_worker`` claims
+due jobs with ``SELECT ... FOR UPDATE SKIP LOCKED`` (several workers can
+share the table), runs them in a thread pool and records the result. A job
+that raises is retried with exponential backoff until ``max_attempts``.
+A running job refreshes ``started_at`` every ``HEARTBEAT_INTERVAL``; one
+whose worker died stops doing so and is put back in the queue after
+``STALE_AFTER``.
+"""
+import logging
+import threading
+import traceback
+from contextlib import contextmanager
+from datetime import timedelta
+
+from django.db import connections, transaction
+from django.utils import timezone
+
+from kitchen import counters, deletion, dish_counts
+from kitchen.assignments import assign_cooks, unassign_cooks
+from kitchen.models import Cook, Dish, DishType, Job
+
+logger = logging.getLogger(__name__)
+
+# Seconds before the first retry; doubled for every further attempt.
+RETRY_DELAY = 10
+
+# Seconds a job may stay "running" without a heartbeat before it is
+# considered abandoned.
+STALE_AFTER = 600
+
+# Seconds between heartbeats of a running job.
+HEARTBEAT_INTERVAL = 60
+
+TASKS = {}
+
+
+def task(func):
+    """Register ``func`` as a task, under its name."""
+    TASKS[func.__name__] = func
+    return func
+
+
+def enqueue(task_name, payload=None, user=None, max_attempts=3):
+    """Queue ``task_name`` to run with ``payload`` as keyword arguments."""
+    if task_name not in TASKS:
+        raise ValueError(f"Unknown task: {task_name}")
+    return Job.objects.create(
+        task=task_name,
+        payload=payload or {},
+        created_by=user if user is not None and user.is_authenticated else None,
+        max_attempts=max_attempts,
+    )
+
+
+def claim(limit):
+    """
+    Mark up to ``limit`` due jobs as running and return them. Rows locked
+    by another worker are skipped; on databases without row locks (SQLite)
+    the conditional UPDATE keeps two workers from claiming the same job.
+    """
+    now = timezone.now()
+    claimed = []
+    with transaction.atomic():
+        due = list(
+            Job.objects.select_for_update(skip_locked=True)
+            .filter(status=Job.QUEUED, run_after__lte=now)
+            .order_by("run_after", "id")[:limit]
+        )
+        for job in due:
+            updated = Job.objects.filter(pk=job.pk, status=Job.QUEUED).update(
+                status=Job.RUNNING, attempts=job.attempts + 1, started_at=now,
+            )
+            if updated:
+                job.status, job.attempts, job.started_at = Job.RUNNING, job.attempts + 1, now
+                claimed.append(job)
+    return claimed
+
+
+def _claimed(job):
+    """The job's row, as long as this attempt still owns it."""
+    return Job.objects.filter(pk=job.pk, status=Job.RUNNING, attempts=job.attempts)
+
+
+def _record(job, rows=None, **fields):
+    """
+    Store the outcome of this attempt in ``rows`` (the job's row while the
+    attempt owns it), unless the job was requeued, and maybe claimed again,
+    meanwhile; then reload it and return False.
+    """
+    if not (_claimed(job) if rows is None else rows).update(**fields):
+        logger.warning("Job %s (%s) changed during attempt %d; its outcome is dropped",
+                       job.pk, job.task, job.attempts)
+        job.refresh_from_db()
+        return False
+    for name, value in fields.items():
+        setattr(job, name, value)
+    return True
+
+
+def _retry_or_fail(job, error, rows=None):
+    now = timezone.now()
+    if job.attempts < job.max_attempts:
+        delay = RETRY_DELAY * 2 ** (job.attempts - 1)
+        fields = {"status": Job.QUEUED, "run_after": now + timedelta(seconds=delay)}
+    else:
+        fields = {"status": Job.FAILED, "finished_at": now}
+    return _record(job, rows, error=error, **fields)
+
+
+@contextmanager
+def _heartbeat(job, interval=HEARTBEAT_INTERVAL):
+    """Refresh ``started_at`` from a thread so a long job does not look stale."""
+    stop = threading.Event()
+
+    def beat():
+        try:
+            while not stop.wait(interval):
+                if not _claimed(job).update(started_at=timezone.now()):
+                    return
+        finally:
+            connections.close_all()
+
+    thread = threading.Thread(target=beat, name=f"kitchen-job-{job.pk}-heartbeat", daemon=True)
+    thread.start()
+    try:
+        yield
+    finally:
+        stop.set()
+        thread.join()
+
+
+def run(job):
+    """Run a claimed job and record its outcome."""
+    try:
+        with _heartbeat(job):
+            result = TASKS[job.task](**job.payload)
+    except Exception:
+        logger.exception("Job %s (%s) failed on attempt %d", job.pk, job.task, job.attempts)
+        _retry_or_fail(job, traceback.format_exc())
+        return job
+    _record(job, status=Job.DONE, result=result, error="", finished_at=timezone.now())
+    return job
+
+
+def requeue_stale(older_than=STALE_AFTER):
+    """Retry (or fail) running jobs whose worker stopped sending heartbeats."""
+    cutoff = timezone.now() - timedelta(seconds=older_than)
+    requeued = 0
+    for job in Job.objects.filter(status=Job.RUNNING, started_at__lt=cutoff):
+        # Skipped if a heartbeat or the outcome arrived since the SELECT.
+        rows = _claimed(job).filter(started_at__lt=cutoff)
+        message = f"No heartbeat for {older_than} seconds; the worker was probably stopped."
+        requeued += _retry_or_fail(job, message, rows)
+    return requeued
+
+
+# Tasks. Arguments and return values must be JSON serializable.
+
+@task
+def bulk_assignment(action, dish_ids, cook_ids):
+    # Dishes deleted since the job was queued would become orphan rows.
+    dish_ids = list(Dish.objects.filter(pk__in=dish_ids).values_list("pk", flat=True))
+    cooks = list(Cook.objects.filter(pk__in=cook_ids))
+    if action == "assign":
+        return {"assigned": assign_cooks(dish_ids, cooks)}
+    return {"removed": unassign_cooks(dish_ids, cooks)}
+
+
+@task
+def delete_dish_type(dish_type_id):
+    dish_type = DishType.objects.filter(pk=dish_type_id).first()
+    return {"dishes_deleted": deletion.delete_dish_type(dish_type) if dish_type else 0}
+
+
+@task
+def reconcile_counters():
+    counts = counters.reconcile()
+    dish_counts.recount_dish_types()
+    dish_counts.recount_cooks()
+    return counts
@@ -0,0 +1,46 @@
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+from django.core.signals import request_finished, request_started
+from django.db import connection
+
+from kitchen.models import Dish
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure per-request database latency under the current connection "
+        "settings by replaying the request_started/request_finished cycle "
+        "around one query, as a view would."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--requests", type=int, default=200)
+        parser.add_argument("--warmup", type=int, default=10)
+
+    def _request(self):
+        request_started.send(sender=self.__class__)
+        try:
+            start = time.perf_counter()
+            Dish.objects.exists()
+            return time.perf_counter() - start
+        finally:
+            # Closes or returns the connection exactly like the handler does.
+            request_finished.send(sender=self.__class__)
+
+    def handle(self, *args, **options):
+        for _ in range(options["warmup"]):
+            self._request()
+        timings = sorted(self._request() * 1000 for _ in range(options["requests"]))
+        settings_dict = connection.settings_dict
+        mode = "pool" if settings_dict.get("OPTIONS", {}).get("pool") else (
+            f"CONN_MAX_AGE={settings_dict['CONN_MAX_AGE']}"
+        )
+        quantiles = statistics.quantiles(timings, n=100)
+        self.stdout.write(
+            f"{connection.vendor} ({mode}), {len(timings)} requests: "
+            f"mean {statistics.fmean(timings):.2f} ms, "
+            f"p50 {quantiles[49]:.2f} ms, p95 {quantiles[94]:.2f} ms, "
+            f"max {timings[-1]:.2f} ms"
+        )
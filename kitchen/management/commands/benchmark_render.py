@@ -0,0 +1,131 @@
+import statistics
+import time
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.template.backends.django import Template
+from django.test import Client, override_settings
+from django.urls import reverse
+
+from kitchen.models import Dish
+
+FILESYSTEM_LOADERS = [
+    "django.template.loaders.filesystem.Loader",
+    "django.template.loaders.app_directories.Loader",
+]
+CACHED_LOADERS = [("django.template.loaders.cached.Loader", FILESYSTEM_LOADERS)]
+FRAGMENTS_OFF = {"BACKEND": "django.core.cache.backends.dummy.DummyCache"}
+FRAGMENTS_ON = {
+    "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    "LOCATION": "benchmark-render",
+}
+
+CONFIGURATIONS = [
+    ("no caching", FILESYSTEM_LOADERS, FRAGMENTS_OFF),
+    ("cached loader", CACHED_LOADERS, FRAGMENTS_OFF),
+    ("cached loader + fragments", CACHED_LOADERS, FRAGMENTS_ON),
+]
+
+
+@contextmanager
+def render_timer():
+    """
+    Collect the time spent in top-level template rendering; nested renders
+    (includes, crispy forms) are part of their caller's time.
+    """
+    timings = []
+    original = Template.render
+    depth = 0
+
+    def render(self, *args, **kwargs):
+        nonlocal depth
+        depth += 1
+        start = time.perf_counter()
+        try:
+            return original(self, *args, **kwargs)
+        finally:
+            depth -= 1
+            if not depth:
+                timings.append(time.perf_counter() - start)
+
+    Template.render = render
+    try:
+        yield timings
+    finally:
+        Template.render = original
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure template render time per page without caching, with the "
+        "cached template loader, and with the loader plus fragment caching "
+        "of the navigation, footer and scripts."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--username", help="Cook to render the pages as (default: first superuser).")
+        parser.add_argument("--requests", type=int, default=50)
+        parser.add_argument("--warmup", type=int, default=5)
+
+    def _pages(self, cook):
+        pages = [
+            ("index", reverse("kitchen:index")),
+            ("dish types", reverse("kitchen:dish-type-list")),
+            ("dishes", reverse("kitchen:dish-list")),
+            ("cooks", reverse("kitchen:cook-list")),
+            ("cook detail", cook.get_absolute_url()),
+            ("dish form", reverse("kitchen:dish-create")),
+            ("board", reverse("kitchen:board")),
+        ]
+        dish = Dish.objects.order_by("pk").first()
+        if dish is not None:
+            pages.insert(3, ("dish detail", dish.get_absolute_url()))
+        return pages
+
+    def _measure(self, client, url, requests, warmup):
+        with render_timer() as timings:
+            for _ in range(warmup + requests):
+                # Without the CSRF cookie the response cache stays out of the way.
+                client.cookies.pop(settings.CSRF_COOKIE_NAME, None)
+                response = client.get(url)
+                if response.status_code != 200:
+                    raise CommandError(f"GET {url} returned {response.status_code}.")
+        return [t * 1000 for t in timings[-requests:]]
+
+    def handle(self, *args, **options):
+        cooks = get_user_model().objects.order_by("pk")
+        if options["username"]:
+            cook = cooks.filter(username=options["username"]).first()
+        else:
+            cook = cooks.filter(is_superuser=True).first()
+        if cook is None:
+            raise CommandError("No cook to render the pages as; pass --username.")
+
+        client = Client(HTTP_HOST=(settings.ALLOWED_HOSTS or ["localhost"])[0])
+        client.force_login(cook)
+        pages = self._pages(cook)
+        results = {}
+        for name, loaders, fragments in CONFIGURATIONS:
+            templates = [{
+                **settings.TEMPLATES[0],
+                "APP_DIRS": False,
+                "OPTIONS": {**settings.TEMPLATES[0]["OPTIONS"], "loaders": loaders},
+            }]
+            with override_settings(
+                TEMPLATES=templates,
+                CACHES={**settings.CACHES, "templates": fragments},
+                KITCHEN_RESPONSE_CACHE_TIMEOUT=0,
+            ):
+                for page, url in pages:
+                    timings = self._measure(client, url, options["requests"], options["warmup"])
+                    results[page, name] = statistics.median(timings)
+
+        width = max(len(page) for page, _ in pages)
+        header = "".join(f"{name:>28}" for name, *_ in CONFIGURATIONS)
+        self.stdout.write(f"median render ms, {options['requests']} requests per page")
+        self.stdout.write(f"{'page':<{width}}{header}")
+        for page, _ in pages:
+            row = "".join(f"{results[page, name]:>28.2f}" for name, *_ in CONFIGURATIONS)
+            self.stdout.write(f"{page:<{width}}{row}")
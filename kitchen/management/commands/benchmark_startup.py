@@ -0,0 +1,60 @@
+import os
+import re
+import subprocess
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+
+IMPORTTIME_LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+SETUP_CODE = (
+    "import django; django.setup(); "
+    "from django.urls import get_resolver; get_resolver().url_patterns"
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure how long a fresh interpreter takes to import Django, set up a "
+        "settings module and load the URLconf, using python -X importtime."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--settings-module", action="append", dest="settings_modules",
+            help="Settings module to measure (repeatable, defaults to the current one).",
+        )
+        parser.add_argument("--runs", type=int, default=5,
+                            help="Fresh interpreters per settings module; the best run counts.")
+        parser.add_argument("--top", type=int, default=10,
+                            help="Number of slowest top-level imports to list.")
+
+    def _measure(self, settings_module):
+        env = {**os.environ, "DJANGO_SETTINGS_MODULE": settings_module}
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", SETUP_CODE],
+            env=env, capture_output=True, text=True,
+        )
+        if result.returncode:
+            raise CommandError(f"{settings_module} failed to load:\n{result.stderr[-2000:]}")
+        top_level = {}
+        for line in result.stderr.splitlines():
+            match = IMPORTTIME_LINE.match(line)
+            # Top-level imports are indented by exactly one space.
+            if match and len(match.group(3)) == 1:
+                top_level[match.group(4)] = int(match.group(2))
+        return top_level
+
+    def handle(self, *args, **options):
+        settings_modules = options["settings_modules"] or [os.environ["DJANGO_SETTINGS_MODULE"]]
+        for settings_module in settings_modules:
+            runs = [self._measure(settings_module) for _ in range(options["runs"])]
+            best = min(runs, key=lambda modules: sum(modules.values()))
+            total = sum(best.values()) / 1000
+            self.stdout.write(self.style.SUCCESS(
+                f"{settings_module}: {total:.1f} ms cumulative import time "
+                f"({len(best)} top-level modules, best of {len(runs)})"
+            ))
+            slowest = sorted(best.items(), key=lambda item: item[1], reverse=True)
+            for module, microseconds in slowest[: options["top"]]:
+                self.stdout.write(f"  {microseconds / 1000:8.1f} ms  {module}")
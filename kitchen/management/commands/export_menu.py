@@ -0,0 +1,25 @@
+from django.core.management.base import BaseCommand
+
+from kitchen.menu_io import FORMATS, export_rows, guess_format, write_rows
+
+
+class Command(BaseCommand):
+    help = "Export dishes, dish types and cook assignments as CSV or JSONL."
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", nargs="?", default="-",
+                            help='Output file, or "-" for stdout (default).')
+        parser.add_argument("--format", choices=FORMATS,
+                            help="File format (guessed from the extension by default).")
+        parser.add_argument("--chunk-size", type=int, default=2000,
+                            help="Dishes fetched per database round-trip.")
+
+    def handle(self, *args, **options):
+        path = options["path"]
+        fmt = options["format"] or guess_format(path)
+        rows = export_rows(chunk_size=options["chunk_size"])
+        if path == "-":
+            write_rows(self.stdout, fmt, rows)
+            return
+        with open(path, "w", newline="", encoding="utf-8") as stream:
+            write_rows(stream, fmt, rows)
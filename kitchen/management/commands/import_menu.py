@@ -0,0 +1,33 @@
+import sys
+
+from django.core.exceptions import ValidationError
+from django.core.management.base import BaseCommand, CommandError
+
+from kitchen.menu_io import FORMATS, MenuImporter, guess_format, read_rows
+
+
+class Command(BaseCommand):
+    help = "Import dishes, dish types and cook assignments from a CSV or JSONL file."
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help='Menu file, or "-" for stdin.')
+        parser.add_argument("--format", choices=FORMATS,
+                            help="File format (guessed from the extension by default).")
+        parser.add_argument("--batch-size", type=int, default=1000,
+                            help="Rows per bulk insert and per transaction.")
+
+    def handle(self, *args, **options):
+        path = options["path"]
+        fmt = options["format"] or guess_format(path)
+        importer = MenuImporter(batch_size=options["batch_size"])
+        stream = sys.stdin if path == "-" else open(path, newline="", encoding="utf-8")
+        try:
+            created, updated = importer.run(read_rows(stream, fmt))
+        except ValidationError as e:
+            raise CommandError(e.message)
+        finally:
+            if stream is not sys.stdin:
+                stream.close()
+        self.stdout.write(self.style.SUCCESS(
+            f"Imported menu: {created} dishes created, {updated} updated."
+        ))
@@ -0,0 +1,408 @@
+import html
+import json
+import random
+import re
+import secrets
+import statistics
+import threading
+import time
+from http.cookiejar import CookieJar
+from urllib.error import HTTPError, URLError
+from urllib.parse import urlencode, urljoin
+from urllib.request import HTTPCookieProcessor, HTTPRedirectHandler, Request, build_opener
+
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.urls import reverse
+
+from kitchen import counters, deletion, response_cache
+from kitchen.models import Cook, Dish, DishType
+from kitchen.pagination import CURSOR_PARAM
+
+USERNAME_PREFIX = "loadtest-"
+SAMPLE_SIZE = 1000
+
+NEXT_LINK = re.compile(r'href="\?([^"]*)" aria-label="Next"')
+SEARCH_TERMS = ["soup", "dish", "salad", "1", "chicken", "cake"]
+
+# Route name -> (weight, VirtualUser method). Reads dominate, as on a real
+# kitchen floor; create/update/delete routes are exercised through their
+# GET form pages only, so the data set stays the same between runs.
+ROUTES = {
+    "index": (5, "index"),
+    "dish-type-list": (4, "dish_type_list"),
+    "dish-type-create": (1, "dish_type_create"),
+    "dish-type-update": (1, "dish_type_update"),
+    "dish-type-delete": (1, "dish_type_delete"),
+    "dish-list": (12, "dish_list"),
+    "dish-list search": (8, "dish_search"),
+    "dish-detail": (10, "dish_detail"),
+    "dish-create": (2, "dish_create"),
+    "dish-update": (2, "dish_update"),
+    "dish-delete": (1, "dish_delete"),
+    "cook-list": (6, "cook_list"),
+    "cook-autocomplete": (4, "cook_autocomplete"),
+    "cook-detail": (6, "cook_detail"),
+    "cook-create": (1, "cook_create"),
+    "cook-experience-update": (1, "cook_experience_update"),
+    "cook-delete": (1, "cook_delete"),
+    "assign-me": (3, "assign_me"),
+    "remove-me": (3, "remove_me"),
+    "bulk-assignment": (2, "bulk_assignment"),
+    "job-status": (1, "job_status"),
+    "api-dish-list": (4, "api_dish_list"),
+    "api-dish-detail": (2, "api_dish_detail"),
+    "api-cook-list": (2, "api_cook_list"),
+    "api-cook-detail": (2, "api_cook_detail"),
+    "api-dish-type-list": (2, "api_dish_type_list"),
+    "api-dish-type-detail": (2, "api_dish_type_detail"),
+    "board": (3, "board"),
+    "board-events": (2, "board_events"),
+    "display-index": (2, "display_index"),
+    "display-dish-list": (2, "display_dish_list"),
+    "display-dish-detail": (2, "display_dish_detail"),
+    "display-cook-list": (2, "display_cook_list"),
+    "display-cook-detail": (2, "display_cook_detail"),
+    "request-metrics": (1, "request_metrics"),
+}
+
+
+def _next_link(body):
+    match = NEXT_LINK.search(body)
+    return html.unescape(match.group(1)) if match else None
+
+
+def _next_cursor(body):
+    cursor = json.loads(body).get("next")
+    return urlencode({CURSOR_PARAM: cursor}) if cursor else None
+
+
+class NoRedirect(HTTPRedirectHandler):
+    # A redirect is the response being measured, not a request to follow.
+    def redirect_request(self, *args, **kwargs):
+        return None
+
+
+class VirtualUser:
+    """One logged-in cook with its own cookies and paging position."""
+
+    def __init__(self, base_url, username, password, ids, rng, timeout):
+        self.base_url = base_url
+        self.username = username
+        self.password = password
+        self.ids = ids
+        self.rng = rng
+        self.timeout = timeout
+        self.jar = CookieJar()
+        self.opener = build_opener(HTTPCookieProcessor(self.jar), NoRedirect)
+        self.cursors = {}
+        self.job_path = None
+
+    def request(self, path, data=None, first_line_only=False):
+        """Return ``(status, body)``; status 0 means the request failed."""
+        url = urljoin(self.base_url, path)
+        body, headers = None, {}
+        if data is not None:
+            body = urlencode(data, doseq=True).encode()
+            csrf_token = next(
+                (c.value for c in self.jar if c.name == settings.CSRF_COOKIE_NAME), ""
+            )
+            headers = {"X-CSRFToken": csrf_token, "Referer": url}
+        try:
+            with self.opener.open(Request(url, body, headers), timeout=self.timeout) as response:
+                content = response.readline() if first_line_only else response.read()
+                return response.status, content.decode(errors="replace")
+        except HTTPError as e:
+            with e:
+                return e.code, ""
+        except (URLError, OSError):
+            return 0, ""
+
+    def login(self):
+        self.request(settings.LOGIN_URL)
+        status, _ = self.request(
+            settings.LOGIN_URL, {"username": self.username, "password": self.password}
+        )
+        if status != 302:
+            raise CommandError(f"Login as {self.username} failed with status {status}.")
+
+    def pick(self, name):
+        return self.rng.choice(self.ids[name])
+
+    def paged(self, name, path, next_query=_next_link):
+        """Walk the list page by page, starting over after the last one."""
+        query = self.cursors.pop(name, None)
+        status, body = self.request(f"{path}?{query}" if query else path)
+        if status == 200:
+            query = next_query(body)
+            if query:
+                self.cursors[name] = query
+        return status
+
+    def get(self, url_name, /, *args, **query):
+        path = reverse(f"kitchen:{url_name}", args=args)
+        return self.request(f"{path}?{urlencode(query)}" if query else path)[0]
+
+    def post(self, url_name, /, *args, **data):
+        return self.request(reverse(f"kitchen:{url_name}", args=args), data)[0]
+
+    def index(self):
+        return self.get("index")
+
+    def dish_type_list(self):
+        return self.paged("dish-type-list", reverse("kitchen:dish-type-list"))
+
+    def dish_type_create(self):
+        return self.get("dish-type-create")
+
+    def dish_type_update(self):
+        return self.get("dish-type-update", self.pick("dish_types"))
+
+    def dish_type_delete(self):
+        return self.get("dish-type-delete", self.pick("dish_types"))
+
+    def dish_list(self):
+        return self.paged("dish-list", reverse("kitchen:dish-list"))
+
+    def dish_search(self):
+        return self.get("dish-list", name=self.rng.choice(SEARCH_TERMS))
+
+    def dish_detail(self):
+        return self.get("dish-detail", self.pick("dishes"))
+
+    def dish_create(self):
+        return self.get("dish-create")
+
+    def dish_update(self):
+        return self.get("dish-update", self.pick("dishes"))
+
+    def dish_delete(self):
+        return self.get("dish-delete", self.pick("dishes"))
+
+    def cook_list(self):
+        return self.paged("cook-list", reverse("kitchen:cook-list"))
+
+    def cook_autocomplete(self):
+        return self.get("cook-autocomplete", q=self.rng.choice("abcdefghiklmnoprstuv"))
+
+    def cook_detail(self):
+        return self.get("cook-detail", self.pick("cooks"))
+
+    def cook_create(self):
+        return self.get("cook-create")
+
+    def cook_experience_update(self):
+        return self.get("cook-experience-update", self.pick("cooks"))
+
+    def cook_delete(self):
+        return self.get("cook-delete", self.pick("cooks"))
+
+    def assign_me(self):
+        return self.post("assign-me", self.pick("dishes"))
+
+    def remove_me(self):
+        return self.post("remove-me", self.pick("dishes"))
+
+    def bulk_assignment(self, background=False):
+        dishes = self.rng.sample(self.ids["dishes"], min(10, len(self.ids["dishes"])))
+        data = {"action": self.rng.choice(["assign", "remove"]), "dishes": dishes}
+        if background:
+            data["background"] = "on"
+        status, body = self.request(reverse("kitchen:bulk-assignment"), data)
+        if status == 202:
+            self.job_path = json.loads(body)["url"]
+        return status
+
+    def job_status(self):
+        # Poll the last queued job, queueing one first if there is none.
+        if self.job_path is None:
+            status = self.bulk_assignment(background=True)
+            if status != 202:
+                return status
+        return self.request(self.job_path)[0]
+
+    def api_dish_list(self):
+        return self.paged("api-dish-list", reverse("kitchen:api-dish-list"), _next_cursor)
+
+    def api_dish_detail(self):
+        return self.get("api-dish-detail", self.pick("dishes"), fields="name,price,cooks")
+
+    def api_cook_list(self):
+        return self.get("api-cook-list")
+
+    def api_cook_detail(self):
+        return self.get("api-cook-detail", self.pick("cooks"))
+
+    def api_dish_type_list(self):
+        return self.get("api-dish-type-list")
+
+    def api_dish_type_detail(self):
+        return self.get("api-dish-type-detail", self.pick("dish_types"))
+
+    def board(self):
+        return self.get("board")
+
+    def board_events(self):
+        # Under ASGI the stream stays open for a minute; time the first line.
+        return self.request(reverse("kitchen:board-events"), first_line_only=True)[0]
+
+    def display_index(self):
+        return self.get("display-index")
+
+    def display_dish_list(self):
+        return self.get("display-dish-list")
+
+    def display_dish_detail(self):
+        return self.get("display-dish-detail", self.pick("dishes"))
+
+    def display_cook_list(self):
+        return self.get("display-cook-list")
+
+    def display_cook_detail(self):
+        return self.get("display-cook-detail", self.pick("cooks"))
+
+    def request_metrics(self):
+        # Load-test cooks are not staff, and are refused as designed.
+        status = self.get("request-metrics")
+        return 200 if status == 403 else status
+
+
+def _summary(latencies, errors, elapsed):
+    latencies = sorted(latencies)
+    if len(latencies) > 1:
+        cuts = statistics.quantiles(latencies, n=100, method="inclusive")
+        p50, p95, p99 = cuts[49], cuts[94], cuts[98]
+    else:
+        p50 = p95 = p99 = latencies[0] if latencies else 0.0
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "requests_per_second": round(len(latencies) / elapsed, 2) if elapsed else 0.0,
+        "latency_ms": {
+            "p50": round(p50, 2),
+            "p95": round(p95, 2),
+            "p99": round(p99, 2),
+            "max": round(latencies[-1], 2) if latencies else 0.0,
+        },
+    }
+
+
+class Command(BaseCommand):
+    help = (
+        "Load-test a running server (runserver, gunicorn, uvicorn) with "
+        "concurrent cooks that log in and exercise every kitchen URL in a "
+        "weighted mix. Prints requests/sec and p50/p95/p99 latency per route "
+        "as JSON. Run it with the same database settings as the server."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--base-url", default="http://127.0.0.1:8000/")
+        parser.add_argument("--users", type=int, default=10,
+                            help="Concurrent cooks, each in its own thread.")
+        parser.add_argument("--duration", type=float, default=30,
+                            help="Seconds to run (ignored with --requests).")
+        parser.add_argument("--requests", type=int,
+                            help="Requests per user instead of a fixed duration.")
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument("--timeout", type=float, default=30)
+        parser.add_argument("--output", help="Write the JSON report to this file.")
+
+    def _create_cooks(self, count, password):
+        """Create ``loadtest-N`` cooks with ``password``, for this run only."""
+        # The run deletes its cooks at the end, so never take over accounts
+        # it did not create (another run's, or real users').
+        if Cook.objects.filter(username__startswith=USERNAME_PREFIX).exists():
+            raise CommandError(
+                f'Cooks named "{USERNAME_PREFIX}N" exist already; '
+                "is another load test running?"
+            )
+        usernames = [f"{USERNAME_PREFIX}{i}" for i in range(count)]
+        password = make_password(password)
+        Cook.objects.bulk_create(
+            Cook(username=username, password=password) for username in usernames
+        )
+        # Bulk writes send no signals.
+        counters.invalidate("cooks")
+        response_cache.invalidate()
+        return usernames
+
+    def _delete_cooks(self, usernames):
+        for cook in Cook.objects.filter(username__in=usernames):
+            deletion.delete_cook(cook)
+
+    def _sample_ids(self):
+        ids = {
+            "dishes": list(Dish.objects.values_list("pk", flat=True)[:SAMPLE_SIZE]),
+            "dish_types": list(DishType.objects.values_list("pk", flat=True)[:SAMPLE_SIZE]),
+            "cooks": list(Cook.objects.values_list("pk", flat=True)[:SAMPLE_SIZE]),
+        }
+        empty = [name for name, values in ids.items() if not values]
+        if empty:
+            raise CommandError(f"No {', '.join(empty)} to request; load some data first.")
+        return ids
+
+    def handle(self, *args, **options):
+        # Never a known password: the accounts live in a real database.
+        password = secrets.token_urlsafe(24)
+        usernames = self._create_cooks(options["users"], password)
+        try:
+            report = self._run(usernames, password, options)
+        finally:
+            self._delete_cooks(usernames)
+        output = json.dumps(report, indent=2)
+        if options["output"]:
+            with open(options["output"], "w") as f:
+                f.write(output + "\n")
+        self.stdout.write(output)
+
+    def _run(self, usernames, password, options):
+        ids = self._sample_ids()
+        names = list(ROUTES)
+        weights = [weight for weight, _ in ROUTES.values()]
+        results = {name: ([], [0]) for name in names}
+        lock = threading.Lock()
+
+        users = []
+        for i, username in enumerate(usernames):
+            user = VirtualUser(options["base_url"], username, password, ids,
+                               random.Random(options["seed"] + i), options["timeout"])
+            user.login()
+            users.append(user)
+
+        deadline = time.monotonic() + options["duration"]
+
+        def run(user):
+            done = 0
+            while (done < options["requests"] if options["requests"]
+                   else time.monotonic() < deadline):
+                name = user.rng.choices(names, weights)[0]
+                start = time.perf_counter()
+                status = getattr(user, ROUTES[name][1])()
+                elapsed_ms = (time.perf_counter() - start) * 1000
+                latencies, errors = results[name]
+                with lock:
+                    latencies.append(elapsed_ms)
+                    if not 200 <= status < 400:
+                        errors[0] += 1
+                done += 1
+
+        started = time.monotonic()
+        threads = [threading.Thread(target=run, args=(user,)) for user in users]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.monotonic() - started
+
+        all_latencies = [ms for latencies, _ in results.values() for ms in latencies]
+        return {
+            "base_url": options["base_url"],
+            "users": options["users"],
+            "seconds": round(elapsed, 2),
+            **_summary(all_latencies, sum(e[0] for _, e in results.values()), elapsed),
+            "routes": {
+                name: _summary(latencies, errors[0], elapsed)
+                for name, (latencies, errors) in results.items() if latencies
+            },
+        }
@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand
+
+from kitchen import counters, dish_counts, jobs
+
+
+class Command(BaseCommand):
+    help = (
+        "Recompute the cached dashboard counters and the denormalized "
+        "dish counts from the database."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--background", action="store_true",
+                            help="Queue the recount for run_kitchen_worker instead.")
+
+    def handle(self, *args, **options):
+        if options["background"]:
+            job = jobs.enqueue("reconcile_counters")
+            self.stdout.write(self.style.SUCCESS(f"Queued as job {job.pk}."))
+            return
+        counts = counters.reconcile()
+        for name, value in counts.items():
+            self.stdout.write(f"{name}: {value}")
+        dish_counts.recount_dish_types()
+        dish_counts.recount_cooks()
+        self.stdout.write(self.style.SUCCESS("Counters reconciled."))
@@ -0,0 +1,76 @@
+import signal
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from kitchen import jobs
+
+# Seconds between sweeps for jobs whose worker died.
+STALE_CHECK_INTERVAL = 60
+
+
+class Command(BaseCommand):
+    help = (
+        "Run queued kitchen jobs (see kitchen.jobs) in a thread pool until "
+        "stopped with SIGINT or SIGTERM; running jobs are finished first. "
+        "Start as many workers as needed against the same database."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--threads", type=int, default=4,
+                            help="Jobs run at the same time.")
+        parser.add_argument("--poll-interval", type=float, default=1.0,
+                            help="Seconds to wait when the queue is empty.")
+        parser.add_argument("--once", action="store_true",
+                            help="Exit when no due job is left (e.g. from cron).")
+
+    def run_job(self, job):
+        # Threads keep their connection between jobs, like a WSGI worker
+        # between requests; drop it when it is too old or broken.
+        close_old_connections()
+        try:
+            job = jobs.run(job)
+        finally:
+            close_old_connections()
+        self.stdout.write(f"Job {job.pk} {job.task}: {job.status} (attempt {job.attempts})")
+
+    def handle(self, *args, **options):
+        threads = options["threads"]
+        stopping = threading.Event()
+        handlers = {}
+        if threading.current_thread() is threading.main_thread():
+            for signum in (signal.SIGINT, signal.SIGTERM):
+                handlers[signum] = signal.signal(signum, lambda *_: stopping.set())
+
+        running = set()
+        last_stale_check = 0.0
+        try:
+            with ThreadPoolExecutor(threads, thread_name_prefix="kitchen-job") as pool:
+                while not stopping.is_set():
+                    close_old_connections()
+                    if time.monotonic() - last_stale_check >= STALE_CHECK_INTERVAL:
+                        jobs.requeue_stale()
+                        last_stale_check = time.monotonic()
+
+                    for future in [future for future in running if future.done()]:
+                        running.discard(future)
+                        if future.exception() is not None:
+                            self.stderr.write(f"Worker thread failed: {future.exception()!r}")
+                    free = threads - len(running)
+                    claimed = jobs.claim(free) if free else []
+                    running.update(pool.submit(self.run_job, job) for job in claimed)
+
+                    if options["once"] and not running:
+                        break
+                    if claimed and len(running) < threads:
+                        continue
+                    if running:
+                        wait(running, timeout=options["poll_interval"], return_when=FIRST_COMPLETED)
+                    else:
+                        stopping.wait(options["poll_interval"])
+        finally:
+            for signum, handler in handlers.items():
+                signal.signal(signum, handler)
@@ -0,0 +1,197 @@
+import random
+import secrets
+import time
+from itertools import islice
+
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.core.management.color import no_style
+from django.db import connection
+from django.db.models import Max
+
+from kitchen import board, counters, dish_counts, response_cache, search
+from kitchen.models import Cook, Dish, DishType
+
+Assignment = Dish.cooks.through
+
+ADJECTIVES = [
+    "Baked", "Braised", "Creamy", "Crispy", "Fried", "Grilled", "Homemade",
+    "Roasted", "Smoked", "Spicy", "Steamed", "Stuffed", "Sweet", "Warm",
+]
+INGREDIENTS = [
+    "Beef", "Beetroot", "Cabbage", "Chicken", "Duck", "Lamb", "Mushroom",
+    "Pork", "Potato", "Pumpkin", "Salmon", "Shrimp", "Tofu", "Trout",
+]
+DISHES = [
+    "Borshch", "Cake", "Curry", "Dumplings", "Pancakes", "Pie", "Risotto",
+    "Salad", "Soup", "Stew", "Tart", "Varenyky",
+]
+TYPES = [
+    "Appetizers", "Breakfast", "Desserts", "Drinks", "Grill", "Mains",
+    "Pasta", "Salads", "Sides", "Soups",
+]
+FIRST_NAMES = [
+    "Anna", "Bohdan", "Dmytro", "Iryna", "Kateryna", "Maksym", "Marta",
+    "Oksana", "Olena", "Petro", "Sofia", "Taras", "Yurii",
+]
+LAST_NAMES = [
+    "Bondarenko", "Hnatyuk", "Koval", "Kravets", "Melnyk", "Moroz",
+    "Shevchenko", "Tkachenko", "Vovk",
+]
+
+# Every combination, so a generated dish costs one random choice per text.
+DISH_NAMES = [f"{a} {i} {d}" for a in ADJECTIVES for i in INGREDIENTS for d in DISHES]
+DESCRIPTIONS = [
+    f"{a} {i.lower()}, {j.lower()} and herbs."
+    for a in ADJECTIVES for i in INGREDIENTS for j in INGREDIENTS if i != j
+]
+PRICES = [f"{cents / 100:.2f}" for cents in range(300, 4001, 10)]
+
+
+def _batches(iterable, size):
+    iterator = iter(iterable)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+class Command(BaseCommand):
+    help = (
+        "Fill the database with generated dish types, dishes, cooks and "
+        "assignments for performance work. The same --seed always produces "
+        "the same data."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--dish-types", type=int, default=50)
+        parser.add_argument("--dishes", type=int, default=10000)
+        parser.add_argument("--cooks", type=int, default=200)
+        parser.add_argument("--cooks-per-dish", type=float, default=2,
+                            help="Average cooks assigned to a dish (may be fractional).")
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument("--prefix", default="seed",
+                            help="Prefix of the generated usernames and dish type names.")
+        parser.add_argument("--password",
+                            help="Password of every generated cook (default: a random "
+                                 "one, printed at the end).")
+        parser.add_argument("--batch-size", type=int, default=5000,
+                            help="Rows per bulk insert.")
+
+    def handle(self, *args, **options):
+        if options["dish_types"] < 1 and options["dishes"]:
+            raise CommandError("Dishes need at least one dish type.")
+        if options["cooks_per_dish"] > options["cooks"]:
+            raise CommandError("--cooks-per-dish cannot exceed --cooks.")
+        prefix = options["prefix"]
+        if (DishType.objects.filter(name__startswith=f"{prefix} ").exists()
+                or Cook.objects.filter(username__startswith=f"{prefix}-").exists()):
+            raise CommandError(
+                f'Data with the prefix "{prefix}" exists already; pass another --prefix.'
+            )
+
+        password = options["password"]
+        if password is None:
+            # Seeded databases get copied around; never a well-known password.
+            password = secrets.token_urlsafe(12)
+
+        self.rng = random.Random(options["seed"])
+        self.batch_size = options["batch_size"]
+        started = time.monotonic()
+        if connection.vendor == "sqlite":
+            # The indexes of a million-dish table outgrow SQLite's default
+            # 2 MB page cache, and every insert then reads pages from disk.
+            with connection.cursor() as cursor:
+                cursor.execute("PRAGMA cache_size = -262144")
+        try:
+            with search.deferred_indexing():
+                type_ids = self.create_dish_types(prefix, options["dish_types"])
+                cook_ids = self.create_cooks(prefix, options["cooks"], password)
+                dishes, assignments = self.create_dishes(
+                    options["dishes"], type_ids, cook_ids, options["cooks_per_dish"]
+                )
+                for batch in _batches(type_ids, self.batch_size):
+                    dish_counts.recount_dish_types(batch)
+                for batch in _batches(cook_ids, self.batch_size):
+                    dish_counts.recount_cooks(batch)
+        finally:
+            # Bulk writes send no signals.
+            for name in counters.COUNTERS:
+                counters.invalidate(name)
+            response_cache.invalidate()
+            board.publish(board.RELOAD)
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Created {len(type_ids)} dish types, {len(cook_ids)} cooks, {dishes} dishes "
+            f"and {assignments} assignments in {time.monotonic() - started:.1f} s."
+        ))
+        if cook_ids and options["password"] is None:
+            self.stdout.write(f"Password of the generated cooks: {password}")
+
+    def bulk_create(self, model, objects):
+        ids = []
+        for batch in _batches(objects, self.batch_size):
+            ids.extend(obj.pk for obj in model.objects.bulk_create(batch))
+        return ids
+
+    def create_dish_types(self, prefix, count):
+        return self.bulk_create(DishType, (
+            DishType(name=f"{prefix} {TYPES[i % len(TYPES)]} {i}") for i in range(count)
+        ))
+
+    def create_cooks(self, prefix, count, password):
+        # One PBKDF2 run shared by every cook instead of one per user.
+        password = make_password(password)
+        rng = self.rng
+        return self.bulk_create(Cook, (
+            Cook(
+                username=f"{prefix}-cook-{i}",
+                password=password,
+                first_name=rng.choice(FIRST_NAMES),
+                last_name=rng.choice(LAST_NAMES),
+                years_of_experience=rng.randint(0, 30),
+            )
+            for i in range(count)
+        ))
+
+    def insert(self, model, fields, rows):
+        """
+        INSERT plain tuples with executemany(). At a million rows, building
+        and preparing a model instance per row costs far more than the
+        database does, so dishes and assignments skip bulk_create().
+        """
+        quote = connection.ops.quote_name
+        meta = model._meta
+        columns = ", ".join(quote(meta.get_field(name).column) for name in fields)
+        placeholders = ", ".join(["%s"] * len(fields))
+        sql = f"INSERT INTO {quote(meta.db_table)} ({columns}) VALUES ({placeholders})"
+        with connection.cursor() as cursor:
+            cursor.executemany(sql, rows)
+
+    def create_dishes(self, count, type_ids, cook_ids, cooks_per_dish):
+        rng = self.rng
+        whole, fraction = divmod(cooks_per_dish, 1)
+        # Keys are assigned here so assignments can refer to them without
+        # reading the dishes back; the sequence is moved past them below.
+        first_id = (Dish.objects.aggregate(Max("id"))["id__max"] or 0) + 1
+        assignments = 0
+        for batch in _batches(range(first_id, first_id + count), self.batch_size):
+            self.insert(Dish, ("id", "name", "description", "price", "dish_type"), [
+                (
+                    dish_id,
+                    rng.choice(DISH_NAMES),
+                    rng.choice(DESCRIPTIONS),
+                    rng.choice(PRICES),
+                    rng.choice(type_ids),
+                )
+                for dish_id in batch
+            ])
+            links = [
+                (dish_id, cook_id)
+                for dish_id in batch
+                for cook_id in rng.sample(cook_ids, int(whole) + (rng.random() < fraction))
+            ]
+            self.insert(Assignment, ("dish", "cook"), links)
+            assignments += len(links)
+        with connection.cursor() as cursor:
+            for sql in connection.ops.sequence_reset_sql(no_style(), [Dish]):
+                cursor.execute(sql)
+        return count, assignments
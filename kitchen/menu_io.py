@@ -0,0 +1,193 @@
+"""
+Streaming menu import/export.
+
+A menu file holds one dish per row, as CSV or JSON Lines, with the columns
+in ``FIELDS``. ``dish_type`` is the dish type name and ``cooks`` the
+usernames of the assigned cooks (space separated in CSV, a list in JSONL).
+Rows with an ``id`` of an existing dish update it; other rows create new
+dishes.
+"""
+import csv
+import json
+from decimal import Decimal
+from itertools import islice
+
+from django.contrib.auth import get_user_model
+from django.core.exceptions import ValidationError
+from django.db import transaction
+
+from kitchen import board, counters, dish_counts, response_cache
+from kitchen.models import Dish, DishType
+
+FIELDS = ("id", "name", "description", "price", "dish_type", "cooks")
+
+FORMATS = ("csv", "jsonl")
+
+UPDATE_FIELDS = ("name", "description", "price", "dish_type")
+
+Assignment = Dish.cooks.through
+
+
+def guess_format(path):
+    return "jsonl" if str(path).endswith((".jsonl", ".ndjson")) else "csv"
+
+
+def _batches(iterable, size):
+    iterator = iter(iterable)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+def read_rows(stream, fmt):
+    if fmt == "csv":
+        for row in csv.DictReader(stream):
+            row["cooks"] = (row.get("cooks") or "").split()
+            yield row
+    else:
+        for line in stream:
+            if line.strip():
+                yield json.loads(line)
+
+
+def write_rows(stream, fmt, rows):
+    if fmt == "csv":
+        writer = csv.DictWriter(stream, fieldnames=FIELDS)
+        writer.writeheader()
+        for row in rows:
+            writer.writerow({**row, "cooks": " ".join(row["cooks"])})
+    else:
+        for row in rows:
+            stream.write(json.dumps(row, default=str) + "\n")
+
+
+class MenuImporter:
+    """
+    Import menu rows in chunks, one transaction per chunk.
+
+    Dish types and cooks are resolved through in-memory name -> id maps that
+    are filled lazily, so each name costs at most one lookup per import.
+    """
+
+    def __init__(self, batch_size=1000):
+        self.batch_size = batch_size
+        self.dish_type_ids = {}
+        self.cook_ids = {}
+        self.created = 0
+        self.updated = 0
+
+    def run(self, rows):
+        committed = False
+        try:
+            for number, batch in enumerate(_batches(rows, self.batch_size)):
+                try:
+                    with transaction.atomic():
+                        self._import_batch(batch)
+                except (KeyError, ValueError, ArithmeticError, ValidationError) as e:
+                    first = number * self.batch_size + 1
+                    detail = "; ".join(e.messages) if isinstance(e, ValidationError) else repr(e)
+                    raise ValidationError(
+                        f"Rows {first}-{first + len(batch) - 1}: {detail}"
+                    ) from e
+                committed = True
+        finally:
+            # Bulk writes send no signals. A failed batch was rolled back,
+            # but the batches before it are committed.
+            if committed:
+                self._refresh()
+        return self.created, self.updated
+
+    def _refresh(self):
+        dish_counts.recount_dish_types()
+        dish_counts.recount_cooks()
+        counters.invalidate("dishes")
+        counters.invalidate("dish_types")
+        response_cache.invalidate()
+        board.publish(board.RELOAD)
+
+    def _resolve_dish_types(self, names):
+        missing = set(names) - self.dish_type_ids.keys()
+        if not missing:
+            return
+        DishType.objects.bulk_create(
+            [DishType(name=name) for name in missing], ignore_conflicts=True
+        )
+        self.dish_type_ids.update(
+            DishType.objects.filter(name__in=missing).values_list("name", "id")
+        )
+
+    def _resolve_cooks(self, usernames):
+        missing = set(usernames) - self.cook_ids.keys()
+        if not missing:
+            return
+        self.cook_ids.update(
+            get_user_model().objects.filter(username__in=missing).values_list("username", "id")
+        )
+        unknown = missing - self.cook_ids.keys()
+        if unknown:
+            raise ValidationError(f"Unknown cooks: {', '.join(sorted(unknown))}")
+
+    def _import_batch(self, rows):
+        self._resolve_dish_types(row["dish_type"] for row in rows)
+        self._resolve_cooks(username for row in rows for username in row["cooks"])
+
+        ids = set()
+        for row in rows:
+            if row.get("id"):
+                dish_id = int(row["id"])
+                if dish_id in ids:
+                    raise ValidationError(f"Dish id {dish_id} appears more than once.")
+                ids.add(dish_id)
+        existing = set(Dish.objects.filter(pk__in=ids).values_list("pk", flat=True))
+        to_create, to_update = [], []
+        for row in rows:
+            dish = Dish(
+                pk=int(row["id"]) if row.get("id") else None,
+                name=row["name"],
+                description=row.get("description") or "",
+                price=Decimal(str(row["price"])),
+                dish_type_id=self.dish_type_ids[row["dish_type"]],
+            )
+            if dish.pk in existing:
+                to_update.append((dish, row["cooks"]))
+            else:
+                # Unknown ids get a fresh key so the pk sequence stays valid.
+                dish.pk = None
+                to_create.append((dish, row["cooks"]))
+
+        Dish.objects.bulk_create([dish for dish, _ in to_create])
+        Dish.objects.bulk_update([dish for dish, _ in to_update], UPDATE_FIELDS)
+        Assignment.objects.filter(dish_id__in=existing).delete()
+        Assignment.objects.bulk_create(
+            [Assignment(dish_id=dish.pk, cook_id=self.cook_ids[username])
+             for dish, usernames in to_create + to_update
+             for username in set(usernames)],
+        )
+        self.created += len(to_create)
+        self.updated += len(to_update)
+
+
+def export_rows(queryset=None, chunk_size=2000):
+    """
+    Yield menu rows for ``queryset`` (all dishes by default), streaming the
+    dishes with a server-side cursor and loading cooks one chunk at a time.
+    """
+    if queryset is None:
+        queryset = Dish.objects.all()
+    dishes = queryset.order_by("pk").values_list(
+        "id", "name", "description", "price", "dish_type__name"
+    ).iterator(chunk_size=chunk_size)
+    for batch in _batches(dishes, chunk_size):
+        cooks = {}
+        for dish_id, username in Assignment.objects.filter(
+            dish_id__in=[dish[0] for dish in batch]
+        ).order_by("cook__username").values_list("dish_id", "cook__username"):
+            cooks.setdefault(dish_id, []).append(username)
+        for dish_id, name, description, price, dish_type in batch:
+            yield {
+                "id": dish_id,
+                "name": name,
+                "description": description,
+                "price": str(price),
+                "dish_type": dish_type,
+                "cooks": cooks.get(dish_id, []),
+            }
@@ -0,0 +1,85 @@
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations
+
+import kitchen.indexes
+
+# The SQLite full-text index is kept by triggers, which migration state
+# cannot describe; its SQL is frozen here as it was when this ran.
+SQLITE_CREATE_SQL = [
+    """
+    CREATE VIRTUAL TABLE kitchen_dish_fts USING fts5(
+        name, description,
+        content='kitchen_dish', content_rowid='id',
+        tokenize='trigram'
+    )
+    """,
+    """
+    CREATE TRIGGER kitchen_dish_fts_ai AFTER INSERT ON kitchen_dish BEGIN
+        INSERT INTO kitchen_dish_fts(rowid, name, description)
+        VALUES (new.id, new.name, new.description);
+    END
+    """,
+    """
+    CREATE TRIGGER kitchen_dish_fts_ad AFTER DELETE ON kitchen_dish BEGIN
+        INSERT INTO kitchen_dish_fts(kitchen_dish_fts, rowid, name, description)
+        VALUES ('delete', old.id, old.name, old.description);
+    END
+    """,
+    """
+    CREATE TRIGGER kitchen_dish_fts_au AFTER UPDATE ON kitchen_dish BEGIN
+        INSERT INTO kitchen_dish_fts(kitchen_dish_fts, rowid, name, description)
+        VALUES ('delete', old.id, old.name, old.description);
+        INSERT INTO kitchen_dish_fts(rowid, name, description)
+        VALUES (new.id, new.name, new.description);
+    END
+    """,
+    "INSERT INTO kitchen_dish_fts(kitchen_dish_fts) VALUES ('rebuild')",
+]
+
+SQLITE_DROP_SQL = [
+    "DROP TRIGGER IF EXISTS kitchen_dish_fts_ai",
+    "DROP TRIGGER IF EXISTS kitchen_dish_fts_ad",
+    "DROP TRIGGER IF EXISTS kitchen_dish_fts_au",
+    "DROP TABLE IF EXISTS kitchen_dish_fts",
+]
+
+
+def create_sqlite_index(apps, schema_editor):
+    if schema_editor.connection.vendor == "sqlite":
+        for sql in SQLITE_CREATE_SQL:
+            schema_editor.execute(sql)
+
+
+def drop_sqlite_index(apps, schema_editor):
+    if schema_editor.connection.vendor == "sqlite":
+        for sql in SQLITE_DROP_SQL:
+            schema_editor.execute(sql)
+
+
+class KeepTrigramExtension(TrigramExtension):
+    """Install pg_trgm on the way forward; leave it installed on the way back."""
+
+    def database_backwards(self, app_label, schema_editor, from_state, to_state):
+        pass
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("kitchen", "0003_alter_cook_is_active"),
+    ]
+
+    operations = [
+        KeepTrigramExtension(),
+        migrations.AddIndex(
+            model_name="dish",
+            index=kitchen.indexes.TrigramIndex("name", name="kitchen_dish_name_trgm"),
+        ),
+        migrations.AddIndex(
+            model_name="dish",
+            index=kitchen.indexes.TrigramIndex(
+                "description", name="kitchen_dish_description_trgm"
+            ),
+        ),
+        migrations.RunPython(create_sqlite_index, drop_sqlite_index),
+    ]
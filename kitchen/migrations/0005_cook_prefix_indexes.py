@@ -0,0 +1,37 @@
+from django.db import migrations
+
+# ``istartswith`` compiles to ``UPPER("col"::text) LIKE UPPER('q%')`` on
+# PostgreSQL; text_pattern_ops lets the planner range-scan these indexes
+# whatever the database collation is.
+PREFIX_INDEXES = [
+    ("kitchen_cook_username_prefix", "username"),
+    ("kitchen_cook_last_name_prefix", "last_name"),
+]
+
+
+def forwards(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    for name, column in PREFIX_INDEXES:
+        schema_editor.execute(
+            f"CREATE INDEX IF NOT EXISTS {name} "
+            f"ON kitchen_cook (UPPER({column}::text) text_pattern_ops)"
+        )
+
+
+def backwards(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    for name, _ in PREFIX_INDEXES:
+        schema_editor.execute(f"DROP INDEX IF EXISTS {name}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("kitchen", "0004_dish_search_index"),
+    ]
+
+    operations = [
+        migrations.RunPython(forwards, backwards),
+    ]
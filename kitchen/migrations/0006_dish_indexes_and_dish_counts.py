@@ -0,0 +1,55 @@
+# Generated by Django 5.2.6 on 2026-10-17 17:19
+
+from django.db import migrations, models
+from django.db.models import Count, IntegerField, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+
+def _count(queryset, column):
+    counted = queryset.filter(**{column: OuterRef("pk")}).order_by().values(column)
+    return Coalesce(
+        Subquery(counted.annotate(n=Count("pk")).values("n"), output_field=IntegerField()),
+        Value(0),
+    )
+
+
+def populate_dish_counts(apps, schema_editor):
+    Cook = apps.get_model("kitchen", "Cook")
+    Dish = apps.get_model("kitchen", "Dish")
+    DishType = apps.get_model("kitchen", "DishType")
+    DishType.objects.update(dish_count=_count(Dish.objects.all(), "dish_type"))
+    Cook.objects.update(dish_count=_count(Dish.cooks.through.objects.all(), "cook"))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('kitchen', '0005_cook_prefix_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='cook',
+            name='dish_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='dishtype',
+            name='dish_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddIndex(
+            model_name='cook',
+            index=models.Index(fields=['is_staff'], name='kitchen_cook_is_staff_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='dish',
+            index=models.Index(fields=['name', 'id'], name='kitchen_dish_name_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='dish',
+            index=models.Index(fields=['dish_type', 'name'], name='kitchen_dish_type_name_idx'),
+        ),
+        migrations.RunPython(populate_dish_counts, migrations.RunPython.noop),
+    ]
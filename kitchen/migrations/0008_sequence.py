@@ -0,0 +1,26 @@
+# Generated by Django 5.2.6 on 2026-10-17 18:45
+
+from django.db import migrations, models
+
+
+def create_board_sequence(apps, schema_editor):
+    Sequence = apps.get_model("kitchen", "Sequence")
+    Sequence.objects.using(schema_editor.connection.alias).get_or_create(name="board")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('kitchen', '0006_dish_indexes_and_dish_counts'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Sequence',
+            fields=[
+                ('name', models.CharField(max_length=50, primary_key=True, serialize=False)),
+                ('value', models.PositiveBigIntegerField(default=0)),
+            ],
+        ),
+        migrations.RunPython(create_board_sequence, migrations.RunPython.noop),
+    ]
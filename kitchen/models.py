@@ -2,10 +2,30 @@ from django.conf import settings
 from django.db import models
 from django.contrib.auth.models import AbstractUser
 from django.urls import reverse
+from django.utils import timezone
 
+from kitchen.indexes import TrigramIndex
 
-class DishType(models.Model):
+
+class DishCountMixin:
+    """
+    Leave ``dish_count`` out of the UPDATE of a full save(). It is only
+    written by the UPDATEs in kitchen.dish_counts; an instance loaded earlier
+    (e.g. the cached ``request.user``) would write back a stale count over
+    concurrent changes. Explicit ``update_fields`` still write it, and a row
+    deleted meanwhile is inserted again, as with any save().
+    """
+
+    def _do_update(self, base_qs, using, pk_val, values, update_fields, forced_update):
+        if update_fields is None:
+            values = [value for value in values if value[0].name != "dish_count"]
+        return super()._do_update(base_qs, using, pk_val, values, update_fields, forced_update)
+
+
+class DishType(DishCountMixin, models.Model):
     name = models.CharField(max_length=255, unique=True)
+    # Maintained by kitchen.signals; see kitchen.dish_counts.
+    dish_count = models.PositiveIntegerField(default=0, editable=False)
 
     class Meta:
         ordering = ["name"]
@@ -14,13 +34,19 @@ class DishType(models.Model):
         return f"{self.name}"
 
 
-class Cook(AbstractUser):
+class Cook(DishCountMixin, AbstractUser):
     years_of_experience = models.IntegerField(default=0)
+    # Maintained by kitchen.signals; see kitchen.dish_counts.
+    dish_count = models.PositiveIntegerField(default=0, editable=False)
 
     class Meta:
         ordering = ["username"]
         verbose_name = "cook"
         verbose_name_plural = "cooks"
+        indexes = [
+            # Dashboard cook counter: COUNT(*) WHERE NOT is_staff.
+            models.Index(fields=["is_staff"], name="kitchen_cook_is_staff_idx"),
+        ]
 
     def __str__(self):
         return f"{self.username} ({self.first_name} {self.last_name})"
@@ -42,9 +68,86 @@ class Dish(models.Model):
         ordering = ["name"]
         verbose_name = "dish"
         verbose_name_plural = "dishes"
+        indexes = [
+            # Ordering and the (name, id) keyset of the dish list.
+            models.Index(fields=["name", "id"], name="kitchen_dish_name_id_idx"),
+            # Dishes of one type, by name.
+            models.Index(fields=["dish_type", "name"], name="kitchen_dish_type_name_idx"),
+            # Substring search (kitchen.search) on PostgreSQL.
+            TrigramIndex("name", name="kitchen_dish_name_trgm"),
+            TrigramIndex("description", name="kitchen_dish_description_trgm"),
+        ]
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        dish = super().from_db(db, field_names, values)
+        dish._remember_dish_type()
+        return dish
+
+    def refresh_from_db(self, *args, **kwargs):
+        super().refresh_from_db(*args, **kwargs)
+        self._remember_dish_type()
+
+    def _remember_dish_type(self):
+        # The stored dish type, so kitchen.signals can tell when a save moves
+        # the dish to another type without reading the row again.
+        if "dish_type_id" in self.__dict__:
+            self._stored_dish_type_id = self.dish_type_id
 
     def __str__(self):
         return f"name: {self.name}, price: {self.price}"
 
     def get_absolute_url(self):
         return reverse("kitchen:dish-detail",args=[self.id])
+
+
+class Job(models.Model):
+    """A unit of background work; see kitchen.jobs."""
+
+    QUEUED = "queued"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+    STATUS_CHOICES = [
+        (QUEUED, "Queued"),
+        (RUNNING, "Running"),
+        (DONE, "Done"),
+        (FAILED, "Failed"),
+    ]
+
+    task = models.CharField(max_length=100)
+    payload = models.JSONField(default=dict)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=QUEUED)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    max_attempts = models.PositiveSmallIntegerField(default=3)
+    run_after = models.DateTimeField(default=timezone.now)
+    result = models.JSONField(null=True, blank=True)
+    error = models.TextField(blank=True)
+    created_by = models.ForeignKey(settings.AUTH_USER_MODEL, null=True, blank=True,
+                                   on_delete=models.SET_NULL, related_name="+")
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ["-id"]
+        indexes = [
+            # Workers claim queued jobs that are due, oldest first.
+            models.Index(fields=["status", "run_after"], name="kitchen_job_status_run_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.task} #{self.pk} ({self.status})"
+
+
+class Sequence(models.Model):
+    """
+    A named counter that is incremented in the database, where concurrent
+    writers are serialized by the row lock; see kitchen.board.
+    """
+
+    name = models.CharField(max_length=50, primary_key=True)
+    value = models.PositiveBigIntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.name}: {self.value}"
@@ -0,0 +1,223 @@
+import base64
+import binascii
+import json
+import math
+
+from django.core.exceptions import ValidationError
+from django.core.paginator import InvalidPage
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Q
+from django.http import Http404
+
+CURSOR_PARAM = "cursor"
+FORWARD = "n"
+BACKWARD = "p"
+
+
+def encode_cursor(values, direction):
+    payload = json.dumps({"k": values, "d": direction}, cls=DjangoJSONEncoder)
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(token):
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        values, direction = payload["k"], payload["d"]
+    except (binascii.Error, ValueError, TypeError, KeyError):
+        raise InvalidPage("Invalid cursor.")
+    if (direction not in (FORWARD, BACKWARD) or not isinstance(values, list)
+            or not all(_is_key_value(value) for value in values)):
+        raise InvalidPage("Invalid cursor.")
+    return values, direction
+
+
+def _is_key_value(value):
+    """Whether ``value`` is something :func:`encode_cursor` could have written."""
+    if isinstance(value, bool):
+        return False
+    if isinstance(value, int):
+        # Wider integers overflow the database driver.
+        return -2**63 <= value < 2**63
+    if isinstance(value, float):
+        return math.isfinite(value)
+    return isinstance(value, str)
+
+
+def seek_filter(ordering, values, direction):
+    """
+    Build the lexicographic "row comes after/before ``values``" condition
+    for ``ordering``, e.g. ``name > n OR (name = n AND id > i)``.
+
+    The leading column is additionally bounded with ``>=``/``<=`` so the
+    database can turn the condition into an index range scan.
+    """
+    condition = Q()
+    equal = Q()
+    for field, value in zip(ordering, values):
+        descending = field.startswith("-")
+        name = field.lstrip("-")
+        after = (direction == FORWARD) != descending
+        condition |= equal & Q(**{f"{name}__{'gt' if after else 'lt'}": value})
+        equal &= Q(**{name: value})
+
+    leading = ordering[0]
+    after = (direction == FORWARD) != leading.startswith("-")
+    bound = Q(**{f"{leading.lstrip('-')}__{'gte' if after else 'lte'}": values[0]})
+    return bound & condition
+
+
+def _reverse(field):
+    return field[1:] if field.startswith("-") else f"-{field}"
+
+
+class KeysetPage:
+    def __init__(self, object_list, paginator, next_cursor, previous_cursor):
+        self.object_list = object_list
+        self.paginator = paginator
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+        self.is_first = previous_cursor is None
+
+    def __repr__(self):
+        return f"<KeysetPage of {len(self.object_list)} objects>"
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __getitem__(self, index):
+        return self.object_list[index]
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def has_next(self):
+        return self.next_cursor is not None
+
+    def has_previous(self):
+        return self.previous_cursor is not None
+
+    def has_other_pages(self):
+        return self.has_next() or self.has_previous()
+
+
+class KeysetPaginator:
+    """
+    Cursor paginator that seeks on ``ordering`` (which must end in a unique
+    column) instead of using ``COUNT(*)`` and ``OFFSET``, so every page
+    costs one indexed query no matter how deep it is.
+    """
+
+    keyset = True
+
+    def __init__(self, object_list, per_page, ordering=("name", "id")):
+        self.object_list = object_list
+        self.per_page = int(per_page)
+        self.ordering = tuple(ordering)
+
+    def _key(self, obj):
+        if isinstance(obj, dict):
+            return [obj[field.lstrip("-")] for field in self.ordering]
+        return [getattr(obj, field.lstrip("-")) for field in self.ordering]
+
+    def _query(self, values, direction):
+        queryset = self.object_list
+        ordering = self.ordering
+        if direction == BACKWARD:
+            ordering = tuple(_reverse(field) for field in ordering)
+        if values is not None:
+            if len(values) != len(self.ordering):
+                raise InvalidPage("Invalid cursor.")
+            try:
+                queryset = queryset.filter(seek_filter(self.ordering, values, direction))
+            except (TypeError, ValueError, ValidationError):
+                # A value of the wrong type for its field, e.g. "x" for an id.
+                raise InvalidPage("Invalid cursor.")
+        return queryset.order_by(*ordering)[: self.per_page + 1]
+
+    def _trim(self, rows, direction):
+        has_more = len(rows) > self.per_page
+        rows = rows[: self.per_page]
+        if direction == BACKWARD:
+            rows.reverse()
+        return rows, has_more
+
+    def _fetch(self, values, direction):
+        return self._trim(list(self._query(values, direction)), direction)
+
+    async def _afetch(self, values, direction):
+        rows = [row async for row in self._query(values, direction)]
+        return self._trim(rows, direction)
+
+    def _page(self, rows, has_next, has_previous):
+        next_cursor = previous_cursor = None
+        if rows and has_next:
+            next_cursor = encode_cursor(self._key(rows[-1]), FORWARD)
+        if rows and has_previous:
+            previous_cursor = encode_cursor(self._key(rows[0]), BACKWARD)
+        return KeysetPage(rows, self, next_cursor, previous_cursor)
+
+    def page(self, cursor=None):
+        if not cursor:
+            rows, has_next = self._fetch(None, FORWARD)
+            return self._page(rows, has_next, False)
+        values, direction = decode_cursor(cursor)
+        rows, has_more = self._fetch(values, direction)
+        if direction == FORWARD:
+            return self._page(rows, has_more, True)
+        if has_more:
+            return self._page(rows, True, True)
+        # Walked back past the start: serve a full first page.
+        return self.page()
+
+    async def apage(self, cursor=None):
+        """Async counterpart of :meth:`page` for async views."""
+        if not cursor:
+            rows, has_next = await self._afetch(None, FORWARD)
+            return self._page(rows, has_next, False)
+        values, direction = decode_cursor(cursor)
+        rows, has_more = await self._afetch(values, direction)
+        if direction == FORWARD:
+            return self._page(rows, has_more, True)
+        if has_more:
+            return self._page(rows, True, True)
+        return await self.apage()
+
+
+class PaginationModeMixin:
+    """
+    ListView mixin selecting between Django's offset pagination
+    (``pagination_mode = "offset"``) and :class:`KeysetPaginator`
+    (``pagination_mode = "keyset"``).
+    """
+
+    pagination_mode = "offset"
+    keyset_ordering = ("name", "id")
+    page_window_on_each_side = 2
+    page_window_on_ends = 1
+
+    def get_pagination_mode(self):
+        return self.pagination_mode
+
+    def paginate_queryset(self, queryset, page_size):
+        if self.get_pagination_mode() != "keyset":
+            return super().paginate_queryset(queryset, page_size)
+
+        paginator = KeysetPaginator(queryset, page_size, self.keyset_ordering)
+        try:
+            page = paginator.page(self.request.GET.get(CURSOR_PARAM))
+        except InvalidPage as e:
+            raise Http404(str(e))
+        return paginator, page, page.object_list, page.has_other_pages()
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        paginator = context.get("paginator")
+        page = context.get("page_obj")
+        if page is not None and not getattr(paginator, "keyset", False):
+            context["page_range"] = list(paginator.get_elided_page_range(
+                page.number,
+                on_each_side=self.page_window_on_each_side,
+                on_ends=self.page_window_on_ends,
+            ))
+        return context
@@ -0,0 +1,98 @@
+import hashlib
+import uuid
+
+from django.conf import settings
+from django.contrib.messages import get_messages
+from django.core.cache import cache
+from django.db import transaction
+
+GENERATION_KEY = "kitchen:response-generation"
+KEY_PREFIX = "kitchen:response:"
+
+DEFAULT_TIMEOUT = 600
+
+
+def _new_generation():
+    # Never reused: a counter restarting at 1 after the key was evicted
+    # would bring back pages cached under the earlier 1.
+    return uuid.uuid4().hex
+
+
+def get_generation():
+    generation = cache.get(GENERATION_KEY)
+    if generation is None:
+        generation = _new_generation()
+        if not cache.add(GENERATION_KEY, generation, timeout=None):
+            generation = cache.get(GENERATION_KEY) or generation
+    return generation
+
+
+def _bump():
+    cache.set(GENERATION_KEY, _new_generation(), timeout=None)
+
+
+def invalidate():
+    """Retire every cached response once the current transaction commits."""
+    transaction.on_commit(_bump)
+
+
+def _variant(request):
+    # Pages embed the user's name and a CSRF token derived from the CSRF
+    # cookie, so both are part of the key.
+    csrf_cookie = request.COOKIES.get(settings.CSRF_COOKIE_NAME)
+    if csrf_cookie is None:
+        return None
+    raw = f"{request.user.pk}:{csrf_cookie}"
+    return hashlib.md5(raw.encode(), usedforsecurity=False).hexdigest()
+
+
+class CachedResponseMixin:
+    """
+    View mixin serving GET responses from the cache, keyed by view, full
+    path (query string included) and user variant, under the current
+    generation. Signals replace the generation on every menu change, which
+    orphans all cached responses at once.
+
+    Put it after ``LoginRequiredMixin`` so anonymous users are redirected
+    before the cache is consulted.
+    """
+
+    response_cache_timeout = None
+
+    def get_response_cache_timeout(self):
+        if self.response_cache_timeout is not None:
+            return self.response_cache_timeout
+        return getattr(settings, "KITCHEN_RESPONSE_CACHE_TIMEOUT", DEFAULT_TIMEOUT)
+
+    def get_response_cache_key(self):
+        variant = _variant(self.request)
+        if variant is None:
+            return None
+        view = f"{type(self).__module__}.{type(self).__qualname__}"
+        path = hashlib.md5(
+            self.request.get_full_path().encode(), usedforsecurity=False
+        ).hexdigest()
+        return f"{KEY_PREFIX}{get_generation()}:{view}:{path}:{variant}"
+
+    def dispatch(self, request, *args, **kwargs):
+        if (
+            request.method not in ("GET", "HEAD")
+            or not self.get_response_cache_timeout()
+            # Flash messages are shown once; keep them out of the cache.
+            or len(get_messages(request))
+        ):
+            return super().dispatch(request, *args, **kwargs)
+        key = self.get_response_cache_key()
+        if key is None:
+            return super().dispatch(request, *args, **kwargs)
+        response = cache.get(key)
+        if response is not None:
+            return response
+        response = super().dispatch(request, *args, **kwargs)
+        if response.status_code == 200:
+            timeout = self.get_response_cache_timeout()
+            if hasattr(response, "render") and callable(response.render):
+                response.add_post_render_callback(lambda r: cache.set(key, r, timeout))
+            else:
+                cache.set(key, response, timeout)
+        return response
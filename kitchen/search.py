@@ -0,0 +1,100 @@
+from contextlib import contextmanager
+
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+from django.db.models import F, FloatField, Q, Value
+from django.db.models.expressions import RawSQL
+
+# Trigram indexes (pg_trgm on PostgreSQL, FTS5 "trigram" tokenizer on SQLite)
+# can only answer queries of at least three characters.
+MIN_INDEXED_QUERY_LENGTH = 3
+
+DESCRIPTION_WEIGHT = 0.5
+
+SQLITE_FTS_TABLE = "kitchen_dish_fts"
+
+# The insert trigger created by migration 0004, for deferred_indexing().
+SQLITE_INSERT_TRIGGER_SQL = f"""
+    CREATE TRIGGER {SQLITE_FTS_TABLE}_ai AFTER INSERT ON kitchen_dish BEGIN
+        INSERT INTO {SQLITE_FTS_TABLE}(rowid, name, description)
+        VALUES (new.id, new.name, new.description);
+    END
+"""
+
+
+@contextmanager
+def deferred_indexing(using=DEFAULT_DB_ALIAS):
+    """
+    Run the block in a transaction that indexes the dishes it inserts once,
+    at the end, instead of row by row. On SQLite the per-row FTS trigger
+    costs several times the insert itself; other databases index as usual.
+    """
+    connection = connections[using]
+    with transaction.atomic(using=using):
+        if connection.vendor != "sqlite":
+            yield
+            return
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT COALESCE(MAX(id), 0) FROM kitchen_dish")
+            last_id = cursor.fetchone()[0]
+            cursor.execute(f"DROP TRIGGER IF EXISTS {SQLITE_FTS_TABLE}_ai")
+        yield
+        with connection.cursor() as cursor:
+            cursor.execute(SQLITE_INSERT_TRIGGER_SQL)
+            cursor.execute(
+                f"INSERT INTO {SQLITE_FTS_TABLE}(rowid, name, description) "
+                f"SELECT id, name, description FROM kitchen_dish WHERE id > %s",
+                [last_id],
+            )
+
+
+def _substring_filter(query):
+    return Q(name__icontains=query) | Q(description__icontains=query)
+
+
+def _search_postgresql(queryset, query):
+    from django.contrib.postgres.search import TrigramWordSimilarity
+
+    return queryset.filter(_substring_filter(query)).annotate(
+        search_rank=TrigramWordSimilarity(query, "name")
+        + TrigramWordSimilarity(query, "description") * DESCRIPTION_WEIGHT
+    )
+
+
+def _search_sqlite(queryset, query):
+    table = queryset.model._meta.db_table
+    phrase = '"%s"' % query.replace('"', '""')
+    matches = RawSQL(
+        f"SELECT rowid FROM {SQLITE_FTS_TABLE} "
+        f"WHERE {SQLITE_FTS_TABLE} MATCH %s",
+        (phrase,),
+    )
+    rank = RawSQL(
+        f"SELECT -bm25({SQLITE_FTS_TABLE}, 1.0, {DESCRIPTION_WEIGHT}) "
+        f"FROM {SQLITE_FTS_TABLE} "
+        f"WHERE {SQLITE_FTS_TABLE} MATCH %s AND rowid = {table}.id",
+        (phrase,),
+        output_field=FloatField(),
+    )
+    return queryset.filter(id__in=matches).annotate(search_rank=rank)
+
+
+def search_dishes(queryset, query):
+    """
+    Filter ``queryset`` to dishes whose name or description contains
+    ``query`` and order them by relevance (``search_rank``, best first).
+    """
+    query = (query or "").strip()
+    if not query:
+        return queryset
+
+    vendor = connections[queryset.db].vendor
+    indexed = len(query) >= MIN_INDEXED_QUERY_LENGTH
+    if indexed and vendor == "postgresql":
+        queryset = _search_postgresql(queryset, query)
+    elif indexed and vendor == "sqlite":
+        queryset = _search_sqlite(queryset, query)
+    else:
+        queryset = queryset.filter(_substring_filter(query)).annotate(
+            search_rank=Value(0.0, output_field=FloatField())
+        )
+    return queryset.order_by(F("search_rank").desc(), "name", "id")
@@ -0,0 +1,149 @@
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete, pre_save
+from django.dispatch import receiver
+
+from kitchen import auth, board, counters, dish_counts, response_cache
+from kitchen.models import Cook, Dish, DishType
+
+
+@receiver(post_save, sender=Dish)
+def dish_saved(sender, instance, created, **kwargs):
+    if created:
+        counters.adjust("dishes", 1)
+
+
+@receiver(post_delete, sender=Dish)
+def dish_deleted(sender, instance, **kwargs):
+    counters.adjust("dishes", -1)
+
+
+@receiver(post_save, sender=DishType)
+def dish_type_saved(sender, instance, created, **kwargs):
+    if created:
+        counters.adjust("dish_types", 1)
+
+
+@receiver(post_delete, sender=DishType)
+def dish_type_deleted(sender, instance, **kwargs):
+    counters.adjust("dish_types", -1)
+
+
+@receiver(post_save, sender=Cook)
+def cook_saved(sender, instance, created, update_fields=None, **kwargs):
+    if created:
+        if not instance.is_staff:
+            counters.adjust("cooks", 1)
+    elif update_fields is None or "is_staff" in update_fields:
+        # The previous is_staff value is unknown here, so recount lazily.
+        counters.invalidate("cooks")
+
+
+@receiver(post_delete, sender=Cook)
+def cook_deleted(sender, instance, **kwargs):
+    if not instance.is_staff:
+        counters.adjust("cooks", -1)
+
+
+@receiver(post_save, sender=Cook)
+@receiver(post_delete, sender=Cook)
+def cook_changed(sender, instance, **kwargs):
+    # Covers password changes, which save the cook.
+    auth.invalidate(instance.pk)
+
+
+@receiver(post_save, sender=Dish)
+@receiver(post_delete, sender=Dish)
+@receiver(post_save, sender=DishType)
+@receiver(post_delete, sender=DishType)
+@receiver(post_save, sender=Cook)
+@receiver(post_delete, sender=Cook)
+@receiver(m2m_changed, sender=Dish.cooks.through)
+def menu_changed(sender, action=None, update_fields=None, **kwargs):
+    if update_fields is not None and set(update_fields) == {"last_login"}:
+        # Saved by every login; nothing rendered depends on it.
+        return
+    if action is None or action.startswith("post_"):
+        response_cache.invalidate()
+
+
+@receiver(pre_save, sender=Dish)
+def dish_type_before_save(sender, instance, update_fields=None, **kwargs):
+    instance._previous_dish_type_id = None
+    if instance._state.adding or (update_fields is not None and "dish_type" not in update_fields):
+        return
+    try:
+        instance._previous_dish_type_id = instance._stored_dish_type_id
+    except AttributeError:
+        # Loaded with the dish type deferred.
+        instance._previous_dish_type_id = (
+            Dish.objects.filter(pk=instance.pk).values_list("dish_type_id", flat=True).first()
+        )
+
+
+@receiver(post_save, sender=Dish)
+def dish_type_count_after_save(sender, instance, created, **kwargs):
+    previous = getattr(instance, "_previous_dish_type_id", None)
+    if created or previous != instance.dish_type_id:
+        dish_counts.recount_dish_types({instance.dish_type_id, previous} - {None})
+    instance._remember_dish_type()
+
+
+@receiver(pre_delete, sender=Dish)
+def dish_cooks_before_delete(sender, instance, **kwargs):
+    instance._previous_cook_ids = list(
+        Dish.cooks.through.objects.filter(dish_id=instance.pk).values_list("cook_id", flat=True)
+    )
+
+
+@receiver(post_delete, sender=Dish)
+def dish_counts_after_delete(sender, instance, **kwargs):
+    dish_counts.recount_dish_types([instance.dish_type_id])
+    if instance._previous_cook_ids:
+        dish_counts.recount_cooks(instance._previous_cook_ids)
+
+
+@receiver(m2m_changed, sender=Dish.cooks.through)
+def cook_dish_counts(sender, instance, action, reverse, pk_set, **kwargs):
+    if action == "pre_clear":
+        instance._cleared_cook_ids = (
+            [instance.pk] if reverse
+            else list(instance.cooks.values_list("pk", flat=True))
+        )
+    elif action == "post_clear":
+        dish_counts.recount_cooks(instance._cleared_cook_ids)
+    elif action in ("post_add", "post_remove") and pk_set:
+        dish_counts.recount_cooks([instance.pk] if reverse else pk_set)
+
+
+@receiver(post_save, sender=Dish)
+def dish_published(sender, instance, **kwargs):
+    board.publish({"type": "dish", "dish": {
+        "id": instance.pk,
+        "name": instance.name,
+        "price": f"{instance.price:.2f}",
+        "dish_type": instance.dish_type_id,
+    }})
+
+
+@receiver(post_delete, sender=Dish)
+def dish_deletion_published(sender, instance, **kwargs):
+    board.publish({"type": "dish_deleted", "dish": instance.pk})
+
+
+@receiver(m2m_changed, sender=Dish.cooks.through)
+def assignments_published(sender, instance, action, reverse, pk_set, **kwargs):
+    if action == "post_clear":
+        board.publish(board.RELOAD)
+        return
+    if action not in ("post_add", "post_remove") or not pk_set:
+        return
+    if reverse:
+        dishes = sorted(pk_set)
+        cooks = [{"id": instance.pk, "username": instance.username}]
+    else:
+        dishes = [instance.pk]
+        cooks = list(Cook.objects.filter(pk__in=pk_set).values("id", "username"))
+    board.publish({
+        "type": "assign" if action == "post_add" else "unassign",
+        "dishes": dishes,
+        "cooks": cooks,
+    })
@@ -0,0 +1,78 @@
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+
+from kitchen.models import Dish, DishType
+
+
+class ApiTest(TestCase):
+    def setUp(self):
+        self.cook = get_user_model().objects.create_user(
+            username="olga", password="test123", last_name="Ivanova"
+        )
+        self.client.force_login(self.cook)
+        self.soup = DishType.objects.create(name="Soup")
+        self.dishes = [
+            Dish.objects.create(name=f"Dish {i}", price=10 + i, dish_type=self.soup)
+            for i in range(3)
+        ]
+        self.dishes[0].cooks.add(self.cook)
+
+    def test_requires_authentication(self):
+        self.client.logout()
+        response = self.client.get(reverse("kitchen:api-dish-list"))
+        self.assertEqual(response.status_code, 401)
+
+    def test_dish_list_default_fields(self):
+        response = self.client.get(reverse("kitchen:api-dish-list"))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["results"][0], {
+            "id": self.dishes[0].id, "name": "Dish 0", "price": "10.00",
+            "dish_type": self.soup.id,
+        })
+
+    def test_sparse_fieldset_with_cooks(self):
+        url = reverse("kitchen:api-dish-list")
+        with self.assertNumQueries(4):  # Session, user, dishes, cooks.
+            response = self.client.get(url, {"fields": "name,dish_type_name,cooks"})
+        self.assertEqual(response.json()["results"][0], {
+            "name": "Dish 0", "dish_type_name": "Soup", "cooks": [self.cook.id],
+        })
+
+    def test_unknown_field_is_rejected(self):
+        response = self.client.get(reverse("kitchen:api-cook-list"), {"fields": "password"})
+        self.assertEqual(response.status_code, 400)
+
+    def test_invalid_limit_is_rejected(self):
+        url = reverse("kitchen:api-dish-list")
+        for limit in ["abc", "0", "-3"]:
+            with self.subTest(limit=limit):
+                response = self.client.get(url, {"limit": limit})
+                self.assertEqual(response.status_code, 400)
+                self.assertEqual(
+                    response.json(), {"detail": "limit must be a whole number from 1 to 200."}
+                )
+
+    def test_cursor_pagination(self):
+        url = reverse("kitchen:api-dish-list")
+        first = self.client.get(url, {"limit": 2, "fields": "id"}).json()
+        self.assertEqual(len(first["results"]), 2)
+        second = self.client.get(url, {"limit": 2, "fields": "id", "cursor": first["next"]}).json()
+        self.assertEqual(second["results"], [{"id": self.dishes[2].id}])
+        self.assertIsNone(second["next"])
+
+    def test_detail(self):
+        response = self.client.get(reverse("kitchen:api-cook-detail", args=[self.cook.id]))
+        self.assertEqual(response.json()["last_name"], "Ivanova")
+        self.assertNotIn("password", response.json())
+        response = self.client.get(reverse("kitchen:api-dish-type-detail", args=[0]))
+        self.assertEqual(response.status_code, 404)
+
+    def test_etag_revalidation(self):
+        url = reverse("kitchen:api-dish-type-list")
+        etag = self.client.get(url)["ETag"]
+        response = self.client.get(url, headers={"If-None-Match": etag})
+        self.assertEqual(response.status_code, 304)
+        DishType.objects.create(name="Salad")
+        response = self.client.get(url, headers={"If-None-Match": etag})
+        self.assertEqual(response.status_code, 200)
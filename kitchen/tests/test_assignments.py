@@ -0,0 +1,90 @@
+from django.contrib.auth import get_user_model
+from django.db.models.signals import m2m_changed
+from django.test import TestCase
+from django.urls import reverse
+
+from kitchen.assignments import assign_cooks, unassign_cooks
+from kitchen.models import Dish, DishType
+
+
+class AssignmentsTest(TestCase):
+    def setUp(self):
+        dish_type = DishType.objects.create(name="Soup")
+        self.dishes = [
+            Dish.objects.create(name=f"Dish {i}", price=10, dish_type=dish_type)
+            for i in range(3)
+        ]
+        self.dish_ids = [dish.id for dish in self.dishes]
+        self.cook = get_user_model().objects.create_user(username="cook", password="test123")
+        self.signals = []
+        m2m_changed.connect(self.record_signal, sender=Dish.cooks.through)
+        self.addCleanup(m2m_changed.disconnect, self.record_signal, sender=Dish.cooks.through)
+
+    def record_signal(self, action, instance, pk_set, **kwargs):
+        self.signals.append((action, instance.pk, pk_set))
+
+    def test_assign_inserts_only_missing_rows(self):
+        self.dishes[0].cooks.add(self.cook)
+        self.signals.clear()
+        self.assertEqual(assign_cooks(self.dish_ids, [self.cook]), 2)
+        self.assertEqual(self.cook.cooked_dishes.count(), 3)
+        self.assertEqual(self.signals, [
+            ("pre_add", self.cook.pk, set(self.dish_ids[1:])),
+            ("post_add", self.cook.pk, set(self.dish_ids[1:])),
+        ])
+
+    def test_assign_runs_constant_queries(self):
+        # Savepoint, existing rows, bulk insert, dish_count recount, release.
+        with self.assertNumQueries(5):
+            assign_cooks(self.dish_ids, [self.cook])
+
+    def test_dish_counts_of_all_cooks_are_recounted_at_once(self):
+        cooks = [self.cook] + [
+            get_user_model().objects.create_user(username=f"cook{i}") for i in range(3)
+        ]
+        with self.assertNumQueries(5):
+            assign_cooks(self.dish_ids, cooks)
+        with self.assertNumQueries(4):  # Savepoint, delete, recount, release.
+            unassign_cooks(self.dish_ids[:1], cooks)
+        self.assertEqual(
+            [cook.dish_count for cook in get_user_model().objects.filter(pk__in=[c.pk for c in cooks])],
+            [2] * 4,
+        )
+
+    def test_unassign(self):
+        assign_cooks(self.dish_ids, [self.cook])
+        self.signals.clear()
+        self.assertEqual(unassign_cooks(self.dish_ids[:2], [self.cook]), 2)
+        self.assertEqual(list(self.cook.cooked_dishes.all()), [self.dishes[2]])
+        self.assertEqual([action for action, _, _ in self.signals], ["pre_remove", "post_remove"])
+
+    def test_bulk_assignment_view(self):
+        self.client.force_login(self.cook)
+        url = reverse("kitchen:bulk-assignment")
+        response = self.client.post(url, {"action": "assign", "dishes": self.dish_ids})
+        self.assertRedirects(response, reverse("kitchen:dish-list"))
+        self.assertEqual(self.cook.cooked_dishes.count(), 3)
+
+        self.client.post(url, {"action": "remove", "dishes": self.dish_ids[:1]})
+        self.assertEqual(self.cook.cooked_dishes.count(), 2)
+
+    def test_bulk_assignment_view_rejects_unknown_dishes(self):
+        self.client.force_login(self.cook)
+        response = self.client.post(
+            reverse("kitchen:bulk-assignment"), {"action": "assign", "dishes": [0]}
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("dishes", response.json()["errors"])
+
+    def test_bulk_assignment_form_without_dishes_redirects_with_message(self):
+        self.client.force_login(self.cook)
+        next_url = reverse("kitchen:dish-list") + "?mode=offset"
+        response = self.client.post(
+            reverse("kitchen:bulk-assignment"),
+            {"action": "assign", "next": next_url},
+            HTTP_ACCEPT="text/html,application/xhtml+xml",
+        )
+        self.assertRedirects(response, next_url, fetch_redirect_response=False)
+        self.assertContains(self.client.get(next_url), "Select at least one dish.")
+        # Shown once, and not served again from the page cache.
+        self.assertNotContains(self.client.get(next_url), "Select at least one dish.")
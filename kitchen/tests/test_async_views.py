@@ -0,0 +1,53 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+
+from kitchen.models import Dish, DishType
+
+
+class AsyncViewTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = get_user_model().objects.create_user(username="olga", password="test123")
+        self.dish_type = DishType.objects.create(name="Soup")
+        self.dish = Dish.objects.create(name="Borshch", price=15, dish_type=self.dish_type)
+        self.dish.cooks.add(self.user)
+
+    async def test_requires_login(self):
+        response = await self.async_client.get(reverse("kitchen:display-dish-list"))
+        self.assertEqual(response.status_code, 302)
+
+    async def test_index(self):
+        await self.async_client.aforce_login(self.user)
+        response = await self.async_client.get(reverse("kitchen:display-index"))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context["num_dishes"], 1)
+
+    async def test_dish_list_and_search(self):
+        await self.async_client.aforce_login(self.user)
+        url = reverse("kitchen:display-dish-list")
+        response = await self.async_client.get(url)
+        self.assertContains(response, "Borshch")
+        self.assertTrue(response.context["paginator"].keyset)
+        response = await self.async_client.get(url, {"name": "borsh"})
+        self.assertEqual(list(response.context["dish_list"]), [self.dish])
+
+    async def test_dish_detail(self):
+        await self.async_client.aforce_login(self.user)
+        response = await self.async_client.get(
+            reverse("kitchen:display-dish-detail", args=[self.dish.id])
+        )
+        self.assertTrue(response.context["is_assigned"])
+        self.assertEqual(list(response.context["cooks_page"]), [self.user])
+
+    async def test_cook_pages(self):
+        await self.async_client.aforce_login(self.user)
+        response = await self.async_client.get(reverse("kitchen:display-cook-list"))
+        self.assertContains(response, "olga")
+        response = await self.async_client.get(
+            reverse("kitchen:display-cook-detail", args=[self.user.id])
+        )
+        self.assertContains(response, "Borshch")
+        response = await self.async_client.get(reverse("kitchen:display-cook-detail", args=[0]))
+        self.assertEqual(response.status_code, 404)
@@ -0,0 +1,84 @@
+import time
+from unittest import mock
+
+from django.conf import settings
+from django.contrib.auth import BACKEND_SESSION_KEY, get_user_model
+from django.core.cache import caches
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from kitchen.auth import CachedModelBackend
+
+
+class CachedModelBackendTest(TestCase):
+    def setUp(self):
+        caches["users"].clear()
+        self.cook = get_user_model().objects.create_user(username="olga", password="test123")
+        self.backend = CachedModelBackend()
+
+    def test_second_load_is_served_from_cache(self):
+        self.backend.get_user(self.cook.pk)
+        with self.assertNumQueries(0):
+            self.assertEqual(self.backend.get_user(self.cook.pk), self.cook)
+
+    async def test_async_load_is_served_from_cache(self):
+        await self.backend.aget_user(self.cook.pk)
+        # A queryset update sends no signals, so the cached row is served.
+        await get_user_model().objects.filter(pk=self.cook.pk).aupdate(first_name="Olga")
+        self.assertEqual((await self.backend.aget_user(self.cook.pk)).first_name, "")
+
+    def test_save_invalidates(self):
+        self.backend.get_user(self.cook.pk)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.cook.first_name = "Olga"
+            self.cook.save()
+        with self.assertNumQueries(1):
+            self.assertEqual(self.backend.get_user(self.cook.pk).first_name, "Olga")
+
+    def test_change_made_by_another_worker_is_seen_once_the_entry_expires(self):
+        self.backend.get_user(self.cook.pk)
+        # Another worker deactivates the cook: its own "users" cache is
+        # separate, so this one serves its entry until it expires.
+        get_user_model().objects.filter(pk=self.cook.pk).update(is_active=False)
+        self.assertEqual(self.backend.get_user(self.cook.pk), self.cook)
+        later = time.time() + settings.KITCHEN_USER_CACHE_TIMEOUT
+        with mock.patch("time.time", return_value=later):
+            self.assertIsNone(self.backend.get_user(self.cook.pk))
+
+    def test_delete_invalidates(self):
+        self.backend.get_user(self.cook.pk)
+        pk = self.cook.pk
+        with self.captureOnCommitCallbacks(execute=True):
+            self.cook.delete()
+        self.assertIsNone(self.backend.get_user(pk))
+
+    def test_inactive_user_is_not_loaded(self):
+        self.cook.is_active = False
+        self.cook.save()
+        self.assertIsNone(self.backend.get_user(self.cook.pk))
+        self.assertIsNone(caches["users"].get(f"kitchen:user:{self.cook.pk}"))
+
+    @override_settings(KITCHEN_USER_CACHE_TIMEOUT=0)
+    def test_zero_timeout_disables_cache(self):
+        self.backend.get_user(self.cook.pk)
+        with self.assertNumQueries(1):
+            self.backend.get_user(self.cook.pk)
+
+    def test_password_change_ends_other_sessions(self):
+        self.client.force_login(self.cook)
+        url = reverse("kitchen:dish-list")
+        self.assertEqual(self.client.get(url).status_code, 200)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.cook.set_password("new-password")
+            self.cook.save()
+        self.assertEqual(self.client.get(url).status_code, 302)
+
+    def test_sessions_of_the_plain_model_backend_move_to_the_cache(self):
+        self.client.force_login(self.cook, backend="django.contrib.auth.backends.ModelBackend")
+        self.assertEqual(self.client.get(reverse("kitchen:dish-list")).status_code, 200)
+        self.assertEqual(self.client.session[BACKEND_SESSION_KEY], "kitchen.auth.CachedModelBackend")
+        self.assertIsNotNone(caches["users"].get(f"kitchen:user:{self.cook.pk}"))
+
+    def test_login_uses_the_cached_backend(self):
+        self.client.post(reverse("login"), {"username": "olga", "password": "test123"})
+        self.assertEqual(self.client.session[BACKEND_SESSION_KEY], "kitchen.auth.CachedModelBackend")
@@ -0,0 +1,160 @@
+import asyncio
+import json
+from unittest import mock
+
+from asgiref.sync import async_to_sync
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+
+from kitchen import board
+from kitchen.assignments import assign_cooks
+from kitchen.models import Dish, DishType, Sequence
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+class BoardTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.cook = get_user_model().objects.create_user(username="olga", password="test123")
+        self.dish_type = DishType.objects.create(name="Soup")
+        self.dish = Dish.objects.create(name="Borshch", price=10, dish_type=self.dish_type)
+
+    def test_changes_are_published_on_commit(self):
+        after = board.latest()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.dish.cooks.add(self.cook)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.cook.cooked_dishes.remove(self.dish)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.dish.name = "Red borshch"
+            self.dish.save()
+        events = [event for _, event in board.events_after(after)]
+        cooks = [{"id": self.cook.id, "username": "olga"}]
+        self.assertEqual(events, [
+            {"type": "assign", "dishes": [self.dish.id], "cooks": cooks},
+            {"type": "unassign", "dishes": [self.dish.id], "cooks": cooks},
+            {"type": "dish", "dish": {"id": self.dish.id, "name": "Red borshch",
+                                      "price": "10.00", "dish_type": self.dish_type.id}},
+        ])
+
+    def test_nothing_is_published_before_commit(self):
+        after = board.latest()
+        with self.captureOnCommitCallbacks(execute=False):
+            self.dish.cooks.add(self.cook)
+        self.assertEqual(board.events_after(after), [])
+
+    def test_expired_events_ask_for_reload(self):
+        after = board.latest()
+        for name in ("a", "b"):
+            with self.captureOnCommitCallbacks(execute=True):
+                Dish.objects.create(name=name, price=1, dish_type=self.dish_type)
+        cache.delete(board._event_key(after + 1))
+        self.assertEqual(board.events_after(after), [(after + 2, board.RELOAD)])
+
+    def test_sequence_is_numbered_in_the_database(self):
+        Sequence.objects.all().delete()
+        self.assertEqual(board.latest(), 0)
+        self.assertEqual([board._reserve(1) for _ in range(3)], [1, 2, 3])
+        self.assertEqual(board._reserve(4), 7)
+        self.assertEqual(Sequence.objects.get(name=board.SEQUENCE_NAME).value, 7)
+
+    def test_batched_events_take_their_numbers_with_one_query(self):
+        other = get_user_model().objects.create_user(username="ivan", password="test123")
+        after = board.latest()
+        with self.captureOnCommitCallbacks(execute=True):
+            assign_cooks([self.dish.id], [self.cook, other])
+        self.assertEqual([seq for seq, _ in board.events_after(after)], [after + 1, after + 2])
+        with self.assertNumQueries(1):
+            board._store([board.RELOAD, board.RELOAD])
+
+    def test_client_ahead_of_a_reset_sequence_reloads(self):
+        Sequence.objects.all().delete()
+        self.assertEqual(board.events_after(40), [(0, board.RELOAD)])
+
+    def test_sync_stream_returns_at_once(self):
+        after = board.latest()
+        dish_id = self.dish.id
+        with self.captureOnCommitCallbacks(execute=True):
+            self.dish.delete()
+        self.assertEqual(list(board.stream(after)), [
+            "retry: 3000\n\n",
+            f"id: {after + 1}\ndata: {json.dumps({'type': 'dish_deleted', 'dish': dish_id})}\n\n",
+        ])
+        self.assertEqual(list(board.stream(after + 1)), ["retry: 3000\n\n"])
+
+    def test_async_stream_sends_events_and_ends(self):
+        after = board.latest()
+        dish_id = self.dish.id
+        with self.captureOnCommitCallbacks(execute=True):
+            self.dish.delete()
+        clock = FakeClock()
+
+        async def sleep(seconds):
+            clock.sleep(seconds)
+
+        async def collect():
+            return [chunk async for chunk in board.astream(after, clock=clock, sleep=sleep)]
+
+        chunks = async_to_sync(collect)()
+        self.assertEqual(chunks[0], "retry: 1000\n\n")
+        self.assertEqual(
+            chunks[1],
+            f"id: {after + 1}\ndata: {json.dumps({'type': 'dish_deleted', 'dish': dish_id})}\n\n",
+        )
+        self.assertIn(": heartbeat\n\n", chunks)
+        self.assertEqual(clock.now, board.STREAM_DURATION)
+
+    def test_async_streams_share_one_poll(self):
+        after = board.latest()
+        dish_id = self.dish.id
+        with self.captureOnCommitCallbacks(execute=True):
+            self.dish.delete()
+        clock = FakeClock()
+        reads = []
+        aevents_after = board.aevents_after
+
+        async def counted(after):
+            reads.append(after)
+            return await aevents_after(after)
+
+        async def sleep(seconds):
+            clock.sleep(seconds)
+            await asyncio.sleep(0)
+
+        async def collect():
+            return [chunk async for chunk in board.astream(after, clock=clock, sleep=sleep)]
+
+        async def collect_all():
+            return await asyncio.gather(collect(), collect(), collect())
+
+        with mock.patch("kitchen.board.aevents_after", counted):
+            streams = async_to_sync(collect_all)()
+        event = f"id: {after + 1}\ndata: {json.dumps({'type': 'dish_deleted', 'dish': dish_id})}\n\n"
+        for chunks in streams:
+            self.assertEqual(chunks[1], event)
+        # One catch-up read per stream, then one poll per second for all.
+        self.assertLessEqual(len(reads), 3 + board.STREAM_DURATION + 1)
+
+    def test_board_views(self):
+        self.client.force_login(self.cook)
+        self.dish.cooks.add(self.cook)
+        response = self.client.get(reverse("kitchen:board"))
+        self.assertContains(response, 'data-cook-id="%d"' % self.cook.id)
+        self.assertEqual(response.context["last_event_id"], board.latest())
+
+        response = self.client.get(reverse("kitchen:board-events"), {"after": 0})
+        self.assertEqual(response["Content-Type"], "text/event-stream")
+        self.assertTrue(response.streaming)
+        response.close()
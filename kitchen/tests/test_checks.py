@@ -0,0 +1,52 @@
+import tempfile
+from pathlib import Path
+
+from django.test import SimpleTestCase, override_settings
+
+from kitchen.checks import check_static_references
+
+
+class StaticReferencesCheckTest(SimpleTestCase):
+    def check_template(self, source):
+        with tempfile.TemporaryDirectory() as directory:
+            Path(directory, "page.html").write_text(source, encoding="utf-8")
+            with override_settings(TEMPLATES=[{
+                "BACKEND": "django.template.backends.django.DjangoTemplates",
+                "DIRS": [directory],
+            }]):
+                return [error.id for error in check_static_references(None)]
+
+    def test_project_templates_pass(self):
+        self.assertEqual(check_static_references(None), [])
+
+    def test_static_tag_to_shipped_file(self):
+        self.assertEqual(
+            self.check_template("<link href=\"{% static 'assets/css/material-kit.min.css' %}\">"),
+            [],
+        )
+
+    def test_raw_static_url(self):
+        self.assertEqual(
+            self.check_template('<img src="{{ ASSETS_ROOT }}/img/favicon.png">'),
+            ["kitchen.E001"],
+        )
+        self.assertEqual(
+            self.check_template('<script src="/static/assets/js/app.js"></script>'),
+            ["kitchen.E001"],
+        )
+
+    def test_missing_file(self):
+        self.assertEqual(
+            self.check_template("<link href=\"{% static 'assets/css/styles.css' %}\">"),
+            ["kitchen.E002"],
+        )
+
+    def test_broken_quoting_is_reported_missing(self):
+        source = "<link href=\"{% static 'assets/css/nucleo-svg.css\" rel=\"stylesheet' %}\">"
+        self.assertEqual(self.check_template(source), ["kitchen.E002"])
+
+    def test_pruned_file(self):
+        self.assertEqual(
+            self.check_template("<img src=\"{% static 'assets/img/bg3.jpg' %}\">"),
+            ["kitchen.E003"],
+        )
@@ -0,0 +1,85 @@
+from io import StringIO
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.cache.backends.db import DatabaseCache
+from django.core.cache.backends.locmem import LocMemCache
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+
+from kitchen import counters
+from kitchen.models import DishType, Dish
+
+
+class CountersTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.dish_type = DishType.objects.create(name="Soup")
+        Dish.objects.create(name="Borshch", price=10, dish_type=self.dish_type)
+        get_user_model().objects.create_user(username="cook", password="test123")
+
+    def test_cold_cache_counts_from_database(self):
+        self.assertEqual(
+            counters.get_counts(), {"cooks": 1, "dishes": 1, "dish_types": 1}
+        )
+
+    def test_warm_cache_runs_no_queries(self):
+        counters.get_counts()
+        with self.assertNumQueries(0):
+            counters.get_counts()
+
+    def test_signals_update_counts_on_commit(self):
+        counters.get_counts()
+        with self.captureOnCommitCallbacks(execute=True):
+            Dish.objects.create(name="Salad", price=5, dish_type=self.dish_type)
+            get_user_model().objects.create_user(
+                username="admin", password="test123", is_staff=True
+            )
+        with self.assertNumQueries(0):
+            self.assertEqual(counters.get_counts()["dishes"], 2)
+            self.assertEqual(counters.get_counts()["cooks"], 1)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.dish_type.delete()
+        self.assertEqual(
+            counters.get_counts(), {"cooks": 1, "dishes": 0, "dish_types": 0}
+        )
+
+    def test_non_atomic_cache_is_invalidated_instead_of_incremented(self):
+        counters.get_counts()
+        with mock.patch("kitchen.counters._incr_is_atomic", return_value=False):
+            with self.captureOnCommitCallbacks(execute=True):
+                Dish.objects.create(name="Salad", price=5, dish_type=self.dish_type)
+        self.assertIsNone(cache.get(counters._key("dishes")))
+        self.assertEqual(counters.get_counts()["dishes"], 2)
+
+    def test_only_overridden_incr_counts_as_atomic(self):
+        self.assertTrue(counters._incr_is_atomic(LocMemCache("test", {})))
+        self.assertFalse(counters._incr_is_atomic(DatabaseCache("kitchen_cache", {})))
+
+    def test_counted_values_expire(self):
+        with mock.patch.object(cache, "set_many") as set_many:
+            counters.get_counts()
+        self.assertEqual(set_many.call_args.kwargs["timeout"], counters.TIMEOUT)
+
+    def test_staff_change_invalidates_cook_count(self):
+        counters.get_counts()
+        cook = get_user_model().objects.get(username="cook")
+        cook.is_staff = True
+        with self.captureOnCommitCallbacks(execute=True):
+            cook.save()
+        self.assertEqual(counters.get_counts()["cooks"], 0)
+
+    def test_reconcile_command_fixes_drift(self):
+        cache.set(counters._key("dishes"), 42, timeout=None)
+        call_command("reconcile_counters", stdout=StringIO())
+        self.assertEqual(counters.get_counts()["dishes"], 1)
+
+    def test_index_view_uses_counters(self):
+        user = get_user_model().objects.get(username="cook")
+        self.client.force_login(user)
+        response = self.client.get(reverse("kitchen:index"))
+        self.assertEqual(response.context["num_dishes"], 1)
+        self.assertEqual(response.context["num_cooks"], 1)
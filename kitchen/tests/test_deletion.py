@@ -0,0 +1,71 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+
+from kitchen import board, counters
+from kitchen.deletion import delete_cook, delete_dish_type
+from kitchen.models import Dish, DishType
+from kitchen.search import search_dishes
+
+Assignment = Dish.cooks.through
+
+
+class DeletionTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.soup = DishType.objects.create(name="Soup")
+        self.salad = DishType.objects.create(name="Salad")
+        self.olga = get_user_model().objects.create_user(username="olga", password="test123")
+        self.ivan = get_user_model().objects.create_user(username="ivan", password="test123")
+        self.soups = Dish.objects.bulk_create(
+            Dish(name=f"Borshch {i}", price=10, dish_type=self.soup) for i in range(25)
+        )
+        self.olivier = Dish.objects.create(name="Olivier", price=8, dish_type=self.salad)
+        for dish in self.soups:
+            dish.cooks.add(self.olga, self.ivan)
+        self.olivier.cooks.add(self.olga)
+
+    def test_dish_type_deletes_its_dishes_and_assignments(self):
+        counters.get_counts()
+        after = board.latest()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertEqual(delete_dish_type(self.soup, chunk_size=10), 25)
+
+        self.assertQuerySetEqual(Dish.objects.all(), [self.olivier])
+        self.assertEqual(Assignment.objects.count(), 1)
+        self.assertEqual(counters.get_counts()["dishes"], 1)
+        self.assertEqual(counters.get_counts()["dish_types"], 1)
+        self.olga.refresh_from_db()
+        self.ivan.refresh_from_db()
+        self.assertEqual((self.olga.dish_count, self.ivan.dish_count), (1, 0))
+        self.assertIn(board.RELOAD, [event for _, event in board.events_after(after)])
+        self.assertFalse(search_dishes(Dish.objects.all(), "Borshch").exists())
+
+    def test_dish_type_queries_do_not_grow_with_dishes(self):
+        # Savepoint; per chunk of 10: ids, cooks, two DELETEs; the empty
+        # last chunk; the (now empty) cascade and the type; one recount.
+        with self.assertNumQueries(1 + 3 * 4 + 1 + 2 + 1 + 1):
+            delete_dish_type(self.soup, chunk_size=10)
+
+    def test_cook_deletes_only_their_assignments(self):
+        counters.get_counts()
+        after = board.latest()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertEqual(delete_cook(self.olga), 26)
+
+        self.assertEqual(Dish.objects.count(), 26)
+        self.assertEqual(Assignment.objects.count(), 25)
+        self.assertFalse(Assignment.objects.filter(cook_id=self.olga.pk).exists())
+        self.assertEqual(counters.get_counts()["cooks"], 1)
+        self.assertIn(board.RELOAD, [event for _, event in board.events_after(after)])
+
+    def test_delete_views_use_fast_path(self):
+        self.client.force_login(self.ivan)
+        response = self.client.post(reverse("kitchen:dish-type-delete", args=[self.soup.pk]))
+        self.assertRedirects(response, reverse("kitchen:dish-type-list"))
+        self.assertFalse(Dish.objects.filter(dish_type_id=self.soup.pk).exists())
+
+        response = self.client.post(reverse("kitchen:cook-delete", args=[self.olga.pk]))
+        self.assertRedirects(response, reverse("kitchen:cook-list"))
+        self.assertFalse(get_user_model().objects.filter(pk=self.olga.pk).exists())
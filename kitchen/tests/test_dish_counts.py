@@ -0,0 +1,86 @@
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+
+from kitchen import dish_counts
+from kitchen.assignments import assign_cooks, unassign_cooks
+from kitchen.models import Dish, DishType
+
+
+class DishCountsTest(TestCase):
+    def setUp(self):
+        self.soup = DishType.objects.create(name="Soup")
+        self.salad = DishType.objects.create(name="Salad")
+        self.cook = get_user_model().objects.create_user(username="olga", password="test123")
+        self.dish = Dish.objects.create(name="Borshch", price=10, dish_type=self.soup)
+
+    def assertCounts(self, soup, salad, cook):
+        self.soup.refresh_from_db()
+        self.salad.refresh_from_db()
+        self.cook.refresh_from_db()
+        self.assertEqual(
+            (self.soup.dish_count, self.salad.dish_count, self.cook.dish_count),
+            (soup, salad, cook),
+        )
+
+    def test_dish_type_counts_follow_dish_saves(self):
+        self.assertCounts(1, 0, 0)
+        self.dish.dish_type = self.salad
+        self.dish.save()
+        self.assertCounts(0, 1, 0)
+        self.dish.delete()
+        self.assertCounts(0, 0, 0)
+
+    def test_cook_counts_follow_assignments(self):
+        other = Dish.objects.create(name="Olivier", price=8, dish_type=self.salad)
+        self.dish.cooks.add(self.cook)
+        self.assertCounts(1, 1, 1)
+        assign_cooks([self.dish.id, other.id], [self.cook])
+        self.assertCounts(1, 1, 2)
+        self.cook.cooked_dishes.remove(other)
+        self.assertCounts(1, 1, 1)
+        unassign_cooks([other.id], [self.cook])
+        self.assertCounts(1, 1, 1)
+        self.dish.cooks.clear()
+        self.assertCounts(1, 1, 0)
+
+    def test_deleting_a_dish_type_recounts_its_cooks(self):
+        self.dish.cooks.add(self.cook)
+        self.soup.delete()
+        self.cook.refresh_from_db()
+        self.assertEqual(self.cook.dish_count, 0)
+
+    def test_recount_repairs_drift(self):
+        DishType.objects.update(dish_count=7)
+        dish_counts.recount_dish_types()
+        self.assertCounts(1, 0, 0)
+
+    def test_saving_a_stale_instance_keeps_the_count(self):
+        stale_cook = get_user_model().objects.get(pk=self.cook.pk)
+        stale_soup = DishType.objects.get(pk=self.soup.pk)
+        self.dish.cooks.add(self.cook)
+        Dish.objects.create(name="Solyanka", price=9, dish_type=self.soup)
+
+        stale_cook.set_password("new-password")
+        stale_cook.save()
+        stale_soup.name = "Soups"
+        stale_soup.save()
+        self.assertCounts(2, 0, 1)
+        self.assertEqual(self.soup.name, "Soups")
+        self.assertTrue(self.cook.check_password("new-password"))
+
+    def test_saving_a_concurrently_deleted_row_inserts_it_again(self):
+        stale_soup = DishType.objects.get(pk=self.soup.pk)
+        DishType.objects.filter(pk=self.soup.pk).delete()
+        stale_soup.save()
+        self.assertTrue(DishType.objects.filter(pk=self.soup.pk, name="Soup").exists())
+
+    def test_moving_a_dish_does_not_read_its_old_type(self):
+        dish = Dish.objects.get(pk=self.dish.pk)
+        dish.dish_type = self.salad
+        # The UPDATE and one recount of both types.
+        with self.assertNumQueries(2):
+            dish.save()
+        self.assertCounts(0, 1, 0)
+        dish.dish_type = self.soup
+        dish.save()
+        self.assertCounts(1, 0, 0)
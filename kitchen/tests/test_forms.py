@@ -85,6 +85,20 @@ class DishFormTest(TestCase):
         dish = form.save()
         self.assertEqual(dish.name, "Borshch")
 
+    def test_widget_renders_only_selected_cooks(self):
+        other = get_user_model().objects.create_user(username="other", password="12345")
+        form = DishForm(initial={"cooks": [self.cook]})
+        html = str(form["cooks"])
+        self.assertIn(f'value="{self.cook.id}" selected', html)
+        self.assertNotIn(f'value="{other.id}"', html)
+
+    def test_validation_queries_only_submitted_cooks(self):
+        form_data = {"name": "Borshch", "price": 12.50, "dish_type": self.dish_type.id, "cooks": [self.cook.id]}
+        form = DishForm(data=form_data)
+        # Dish type lookup, submitted cook ids, dish type FK check on the model.
+        with self.assertNumQueries(3):
+            self.assertTrue(form.is_valid())
+
     def test_missing_required_field_invalid(self):
         form_data = {"price": 10.0}
         form = DishForm(data=form_data)
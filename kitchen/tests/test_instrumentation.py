@@ -0,0 +1,85 @@
+import re
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from kitchen import instrumentation
+from kitchen.models import Dish, DishType
+
+SERVER_TIMING = re.compile(
+    r'db;dur=[\d.]+;desc="(\d+) queries", tpl;dur=([\d.]+), total;dur=[\d.]+'
+)
+
+
+class InstrumentationTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        instrumentation.stats.clear()
+        self.cook = get_user_model().objects.create_user(username="olga", password="test123")
+        self.client.force_login(self.cook)
+        soup = DishType.objects.create(name="Soup")
+        Dish.objects.create(name="Borshch", price=10, dish_type=soup)
+
+    def timing(self, response):
+        match = SERVER_TIMING.fullmatch(response["Server-Timing"])
+        self.assertIsNotNone(match, response["Server-Timing"])
+        return int(match[1]), float(match[2])
+
+    def test_server_timing_counts_every_query(self):
+        with CaptureQueriesContext(connection) as captured:
+            response = self.client.get(reverse("kitchen:dish-list"))
+        queries, template_ms = self.timing(response)
+        self.assertEqual(queries, len(captured))
+        self.assertGreater(template_ms, 0)
+
+    def test_json_views_have_no_template_time(self):
+        response = self.client.get(reverse("kitchen:api-dish-list"))
+        self.assertEqual(self.timing(response)[1], 0)
+
+    async def test_async_views_are_measured(self):
+        await self.async_client.aforce_login(self.cook)
+        response = await self.async_client.get(reverse("kitchen:display-dish-list"))
+        queries, template_ms = self.timing(response)
+        self.assertGreater(queries, 0)
+        self.assertGreater(template_ms, 0)
+
+    def test_log_line_and_percentiles(self):
+        url = reverse("kitchen:dish-list")
+        with self.assertLogs("kitchen.instrumentation", "INFO") as logs:
+            self.client.get(url)
+            self.client.get(url, {"name": "borsh"})
+        record = logs.records[0]
+        self.assertEqual((record.view, record.status), ("kitchen:dish-list", 200))
+        self.assertIn("queries=", record.getMessage())
+
+        percentiles = instrumentation.stats.percentiles()["kitchen:dish-list"]
+        self.assertEqual(percentiles["count"], 2)
+        self.assertLessEqual(percentiles["total_ms"]["p50"], percentiles["total_ms"]["p99"])
+
+    @override_settings(KITCHEN_SERVER_TIMING=False)
+    def test_header_can_be_disabled(self):
+        response = self.client.get(reverse("kitchen:dish-list"))
+        self.assertNotIn("Server-Timing", response)
+
+    @override_settings(KITCHEN_SERVER_TIMING="staff")
+    def test_header_for_staff_only(self):
+        url = reverse("kitchen:dish-list")
+        self.assertNotIn("Server-Timing", self.client.get(url))
+        self.client.logout()
+        self.assertNotIn("Server-Timing", self.client.get(reverse("login")))
+        self.cook.is_staff = True
+        self.cook.save()
+        self.client.force_login(self.cook)
+        self.timing(self.client.get(url))
+
+    def test_metrics_view_is_staff_only(self):
+        url = reverse("kitchen:request-metrics")
+        self.assertEqual(self.client.get(url).status_code, 403)
+        self.cook.is_staff = True
+        self.cook.save()
+        self.client.get(reverse("kitchen:dish-list"))
+        self.assertIn("kitchen:dish-list", self.client.get(url).json())
@@ -0,0 +1,183 @@
+import time
+from datetime import timedelta
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from kitchen import jobs
+from kitchen.models import Dish, DishType, Job
+
+
+class JobsTest(TestCase):
+    def setUp(self):
+        self.cook = get_user_model().objects.create_user(username="olga", password="test123")
+        self.calls = 0
+
+        def flaky():
+            self.calls += 1
+            raise RuntimeError("stove is cold")
+
+        jobs.TASKS["flaky"] = flaky
+        self.addCleanup(jobs.TASKS.pop, "flaky")
+
+    def test_enqueue_rejects_unknown_tasks(self):
+        with self.assertRaises(ValueError):
+            jobs.enqueue("boil_water")
+
+    def test_claimed_job_is_not_claimed_again(self):
+        job = jobs.enqueue("reconcile_counters", user=self.cook)
+        [claimed] = jobs.claim(5)
+        self.assertEqual(claimed.pk, job.pk)
+        self.assertEqual(claimed.attempts, 1)
+        self.assertEqual(jobs.claim(5), [])
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.RUNNING)
+
+    def test_successful_run_records_result(self):
+        DishType.objects.create(name="Soup")
+        jobs.enqueue("reconcile_counters")
+        [job] = jobs.claim(1)
+        jobs.run(job)
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.DONE)
+        self.assertEqual(job.result["dish_types"], 1)
+        self.assertIsNotNone(job.finished_at)
+
+    def test_failures_are_retried_with_backoff_then_fail(self):
+        job = jobs.enqueue("flaky", max_attempts=2)
+        jobs.run(jobs.claim(1)[0])
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.attempts), (Job.QUEUED, 1))
+        self.assertGreater(job.run_after, timezone.now())
+        self.assertIn("stove is cold", job.error)
+        self.assertEqual(jobs.claim(1), [])
+
+        Job.objects.filter(pk=job.pk).update(run_after=timezone.now())
+        jobs.run(jobs.claim(1)[0])
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.attempts, self.calls), (Job.FAILED, 2, 2))
+
+    def test_stale_running_jobs_are_requeued(self):
+        job = jobs.enqueue("reconcile_counters")
+        jobs.claim(1)
+        Job.objects.filter(pk=job.pk).update(started_at=timezone.now() - timedelta(hours=1))
+        self.assertEqual(jobs.requeue_stale(), 1)
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.QUEUED)
+
+    def test_outcome_of_a_requeued_attempt_is_dropped(self):
+        job = jobs.enqueue("reconcile_counters")
+        [claimed] = jobs.claim(1)
+        # The sweeper gave up on this attempt while it was still running.
+        Job.objects.filter(pk=job.pk).update(status=Job.QUEUED)
+        jobs.run(claimed)
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.finished_at), (Job.QUEUED, None))
+        self.assertEqual(claimed.status, Job.QUEUED)
+
+    def test_bulk_assignment_skips_dishes_deleted_since_queueing(self):
+        dish_type = DishType.objects.create(name="Soup")
+        kept = Dish.objects.create(name="Borshch", price=10, dish_type=dish_type)
+        gone = Dish.objects.create(name="Okroshka", price=8, dish_type=dish_type)
+        job = jobs.enqueue("bulk_assignment", {
+            "action": "assign", "dish_ids": [kept.pk, gone.pk], "cook_ids": [self.cook.pk],
+        })
+        gone.delete()
+        jobs.run(jobs.claim(1)[0])
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.result), (Job.DONE, {"assigned": 1}))
+        self.assertQuerySetEqual(self.cook.cooked_dishes.all(), [kept])
+
+
+class JobViewsTest(TestCase):
+    def setUp(self):
+        self.cook = get_user_model().objects.create_user(username="olga", password="test123")
+        self.client.force_login(self.cook)
+        dish_type = DishType.objects.create(name="Soup")
+        self.dish = Dish.objects.create(name="Borshch", price=10, dish_type=dish_type)
+
+    def test_background_bulk_assignment_is_queued(self):
+        response = self.client.post(reverse("kitchen:bulk-assignment"), {
+            "action": "assign", "dishes": [self.dish.pk], "background": "on",
+        })
+        self.assertEqual(response.status_code, 202)
+        self.assertFalse(self.dish.cooks.exists())
+
+        jobs.run(jobs.claim(1)[0])
+        self.assertQuerySetEqual(self.dish.cooks.all(), [self.cook])
+        status = self.client.get(response["Location"]).json()
+        self.assertEqual(status["status"], Job.DONE)
+        self.assertEqual(status["result"], {"assigned": 1})
+
+    def test_background_form_post_returns_to_the_list(self):
+        url = reverse("kitchen:dish-list")
+        response = self.client.post(reverse("kitchen:bulk-assignment"), {
+            "action": "assign", "dishes": [self.dish.pk], "background": "on", "next": url,
+        }, headers={"Accept": "text/html"})
+        self.assertRedirects(response, url, fetch_redirect_response=False)
+        job = Job.objects.get()
+        self.assertEqual(job.task, "bulk_assignment")
+        self.assertContains(self.client.get(url), f"Queued as job {job.pk}")
+
+    @override_settings(KITCHEN_BACKGROUND_DELETE_DISHES=0)
+    def test_large_dish_type_is_deleted_in_the_background(self):
+        dish_type = self.dish.dish_type
+        response = self.client.post(reverse("kitchen:dish-type-delete", args=[dish_type.pk]))
+        self.assertRedirects(response, reverse("kitchen:dish-type-list"),
+                             fetch_redirect_response=False)
+        self.assertTrue(DishType.objects.filter(pk=dish_type.pk).exists())
+        self.assertContains(self.client.get(reverse("kitchen:dish-type-list")), "are being deleted")
+
+        job = jobs.run(jobs.claim(1)[0])
+        self.assertEqual(job.result, {"dishes_deleted": 1})
+        self.assertFalse(DishType.objects.filter(pk=dish_type.pk).exists())
+
+    def test_small_dish_type_is_deleted_at_once(self):
+        dish_type = self.dish.dish_type
+        self.client.post(reverse("kitchen:dish-type-delete", args=[dish_type.pk]))
+        self.assertFalse(DishType.objects.filter(pk=dish_type.pk).exists())
+        self.assertFalse(Job.objects.exists())
+
+    def test_reconcile_counters_can_be_queued(self):
+        call_command("reconcile_counters", background=True, stdout=StringIO())
+        self.assertEqual(Job.objects.get().task, "reconcile_counters")
+
+    def test_status_is_private_to_the_creator_and_staff(self):
+        job = jobs.enqueue("reconcile_counters", user=self.cook)
+        url = reverse("kitchen:job-status", args=[job.pk])
+        self.assertEqual(self.client.get(url).status_code, 200)
+
+        other = get_user_model().objects.create_user(username="ivan", password="test123")
+        self.client.force_login(other)
+        self.assertEqual(self.client.get(url).status_code, 404)
+        other.is_staff = True
+        other.save()
+        self.assertEqual(self.client.get(url).status_code, 200)
+
+
+class HeartbeatTest(TransactionTestCase):
+    def test_running_job_is_not_stale(self):
+        jobs.enqueue("reconcile_counters")
+        [job] = jobs.claim(1)
+        Job.objects.filter(pk=job.pk).update(started_at=timezone.now() - timedelta(hours=1))
+        with jobs._heartbeat(job, interval=0.05):
+            time.sleep(0.5)
+        self.assertEqual(jobs.requeue_stale(), 0)
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.RUNNING)
+
+
+class RunKitchenWorkerTest(TransactionTestCase):
+    def test_once_runs_every_due_job(self):
+        for _ in range(3):
+            jobs.enqueue("reconcile_counters")
+        out = StringIO()
+        # One thread: the in-memory test database is shared-cache SQLite,
+        # where concurrent writers fail at once instead of waiting.
+        call_command("run_kitchen_worker", once=True, threads=1, stdout=out)
+        self.assertEqual(Job.objects.filter(status=Job.DONE).count(), 3)
+        self.assertEqual(out.getvalue().count(": done"), 3)
@@ -0,0 +1,47 @@
+import json
+from io import StringIO
+
+from django.core.management import CommandError, call_command
+from django.test import LiveServerTestCase
+
+from kitchen.management.commands.load_test import ROUTES
+from kitchen.models import Cook, Dish, DishType
+from kitchen.tests.test_query_counts import PAGES
+
+
+class LoadTestCommandTest(LiveServerTestCase):
+    def setUp(self):
+        dish_type = DishType.objects.create(name="Soup")
+        Dish.objects.create(name="Borshch", price=10, dish_type=dish_type)
+
+    def test_every_url_is_exercised(self):
+        self.assertEqual({name for name, *_ in PAGES} - {name.split()[0] for name in ROUTES}, set())
+
+    def test_reports_latency_per_route(self):
+        out = StringIO()
+        call_command("load_test", base_url=self.live_server_url, users=1,
+                     requests=300, stdout=out)
+        report = json.loads(out.getvalue())
+
+        self.assertEqual(report["requests"], 300)
+        self.assertEqual(report["errors"], 0)
+        self.assertEqual(sum(route["requests"] for route in report["routes"].values()), 300)
+        self.assertEqual(set(report["routes"]["dish-list"]["latency_ms"]),
+                         {"p50", "p95", "p99", "max"})
+        # The accounts of the run are gone, and nobody got staff rights.
+        self.assertFalse(Cook.objects.filter(username__startswith="loadtest-").exists())
+        self.assertFalse(Cook.objects.filter(is_staff=True).exists())
+
+    def test_accounts_are_removed_when_the_run_fails(self):
+        with self.assertRaises(CommandError):
+            call_command("load_test", base_url="http://127.0.0.1:9/", users=2,
+                         requests=1, timeout=1, stdout=StringIO())
+        self.assertFalse(Cook.objects.filter(username__startswith="loadtest-").exists())
+
+    def test_refuses_to_take_over_existing_accounts(self):
+        cook = Cook.objects.create_user(username="loadtest-1", password="test123")
+        with self.assertRaisesMessage(CommandError, "exist already"):
+            call_command("load_test", base_url=self.live_server_url, users=2,
+                         requests=1, stdout=StringIO())
+        cook.refresh_from_db()
+        self.assertTrue(cook.check_password("test123"))
@@ -0,0 +1,83 @@
+import json
+import os
+import tempfile
+from io import StringIO
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.management import CommandError, call_command
+from django.test import TestCase
+
+from kitchen.models import Dish, DishType
+
+
+class MenuImportExportTest(TestCase):
+    def setUp(self):
+        self.cook = get_user_model().objects.create_user(username="olga", password="test123")
+        self.soup = DishType.objects.create(name="Soup")
+        self.dish = Dish.objects.create(name="Borshch", price=10, dish_type=self.soup)
+        self.dish.cooks.add(self.cook)
+
+    def write_file(self, suffix, content):
+        fd, path = tempfile.mkstemp(suffix=suffix)
+        with os.fdopen(fd, "w", newline="") as stream:
+            stream.write(content)
+        self.addCleanup(os.remove, path)
+        return path
+
+    def test_export_jsonl(self):
+        out = StringIO()
+        call_command("export_menu", "--format", "jsonl", stdout=out)
+        rows = [json.loads(line) for line in out.getvalue().splitlines()]
+        self.assertEqual(rows, [{
+            "id": self.dish.id, "name": "Borshch", "description": "",
+            "price": "10.00", "dish_type": "Soup", "cooks": ["olga"],
+        }])
+
+    def test_import_csv_creates_and_updates(self):
+        path = self.write_file(".csv", (
+            "id,name,description,price,dish_type,cooks\n"
+            f"{self.dish.id},Red borshch,,11.50,Soup,\n"
+            ",Olivier,Potato salad,8,Salad,olga\n"
+        ))
+        out = StringIO()
+        call_command("import_menu", path, "--batch-size", "1", stdout=out)
+        self.assertIn("1 dishes created, 1 updated", out.getvalue())
+
+        self.dish.refresh_from_db()
+        self.assertEqual(self.dish.name, "Red borshch")
+        self.assertFalse(self.dish.cooks.exists())
+        olivier = Dish.objects.get(name="Olivier")
+        self.assertEqual(olivier.dish_type.name, "Salad")
+        self.assertEqual(list(olivier.cooks.all()), [self.cook])
+
+    def test_round_trip(self):
+        out = StringIO()
+        call_command("export_menu", "--format", "jsonl", stdout=out)
+        Dish.objects.all().delete()
+        path = self.write_file(".jsonl", out.getvalue())
+        call_command("import_menu", path, stdout=StringIO())
+        dish = Dish.objects.get()
+        self.assertEqual((dish.name, dish.dish_type), ("Borshch", self.soup))
+        self.assertEqual(list(dish.cooks.all()), [self.cook])
+
+    def test_unknown_cook_rolls_back_batch(self):
+        path = self.write_file(".jsonl", json.dumps({
+            "name": "Pelmeni", "price": "9", "dish_type": "Dumplings", "cooks": ["nobody"],
+        }) + "\n")
+        with self.assertRaisesMessage(CommandError, "Unknown cooks: nobody"):
+            call_command("import_menu", path, stdout=StringIO())
+        self.assertFalse(Dish.objects.filter(name="Pelmeni").exists())
+        self.assertFalse(DishType.objects.filter(name="Dumplings").exists())
+
+    def test_repeated_id_is_a_row_error(self):
+        row = {"id": self.dish.pk, "name": "Borshch", "price": "10",
+               "dish_type": "Soup", "cooks": ["olga"]}
+        path = self.write_file(".jsonl", (json.dumps(row) + "\n") * 2)
+        with mock.patch("kitchen.menu_io.MenuImporter._refresh") as refresh:
+            with self.assertRaisesMessage(
+                CommandError, f"Rows 1-2: Dish id {self.dish.pk} appears more than once."
+            ):
+                call_command("import_menu", path, stdout=StringIO())
+        # Nothing was committed, so nothing is recounted.
+        refresh.assert_not_called()
@@ -0,0 +1,85 @@
+from django.contrib.auth import get_user_model
+from django.core.paginator import InvalidPage
+from django.test import TestCase
+from django.urls import reverse
+
+from kitchen.models import DishType, Dish
+from kitchen.pagination import KeysetPaginator, encode_cursor
+
+
+class KeysetPaginatorTest(TestCase):
+    def setUp(self):
+        self.dish_type = DishType.objects.create(name="Soup")
+        # Duplicate names make sure ``id`` breaks ties.
+        for name in ["a", "b", "b", "b", "c", "d", "e"]:
+            Dish.objects.create(name=name, price=1, dish_type=self.dish_type)
+        self.ordered = list(Dish.objects.order_by("name", "id"))
+        self.paginator = KeysetPaginator(Dish.objects.all(), 3)
+
+    def test_walks_forward_through_all_rows(self):
+        seen = []
+        page = self.paginator.page()
+        self.assertFalse(page.has_previous())
+        while True:
+            seen.extend(page)
+            if not page.has_next():
+                break
+            page = self.paginator.page(page.next_cursor)
+        self.assertEqual(seen, self.ordered)
+
+    def test_previous_cursor_returns_previous_page(self):
+        first = self.paginator.page()
+        second = self.paginator.page(first.next_cursor)
+        self.assertEqual(list(second), self.ordered[3:6])
+        back = self.paginator.page(second.previous_cursor)
+        self.assertEqual(list(back), list(first))
+        self.assertFalse(back.has_previous())
+
+    def test_page_costs_one_query(self):
+        first = self.paginator.page()
+        with self.assertNumQueries(1):
+            self.paginator.page(first.next_cursor)
+
+    def test_invalid_cursor(self):
+        with self.assertRaises(InvalidPage):
+            self.paginator.page("not-a-cursor")
+
+    def test_tampered_cursor_values(self):
+        for values in [[{"a": 1}, 1], ["a", "x"], ["a", 2**70], [None, 1], ["a", True], 5]:
+            with self.subTest(values=values), self.assertRaises(InvalidPage):
+                self.paginator.page(encode_cursor(values, "n"))
+
+
+class KeysetListViewTest(TestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            username="cook", password="test123"
+        )
+        self.client.force_login(self.user)
+        dish_type = DishType.objects.create(name="Soup")
+        for i in range(12):
+            Dish.objects.create(name=f"Dish {i:02}", price=1, dish_type=dish_type)
+
+    def test_dish_list_follows_next_cursor(self):
+        response = self.client.get(reverse("kitchen:dish-list"))
+        page = response.context["page_obj"]
+        self.assertTrue(page.has_next())
+        response = self.client.get(
+            reverse("kitchen:dish-list"), {"cursor": page.next_cursor}
+        )
+        self.assertEqual(
+            [dish.name for dish in response.context["dish_list"]],
+            [f"Dish {i:02}" for i in range(5, 10)],
+        )
+
+    def test_invalid_cursor_returns_404(self):
+        response = self.client.get(reverse("kitchen:dish-list"), {"cursor": "x"})
+        self.assertEqual(response.status_code, 404)
+
+    def test_search_uses_elided_offset_pages(self):
+        response = self.client.get(
+            reverse("kitchen:dish-list"), {"name": "dish", "page": 2}
+        )
+        self.assertEqual(response.context["page_obj"].number, 2)
+        self.assertEqual(list(response.context["page_range"]), [1, 2, 3])
+        self.assertContains(response, "name=dish&amp;page=3")
@@ -0,0 +1,143 @@
+"""
+Query budgets for every URL in ``kitchen/urls.py``, measured against a
+kitchen large enough that any per-row query (N+1) would blow the budget.
+
+The budgets are exact: a new query on a page fails here and has to be
+justified by raising the number in ``PAGES``. Cached responses and
+fragments are disabled so the view's own queries are counted, and
+``on_commit`` callbacks are run inside the measured block.
+"""
+from decimal import Decimal
+
+from django.contrib.auth.hashers import make_password
+from django.core.cache import cache, caches
+from django.test import TestCase, override_settings
+from django.urls import get_resolver, reverse
+
+from kitchen.auth import CachedModelBackend
+from kitchen.dish_counts import recount_cooks, recount_dish_types
+from kitchen.models import Cook, Dish, DishType, Job
+
+DISH_TYPES = 40
+COOKS = 300
+DISHES = 3000
+COOKS_PER_DISH = 4
+
+# (url name, method, reverse args, data, query budget, expected status).
+# Reverse args and data may name attributes of the test case ("@attr").
+# Every budget includes the session (1 query); the user is served from the
+# "users" cache, as on every request after a cook's first.
+PAGES = [
+    ("index", "get", [], None, 4, 200),
+    ("dish-type-list", "get", [], None, 2, 200),
+    ("dish-type-create", "get", [], None, 1, 200),
+    ("dish-type-update", "get", ["@dish_type"], None, 2, 200),
+    ("dish-type-delete", "get", ["@dish_type"], None, 2, 200),
+    ("dish-list", "get", [], None, 2, 200),
+    ("dish-list", "get", [], {"name": "dish 12"}, 3, 200),
+    ("dish-detail", "get", ["@dish"], None, 4, 200),
+    ("dish-create", "get", [], None, 2, 200),
+    ("dish-create", "post", [], "@dish_form", 12, 302),
+    ("dish-update", "get", ["@dish"], None, 5, 200),
+    ("dish-update", "post", ["@dish"], "@dish_form", 10, 302),
+    ("dish-delete", "get", ["@dish"], None, 2, 200),
+    ("cook-list", "get", [], None, 2, 200),
+    ("cook-autocomplete", "get", [], {"q": "cook1"}, 2, 200),
+    ("cook-detail", "get", ["@busy_cook"], None, 3, 200),
+    ("cook-create", "get", [], None, 1, 200),
+    ("cook-experience-update", "get", ["@busy_cook"], None, 2, 200),
+    ("cook-delete", "get", ["@busy_cook"], None, 2, 200),
+    ("assign-me", "get", ["@dish"], None, 7, 302),
+    ("remove-me", "get", ["@dish"], None, 6, 302),
+    ("bulk-assignment", "post", [], "@bulk_form", 9, 302),
+    ("bulk-assignment", "post", [], "@background_bulk_form", 4, 202),
+    ("job-status", "get", ["@job"], None, 2, 200),
+    ("api-dish-list", "get", [], {"fields": "id,name,dish_type_name,cooks"}, 3, 200),
+    ("api-dish-detail", "get", ["@dish"], {"fields": "name,cooks"}, 3, 200),
+    ("api-cook-list", "get", [], None, 2, 200),
+    ("api-cook-detail", "get", ["@busy_cook"], None, 2, 200),
+    ("api-dish-type-list", "get", [], None, 2, 200),
+    ("api-dish-type-detail", "get", ["@dish_type"], None, 2, 200),
+    ("board", "get", [], None, 4, 200),
+    ("board-events", "get", [], None, 2, 200),
+    ("display-index", "get", [], None, 4, 200),
+    ("display-dish-list", "get", [], None, 2, 200),
+    ("display-dish-detail", "get", ["@dish"], None, 4, 200),
+    ("display-cook-list", "get", [], None, 2, 200),
+    ("display-cook-detail", "get", ["@busy_cook"], None, 3, 200),
+    ("request-metrics", "get", [], None, 1, 403),
+    # Last, as they delete rows other pages use.
+    ("dish-type-delete", "post", ["@dish_type"], None, 13, 302),
+    ("cook-delete", "post", ["@busy_cook"], None, 9, 302),
+]
+
+
+@override_settings(KITCHEN_RESPONSE_CACHE_TIMEOUT=0)
+class QueryCountTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        password = make_password("test123")
+        types = DishType.objects.bulk_create(
+            DishType(name=f"Type {i}") for i in range(DISH_TYPES)
+        )
+        cooks = Cook.objects.bulk_create(
+            Cook(username=f"cook{i}", password=password, last_name=f"Last {i}")
+            for i in range(COOKS)
+        )
+        dishes = Dish.objects.bulk_create(
+            Dish(name=f"Dish {i}", price=Decimal("9.50"), dish_type=types[i % DISH_TYPES])
+            for i in range(DISHES)
+        )
+        Dish.cooks.through.objects.bulk_create(
+            Dish.cooks.through(dish_id=dish.pk, cook_id=cooks[(i + j) % COOKS].pk)
+            for i, dish in enumerate(dishes)
+            for j in range(COOKS_PER_DISH)
+        )
+        recount_dish_types()
+        recount_cooks()
+
+        cls.cook = Cook.objects.create_user(username="olga", password="test123")
+        cls.dish_type = types[0]
+        cls.dish = dishes[0]
+        cls.busy_cook = cooks[0]
+        cls.dish_form = {
+            "name": "Solyanka",
+            "description": "Thick and sour.",
+            "price": "12.00",
+            "dish_type": types[1].pk,
+            "cooks": [cook.pk for cook in cooks[:COOKS_PER_DISH]],
+        }
+        cls.bulk_form = {
+            "action": "assign",
+            "dishes": [dish.pk for dish in dishes[:50]],
+            "cooks": [cook.pk for cook in cooks[:5]],
+        }
+        cls.background_bulk_form = {**cls.bulk_form, "background": "on"}
+        cls.job = Job.objects.create(task="reconcile_counters", created_by=cls.cook)
+
+    def setUp(self):
+        self.client.force_login(self.cook)
+
+    def resolve(self, value):
+        if isinstance(value, str) and value.startswith("@"):
+            value = getattr(self, value[1:])
+            return getattr(value, "pk", value)
+        return value
+
+    def test_every_url_has_a_budget(self):
+        kitchen = get_resolver().namespace_dict["kitchen"][1]
+        names = {pattern.name for pattern in kitchen.url_patterns if pattern.name}
+        self.assertEqual(names - {name for name, *_ in PAGES}, set())
+
+    def test_query_budgets(self):
+        for name, method, args, data, budget, status in PAGES:
+            url = reverse(f"kitchen:{name}", args=[self.resolve(arg) for arg in args])
+            data = self.resolve(data)
+            with self.subTest(method=method, url=url, data=data):
+                cache.clear()
+                caches["users"].clear()
+                CachedModelBackend().get_user(self.cook.pk)
+                with self.assertNumQueries(budget), self.captureOnCommitCallbacks(execute=True):
+                    response = getattr(self.client, method)(url, data)
+                self.assertEqual(response.status_code, status)
+                response.close()
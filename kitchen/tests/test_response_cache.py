@@ -0,0 +1,61 @@
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+
+from kitchen import response_cache
+from kitchen.models import Dish, DishType
+
+
+class ResponseCacheTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.cook = get_user_model().objects.create_user(username="olga", password="test123")
+        self.client.force_login(self.cook)
+        self.client.cookies[settings.CSRF_COOKIE_NAME] = "x" * 32
+        self.dish_type = DishType.objects.create(name="Soup")
+        self.dish = Dish.objects.create(name="Borshch", price=10, dish_type=self.dish_type)
+        self.url = reverse("kitchen:dish-list")
+
+    def test_hit_skips_view_queries(self):
+        self.client.get(self.url)
+        # Only the session is loaded on a hit; the user is cached too.
+        with self.assertNumQueries(1):
+            response = self.client.get(self.url)
+        self.assertContains(response, "Borshch")
+
+    def test_evicted_generation_does_not_bring_back_old_pages(self):
+        self.client.get(self.url)
+        cache.delete(response_cache.GENERATION_KEY)
+        Dish.objects.filter(pk=self.dish.pk).update(name="Solyanka")
+        self.assertContains(self.client.get(self.url), "Solyanka")
+
+    def test_query_string_and_user_are_part_of_the_key(self):
+        self.client.get(self.url)
+        with self.assertNumQueries(2):
+            self.client.get(self.url, {"name": "zzz"})
+        other = get_user_model().objects.create_user(username="ivan", password="test123")
+        self.client.force_login(other)
+        self.client.cookies[settings.CSRF_COOKIE_NAME] = "x" * 32
+        response = self.client.get(self.url)
+        self.assertContains(response, "ivan")
+
+    def test_menu_change_invalidates(self):
+        self.client.get(self.url)
+        with self.captureOnCommitCallbacks(execute=True):
+            Dish.objects.create(name="Solyanka", price=12, dish_type=self.dish_type)
+        self.assertContains(self.client.get(self.url), "Solyanka")
+
+    def test_assignment_invalidates_detail(self):
+        url = reverse("kitchen:dish-detail", args=[self.dish.id])
+        self.assertFalse(self.client.get(url).context["is_assigned"])
+        with self.captureOnCommitCallbacks(execute=True):
+            self.dish.cooks.add(self.cook)
+        self.assertTrue(self.client.get(url).context["is_assigned"])
+
+    def test_without_csrf_cookie_is_not_cached(self):
+        del self.client.cookies[settings.CSRF_COOKIE_NAME]
+        self.client.get(self.url)
+        with self.assertNumQueries(2):
+            self.client.get(self.url)
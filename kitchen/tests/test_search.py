@@ -0,0 +1,62 @@
+from django.db import connection
+from django.test import SimpleTestCase, TestCase
+
+from kitchen.models import DishType, Dish
+from kitchen.indexes import TrigramIndex
+from kitchen.search import search_dishes
+
+
+class SearchDishesTest(TestCase):
+    def setUp(self):
+        self.dish_type = DishType.objects.create(name="Soup")
+        self.borshch = Dish.objects.create(
+            name="Borshch", price=10, dish_type=self.dish_type,
+            description="Beetroot soup",
+        )
+        self.solyanka = Dish.objects.create(
+            name="Solyanka", price=12, dish_type=self.dish_type,
+            description="Served like borshch",
+        )
+        self.salad = Dish.objects.create(
+            name="Salad", price=8, dish_type=self.dish_type,
+        )
+
+    def test_empty_query_returns_queryset(self):
+        self.assertEqual(search_dishes(Dish.objects.all(), " ").count(), 3)
+
+    def test_substring_match_is_case_insensitive(self):
+        result = search_dishes(Dish.objects.all(), "ORSH")
+        self.assertEqual(list(result), [self.borshch, self.solyanka])
+
+    def test_name_match_ranked_above_description_match(self):
+        result = list(search_dishes(Dish.objects.all(), "borshch"))
+        self.assertEqual(result, [self.borshch, self.solyanka])
+
+    def test_short_query_falls_back_to_icontains(self):
+        result = search_dishes(Dish.objects.all(), "sa")
+        self.assertEqual(list(result), [self.salad])
+
+    def test_index_follows_updates_and_deletes(self):
+        self.salad.name = "Caesar"
+        self.salad.save()
+        self.borshch.delete()
+        self.assertEqual(
+            list(search_dishes(Dish.objects.all(), "caesar")), [self.salad]
+        )
+        self.assertEqual(
+            list(search_dishes(Dish.objects.all(), "beetroot")), []
+        )
+
+
+class TrigramIndexTest(SimpleTestCase):
+    def test_skipped_outside_postgresql(self):
+        index = TrigramIndex("name", name="kitchen_dish_name_trgm")
+        editor = connection.schema_editor(collect_sql=True)
+        self.assertEqual(str(index.create_sql(Dish, editor)), "")
+        self.assertEqual(str(index.remove_sql(Dish, editor)), "")
+
+    def test_deconstruct(self):
+        index = TrigramIndex("description", name="kitchen_dish_description_trgm")
+        path, args, kwargs = index.deconstruct()
+        self.assertEqual(path, "kitchen.indexes.TrigramIndex")
+        self.assertEqual(TrigramIndex(*args, **kwargs), index)
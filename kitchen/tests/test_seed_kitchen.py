@@ -0,0 +1,81 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db.models import Count
+from django.test import TestCase
+
+from kitchen import counters
+from kitchen.models import Cook, Dish, DishType
+from kitchen.search import search_dishes
+
+
+def seed(**options):
+    options = {"dish_types": 3, "dishes": 50, "cooks": 5, "cooks_per_dish": 1.5,
+               "batch_size": 20, **options}
+    call_command("seed_kitchen", stdout=StringIO(), **options)
+
+
+class SeedKitchenTest(TestCase):
+    def test_creates_the_requested_rows(self):
+        seed()
+
+        self.assertEqual(DishType.objects.count(), 3)
+        self.assertEqual(Cook.objects.count(), 5)
+        self.assertEqual(Dish.objects.count(), 50)
+        links = Dish.cooks.through.objects.count()
+        self.assertTrue(50 <= links <= 100)
+        self.assertEqual(counters.get_counts(), {"cooks": 5, "dishes": 50, "dish_types": 3})
+
+    def test_cooks_share_one_working_password(self):
+        seed(password="kitchen123")
+
+        cooks = list(Cook.objects.all())
+        self.assertEqual(len({cook.password for cook in cooks}), 1)
+        self.assertTrue(cooks[0].check_password("kitchen123"))
+
+    def test_default_password_is_random_and_printed(self):
+        out = StringIO()
+        call_command("seed_kitchen", dishes=0, cooks=1, cooks_per_dish=1, stdout=out)
+
+        password = out.getvalue().rsplit(": ", 1)[1].strip()
+        self.assertNotEqual(password, "")
+        self.assertTrue(Cook.objects.get().check_password(password))
+
+    def test_same_seed_gives_same_data(self):
+        seed(seed=7)
+        seed(seed=7, prefix="again")
+
+        first, second = (
+            list(Dish.objects.filter(dish_type__name__startswith=f"{prefix} ")
+                 .order_by("id").values_list("name", "description", "price"))
+            for prefix in ("seed", "again")
+        )
+        self.assertEqual(first, second)
+
+    def test_dish_counts_match_rows(self):
+        seed()
+
+        for dish_type in DishType.objects.annotate(n=Count("dishes")):
+            self.assertEqual(dish_type.dish_count, dish_type.n)
+        for cook in Cook.objects.annotate(n=Count("cooked_dishes")):
+            self.assertEqual(cook.dish_count, cook.n)
+
+    def test_generated_dishes_are_searchable(self):
+        seed()
+
+        dish = Dish.objects.first()
+        self.assertIn(dish, search_dishes(Dish.objects.all(), dish.name))
+
+    def test_new_dishes_get_the_next_keys(self):
+        seed()
+        dish_type = DishType.objects.first()
+        dish = Dish.objects.create(name="Borshch", price=10, dish_type=dish_type)
+
+        self.assertEqual(dish.pk, Dish.objects.exclude(pk=dish.pk).order_by("-pk")[0].pk + 1)
+
+    def test_refuses_an_existing_prefix(self):
+        seed()
+
+        with self.assertRaisesMessage(CommandError, "pass another --prefix"):
+            seed()
@@ -0,0 +1,48 @@
+import tempfile
+from pathlib import Path
+
+from asgiref.sync import async_to_sync
+from django.test import SimpleTestCase, override_settings
+
+from restaurant_manager.static_files import StaticFilesApplication
+
+
+class StaticFilesApplicationTest(SimpleTestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        Path(directory.name, "kitchen.css").write_text("body {}", encoding="utf-8")
+        self.passed = []
+
+        async def django_app(scope, receive, send):
+            self.passed.append(scope["path"])
+
+        with override_settings(STATIC_ROOT=directory.name, STATIC_URL="/static/"):
+            self.application = StaticFilesApplication(django_app)
+
+    def request(self, path, method="GET"):
+        messages = []
+
+        async def send(message):
+            messages.append(message)
+
+        scope = {"type": "http", "method": method, "path": path, "headers": []}
+        async_to_sync(self.application)(scope, None, send)
+        return messages
+
+    def test_serves_static_files_without_django(self):
+        start, *body = self.request("/static/kitchen.css")
+        self.assertEqual(start["status"], 200)
+        self.assertIn((b"content-type", b'text/css; charset="utf-8"'), start["headers"])
+        self.assertEqual(b"".join(message["body"] for message in body), b"body {}")
+        self.assertEqual(self.passed, [])
+
+    def test_head_has_no_body(self):
+        start, *body = self.request("/static/kitchen.css", method="HEAD")
+        self.assertEqual(start["status"], 200)
+        self.assertEqual(b"".join(message["body"] for message in body), b"")
+
+    def test_other_paths_reach_django(self):
+        self.assertEqual(self.request("/static/missing.css"), [])
+        self.assertEqual(self.request("/display/"), [])
+        self.assertEqual(self.passed, ["/static/missing.css", "/display/"])
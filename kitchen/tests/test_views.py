@@ -1,4 +1,6 @@
-from django.test import TestCase
+from django.core.cache import caches
+from django.core.cache.utils import make_template_fragment_key
+from django.test import TestCase, override_settings
 from django.urls import reverse
 from django.contrib.auth import get_user_model
 
@@ -131,3 +133,80 @@ class KitchenViewTests(TestCase):
         response = self.client.get(url)
         self.assertEqual(response.status_code, 302)
         self.assertNotIn(self.user, self.dish.cooks.all())
+
+    def test_dish_list_search(self):
+        Dish.objects.create(name="Salad", price=8, dish_type=self.dish_type)
+        response = self.client.get(reverse("kitchen:dish-list"), {"name": "borsh"})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(list(response.context["dish_list"]), [self.dish])
+
+    def test_dish_detail_is_assigned(self):
+        url = reverse("kitchen:dish-detail", args=[self.dish.id])
+        self.assertFalse(self.client.get(url).context["is_assigned"])
+        self.dish.cooks.add(self.user)
+        response = self.client.get(url)
+        self.assertTrue(response.context["is_assigned"])
+        self.assertContains(response, reverse("kitchen:remove-me", args=[self.dish.id]))
+
+    def test_dish_detail_pages_cooks(self):
+        cooks = [
+            get_user_model().objects.create(username=f"cook{i:02}")
+            for i in range(30)
+        ]
+        self.dish.cooks.add(*cooks)
+        url = reverse("kitchen:dish-detail", args=[self.dish.id])
+        page = self.client.get(url).context["cooks_page"]
+        self.assertEqual(len(page), 25)
+        self.assertTrue(page.has_next())
+        response = self.client.get(url, {"cooks_cursor": page.next_cursor})
+        self.assertEqual(len(response.context["cooks_page"]), 5)
+
+    def test_cook_autocomplete_view(self):
+        get_user_model().objects.create(username="olga", last_name="Ivanova")
+        get_user_model().objects.create(username="ivan", last_name="Petrov")
+        response = self.client.get(reverse("kitchen:cook-autocomplete"), {"q": "iv"})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            [cook["text"] for cook in response.json()["results"]],
+            ["ivan ( Petrov)", "olga ( Ivanova)"],
+        )
+        self.assertIsNone(response.json()["next"])
+
+    def test_pages_use_shared_stylesheet(self):
+        for url in [
+            reverse("kitchen:dish-list"),
+            reverse("kitchen:dish-detail", args=[self.dish.id]),
+            reverse("kitchen:dish-create"),
+            reverse("kitchen:dish-type-delete", args=[self.dish_type.id]),
+        ]:
+            response = self.client.get(url)
+            self.assertContains(response, "assets/css/kitchen.css")
+            self.assertNotContains(response, "<style")
+
+
+@override_settings(CACHES={
+    "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+    "templates": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "fragments",
+    },
+    "users": {"BACKEND": "django.core.cache.backends.dummy.DummyCache"},
+})
+class FragmentCacheTests(TestCase):
+    def setUp(self):
+        caches["templates"].clear()
+
+    def test_chrome_is_cached_but_user_part_is_not(self):
+        olga = get_user_model().objects.create_user(username="olga", password="test123")
+        ivan = get_user_model().objects.create_user(username="ivan", password="test123")
+        self.client.force_login(olga)
+        self.assertContains(self.client.get(reverse("kitchen:dish-list")), "olga")
+        for name, vary_on in [("navigation", [True]), ("footer", []), ("scripts", [])]:
+            key = make_template_fragment_key(name, vary_on)
+            self.assertIsNotNone(caches["templates"].get(key), name)
+
+        self.client.force_login(ivan)
+        response = self.client.get(reverse("kitchen:dish-list"))
+        self.assertContains(response, "ivan")
+        self.assertNotContains(response, "olga")
+        self.assertContains(response, "csrfmiddlewaretoken")
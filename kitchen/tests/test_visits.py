@@ -0,0 +1,51 @@
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+
+class VisitCounterTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = get_user_model().objects.create_user(
+            username="cook", password="test123"
+        )
+        self.client.force_login(self.user)
+
+    def visit(self):
+        return self.client.get(reverse("kitchen:index"))
+
+    def assert_counts_visits(self):
+        self.assertEqual(self.visit().context["num_visits"], 0)
+        self.assertEqual(self.visit().context["num_visits"], 1)
+        response = self.visit()
+        self.assertEqual(response.context["num_visits"], 2)
+        return response
+
+    def test_signed_cookie_backend_does_not_modify_session(self):
+        response = self.assert_counts_visits()
+        self.assertFalse(response.wsgi_request.session.modified)
+        self.assertIn("num_visits", response.cookies)
+
+    def test_tampered_cookie_resets_count(self):
+        self.client.cookies["num_visits"] = "100"
+        self.assertEqual(self.visit().context["num_visits"], 0)
+
+    @override_settings(VISIT_COUNTER_BACKEND="kitchen.visits.CacheVisitCounter")
+    def test_cache_backend(self):
+        response = self.assert_counts_visits()
+        self.assertFalse(response.wsgi_request.session.modified)
+
+    @override_settings(VISIT_COUNTER_BACKEND="kitchen.visits.CacheVisitCounter")
+    def test_cache_backend_survives_eviction(self):
+        self.visit()
+        with mock.patch.object(cache, "incr", side_effect=ValueError):
+            self.assertEqual(self.visit().context["num_visits"], 1)
+        self.assertEqual(self.visit().context["num_visits"], 2)
+
+    @override_settings(VISIT_COUNTER_BACKEND="kitchen.visits.SessionVisitCounter")
+    def test_session_backend(self):
+        response = self.assert_counts_visits()
+        self.assertTrue(response.wsgi_request.session.modified)
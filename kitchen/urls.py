@@ -1,11 +1,13 @@
 from django.urls import path
 
+from kitchen import api, async_views
 from kitchen.views import (
     index,
     DishTypeListView, DishTypeCreateView, DishTypeUpdateView, DishTypeDeleteView,
     DishListView, DishDetailView, DishCreateView, DishUpdateView, DishDeleteView,
     CookListView, CookDetailView, CookCreateView, CookExperienceUpdateView, CookDeleteView, assign_me_view,
-    remove_me_view,
+    remove_me_view, cook_autocomplete_view, bulk_assignment_view, KitchenBoardView,
+    request_metrics_view, job_status_view,
 )
 
 urlpatterns = [
@@ -20,6 +22,7 @@ urlpatterns = [
     path("dishes/<int:pk>/update/", DishUpdateView.as_view(), name="dish-update"),
     path("dishes/<int:pk>/delete/", DishDeleteView.as_view(), name="dish-delete"),
     path("cooks/", CookListView.as_view(), name="cook-list"),
+    path("cooks/autocomplete/", cook_autocomplete_view, name="cook-autocomplete"),
 
     path("cooks/<int:pk>/", CookDetailView.as_view(), name="cook-detail"),
     path("cooks/create/", CookCreateView.as_view(), name="cook-create"),
@@ -27,6 +30,30 @@ urlpatterns = [
     path("cooks/<int:pk>/delete/", CookDeleteView.as_view(), name="cook-delete"),
     path("dishes/<int:pk>/assign/", assign_me_view, name="assign-me"),
     path("dishes/<int:pk>/remove/", remove_me_view, name="remove-me"),
+    path("dishes/assignments/", bulk_assignment_view, name="bulk-assignment"),
+    path("jobs/<int:pk>/", job_status_view, name="job-status"),
+
+    path("api/v1/dishes/", api.list_view, {"resource_name": "dishes"}, name="api-dish-list"),
+    path("api/v1/dishes/<int:pk>/", api.detail_view, {"resource_name": "dishes"},
+         name="api-dish-detail"),
+    path("api/v1/cooks/", api.list_view, {"resource_name": "cooks"}, name="api-cook-list"),
+    path("api/v1/cooks/<int:pk>/", api.detail_view, {"resource_name": "cooks"},
+         name="api-cook-detail"),
+    path("api/v1/dish-types/", api.list_view, {"resource_name": "dish-types"},
+         name="api-dish-type-list"),
+    path("api/v1/dish-types/<int:pk>/", api.detail_view, {"resource_name": "dish-types"},
+         name="api-dish-type-detail"),
+
+    path("board/", KitchenBoardView.as_view(), name="board"),
+    path("board/events/", async_views.board_events, name="board-events"),
+
+    path("display/", async_views.index, name="display-index"),
+    path("display/dishes/", async_views.dish_list, name="display-dish-list"),
+    path("display/dishes/<int:pk>/", async_views.dish_detail, name="display-dish-detail"),
+    path("display/cooks/", async_views.cook_list, name="display-cook-list"),
+    path("display/cooks/<int:pk>/", async_views.cook_detail, name="display-cook-detail"),
+
+    path("metrics/", request_metrics_view, name="request-metrics"),
 
 ]
 
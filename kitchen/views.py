@@ -1,32 +1,52 @@
-from django.contrib.auth import get_user_model
+from django.conf import settings
+from django.contrib import messages
 from django.contrib.auth.decorators import login_required
 from django.contrib.auth.mixins import LoginRequiredMixin
+from django.core.exceptions import PermissionDenied
+from django.core.paginator import InvalidPage
+from django.db.models import Prefetch, Q
+from django.http import Http404, HttpResponseRedirect, JsonResponse
 from django.shortcuts import render, redirect, get_object_or_404
-from django.urls import reverse_lazy
+from django.urls import reverse, reverse_lazy
+from django.utils.http import url_has_allowed_host_and_scheme
 from django.views import generic
+from django.views.decorators.http import require_POST
 
-from .forms import CookCreationForm, CookExperienceUpdateForm, DishForm, DishSearchForm
-from .models import Dish, DishType, Cook
+from . import board, counters, instrumentation, jobs
+from .assignments import assign_cooks, unassign_cooks
+from .deletion import delete_cook, delete_dish_type
+from .forms import (
+    BulkAssignmentForm, CookCreationForm, CookExperienceUpdateForm, DishForm, DishSearchForm,
+)
+from .models import Dish, DishType, Cook, Job
+from .pagination import KeysetPaginator, PaginationModeMixin
+from .response_cache import CachedResponseMixin
+from .search import search_dishes
+from .visits import get_visit_counter
 
 
 @login_required
 def index(request):
-    num_cooks = get_user_model().objects.filter(is_staff=False).count()
-    num_dishes = Dish.objects.count()
-    num_dish_types = DishType.objects.count()
-    num_visits = request.session.get('num_visits', 0)
-    request.session['num_visits'] = num_visits + 1
+    counts = counters.get_counts()
+    num_cooks = counts["cooks"]
+    num_dishes = counts["dishes"]
+    num_dish_types = counts["dish_types"]
+    visit_counter = get_visit_counter()
+    num_visits = visit_counter.get(request)
     context = {"num_cooks": num_cooks, "num_dishes": num_dishes,
                "num_dish_types": num_dish_types,
                "num_visits": num_visits}
-    return render(request, "kitchen/index.html", context=context)
+    response = render(request, "kitchen/index.html", context=context)
+    visit_counter.record(request, response, num_visits)
+    return response
 
 
-class DishTypeListView(LoginRequiredMixin, generic.ListView):
+class DishTypeListView(LoginRequiredMixin, CachedResponseMixin, PaginationModeMixin, generic.ListView):
     model = DishType
     template_name = "kitchen/dish_type_list.html"
     context_object_name = "dish_type_list"
     paginate_by = 5
+    pagination_mode = "keyset"
 
 
 class DishTypeCreateView(LoginRequiredMixin, generic.CreateView):
@@ -48,15 +68,28 @@ class DishTypeDeleteView(LoginRequiredMixin, generic.DeleteView):
     template_name = "kitchen/dish_type_confirm_delete.html"
     success_url = reverse_lazy("kitchen:dish-type-list")
 
+    def form_valid(self, form):
+        dish_type = self.object
+        if dish_type.dish_count > settings.KITCHEN_BACKGROUND_DELETE_DISHES:
+            job = jobs.enqueue("delete_dish_type", {"dish_type_id": dish_type.pk},
+                               user=self.request.user)
+            messages.info(self.request, f"{dish_type} and its {dish_type.dish_count} dishes "
+                                        f"are being deleted (job {job.pk}).")
+        else:
+            delete_dish_type(dish_type)
+        return HttpResponseRedirect(self.get_success_url())
 
-class CookDetailView(LoginRequiredMixin, generic.DetailView):
+
+class CookDetailView(LoginRequiredMixin, CachedResponseMixin, generic.DetailView):
     model = Cook
     queryset = Cook.objects.prefetch_related("cooked_dishes")
 
 
-class CookListView(LoginRequiredMixin, generic.ListView):
+class CookListView(LoginRequiredMixin, CachedResponseMixin, PaginationModeMixin, generic.ListView):
     model = Cook
     paginate_by = 5
+    pagination_mode = "keyset"
+    keyset_ordering = ("username", "id")
 
 
 class CookCreateView(LoginRequiredMixin, generic.CreateView):
@@ -77,11 +110,22 @@ class CookDeleteView(LoginRequiredMixin, generic.DeleteView):
     template_name = "kitchen/cook_confirm_delete.html"
     success_url = reverse_lazy("kitchen:cook-list")
 
+    def form_valid(self, form):
+        delete_cook(self.object)
+        return HttpResponseRedirect(self.get_success_url())
+
 
-class DishListView(LoginRequiredMixin, generic.ListView):
+class DishListView(LoginRequiredMixin, CachedResponseMixin, PaginationModeMixin, generic.ListView):
     model = Dish
 
     paginate_by = 5
+    pagination_mode = "keyset"
+
+    def get_pagination_mode(self):
+        # Search results are ordered by rank, which is not a seekable key.
+        if self.request.GET.get("name"):
+            return "offset"
+        return super().get_pagination_mode()
 
     def get_context_data(self, *, object_list=None, **kwargs):
         context =super().get_context_data(**kwargs)
@@ -93,13 +137,50 @@ class DishListView(LoginRequiredMixin, generic.ListView):
         queryset = Dish.objects.select_related("dish_type")
         name = self.request.GET.get("name")
         if name:
-            return queryset.filter(name__icontains=name)
+            return search_dishes(queryset, name)
         return queryset
 
 
-class DishDetailView(LoginRequiredMixin, generic.DetailView):
+class DishDetailView(LoginRequiredMixin, CachedResponseMixin, generic.DetailView):
     model = Dish
-    queryset = Dish.objects.select_related("dish_type").prefetch_related("cooks")
+    queryset = Dish.objects.select_related("dish_type")
+    cooks_per_page = 25
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        dish = self.object
+        cooks = dish.cooks.only("id", "username", "first_name", "last_name")
+        paginator = KeysetPaginator(cooks, self.cooks_per_page, ("username", "id"))
+        try:
+            context["cooks_page"] = paginator.page(self.request.GET.get("cooks_cursor"))
+        except InvalidPage as e:
+            raise Http404(str(e))
+        context["is_assigned"] = Dish.cooks.through.objects.filter(
+            dish_id=dish.id, cook_id=self.request.user.id
+        ).exists()
+        return context
+
+
+class KitchenBoardView(LoginRequiredMixin, PaginationModeMixin, generic.ListView):
+    """
+    Dishes with their cooks, kept current in the browser by the
+    ``board-events`` stream.
+    """
+
+    queryset = Dish.objects.select_related("dish_type").prefetch_related(
+        Prefetch("cooks", queryset=Cook.objects.only("id", "username"))
+    )
+    template_name = "kitchen/board.html"
+    context_object_name = "dish_list"
+    paginate_by = 50
+    pagination_mode = "keyset"
+
+    def get_context_data(self, **kwargs):
+        # Read before the page is fetched, so no change can fall in between.
+        last_event_id = board.latest()
+        context = super().get_context_data(**kwargs)
+        context["last_event_id"] = last_event_id
+        return context
 
 
 class DishCreateView(LoginRequiredMixin, generic.CreateView):
@@ -134,3 +215,106 @@ def remove_me_view(request, pk):
     dish = get_object_or_404(Dish, pk=pk)
     dish.cooks.remove(request.user)
     return redirect("kitchen:dish-detail", pk=pk)
+
+
+def _wants_html(request):
+    # Browsers submitting a form ask for HTML; API clients and fetch() do not.
+    return "text/html" in request.headers.get("Accept", "")
+
+
+def _redirect_back(request):
+    next_url = request.POST.get("next")
+    if next_url and url_has_allowed_host_and_scheme(
+        next_url, allowed_hosts={request.get_host()}, require_https=request.is_secure()
+    ):
+        return redirect(next_url)
+    return redirect("kitchen:dish-list")
+
+
+@login_required
+@require_POST
+def bulk_assignment_view(request):
+    form = BulkAssignmentForm(request.POST)
+    if not form.is_valid():
+        if not _wants_html(request):
+            return JsonResponse({"errors": form.errors}, status=400)
+        for errors in form.errors.values():
+            for error in errors:
+                messages.error(request, error)
+        return _redirect_back(request)
+    dish_ids = [dish.pk for dish in form.cleaned_data["dishes"]]
+    cooks = form.cleaned_data["cooks"] or [request.user]
+    if form.cleaned_data["background"]:
+        job = jobs.enqueue("bulk_assignment", {
+            "action": form.cleaned_data["action"],
+            "dish_ids": dish_ids,
+            "cook_ids": [cook.pk for cook in cooks],
+        }, user=request.user)
+        return _job_accepted(request, job)
+    if form.cleaned_data["action"] == BulkAssignmentForm.ASSIGN:
+        assign_cooks(dish_ids, cooks)
+    else:
+        unassign_cooks(dish_ids, cooks)
+    return _redirect_back(request)
+
+
+def _job_accepted(request, job):
+    """
+    Answer a request whose work was queued as ``job``: form posts go back
+    with a message, other callers get 202 with the job's status URL.
+    """
+    if _wants_html(request):
+        messages.info(request, f"Queued as job {job.pk}; the change appears once it has run.")
+        return _redirect_back(request)
+    url = reverse("kitchen:job-status", args=[job.pk])
+    response = JsonResponse({"job": job.pk, "status": job.status, "url": url}, status=202)
+    response["Location"] = url
+    return response
+
+
+@login_required
+def job_status_view(request, pk):
+    """Status of a background job, for the cook who queued it (or staff)."""
+    jobs_visible = Job.objects.all()
+    if not request.user.is_staff:
+        jobs_visible = jobs_visible.filter(created_by=request.user)
+    job = get_object_or_404(jobs_visible, pk=pk)
+    return JsonResponse({
+        "job": job.pk,
+        "task": job.task,
+        "status": job.status,
+        "attempts": job.attempts,
+        "max_attempts": job.max_attempts,
+        "result": job.result,
+        "error": job.error.strip().splitlines()[-1] if job.error else "",
+        "created_at": job.created_at,
+        "started_at": job.started_at,
+        "finished_at": job.finished_at,
+    })
+
+
+@login_required
+def cook_autocomplete_view(request):
+    query = request.GET.get("q", "").strip()
+    cooks = Cook.objects.only("id", "username", "first_name", "last_name")
+    if query:
+        cooks = cooks.filter(
+            Q(username__istartswith=query) | Q(last_name__istartswith=query)
+        )
+    paginator = KeysetPaginator(cooks, 20, ("username", "id"))
+    try:
+        page = paginator.page(request.GET.get("cursor"))
+    except InvalidPage as e:
+        raise Http404(str(e))
+    return JsonResponse({
+        "results": [{"id": cook.id, "text": str(cook)} for cook in page],
+        "next": page.next_cursor,
+    })
+
+
+@login_required
+def request_metrics_view(request):
+    """Latency, DB and template time percentiles per view, for this worker."""
+    if not request.user.is_staff:
+        raise PermissionDenied
+    return JsonResponse(instrumentation.stats.percentiles())
@@ -0,0 +1,44 @@
+from django.contrib.staticfiles.apps import StaticFilesConfig
+
+
+class PrunedStaticFilesConfig(StaticFilesConfig):
+    """
+    Keep the Material Kit sources and demo assets no page references out of
+    ``collectstatic``. Directory patterns match the directory name, file
+    patterns the path below ``static/``; ``kitchen.checks`` fails if a
+    template points at a pruned file.
+    """
+
+    ignore_patterns = [
+        *StaticFilesConfig.ignore_patterns,
+        # Build sources.
+        "scss",
+        "gulpfile.js",
+        "package.json",
+        # Demo content of the theme.
+        "examples",
+        "illustrations",
+        "logos",
+        "shapes",
+        "assets/img/bg.jpg",
+        "assets/img/bg[0-9].jpg",
+        "assets/img/bg10.jpg",
+        "assets/img/bruce-mars.jpg",
+        "assets/img/city-profile.jpg",
+        "assets/img/ivana-square*.jpg",
+        "assets/img/macbook.png",
+        "assets/img/team-*.jpg",
+        "assets/img/logo-ct-dark.png",
+        "assets/img/down-arrow-white.svg",
+        "assets/img/db_structure.png",
+        # Unminified or unused builds of vendor files.
+        "assets/css/material-kit.css",
+        "assets/css/material-kit.css.map",
+        "assets/js/material-kit.js",
+        "assets/js/material-kit.js.map",
+        "assets/js/core/bootstrap.bundle.min.js",
+        "assets/js/plugins/typedjs.js",
+        "assets/js/plugins/moment.min.js",
+        "assets/js/plugins/flatpickr.min.js",
+        "assets/fonts/nucleo.*",
+    ]
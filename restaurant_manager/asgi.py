@@ -9,8 +9,26 @@ https://docs.djangoproject.com/en/5.2/howto/deployment/asgi/
 
 import os
 
+from django.conf import settings
 from django.core.asgi import get_asgi_application
+from django.core.exceptions import ImproperlyConfigured
 
-os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'restaurant_manager.settings')
+from restaurant_manager.static_files import StaticFilesApplication
 
-application = get_asgi_application()
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'restaurant_manager.settings.production')
+# Persistent connections belong to a thread, and ASGI runs sync ORM code in
+# threads that come and go, so each of them would leak a connection. Open
+# one per request unless DB_CONNECTION_MODE asks for a pool.
+os.environ.setdefault('DB_CONNECTION_MODE', 'none')
+# Static files are served by StaticFilesApplication below, outside Django's
+# middleware, so no request waits on WhiteNoise's sync middleware.
+os.environ['STATIC_FILES_MIDDLEWARE'] = 'off'
+
+application = StaticFilesApplication(get_asgi_application())
+
+for alias, database in settings.DATABASES.items():
+    if database.get('CONN_MAX_AGE'):
+        raise ImproperlyConfigured(
+            f"Database {alias!r} uses persistent connections (CONN_MAX_AGE), "
+            "which leak under ASGI; set DB_CONNECTION_MODE to pool or none."
+        )
@@ -31,8 +31,9 @@ INSTALLED_APPS = [
     "django.contrib.contenttypes",
     "django.contrib.sessions",
     "django.contrib.messages",
-    "django.contrib.staticfiles",
-    "debug_toolbar",
+    # OpClass support for the trigram indexes in kitchen.indexes.
+    "django.contrib.postgres",
+    "restaurant_manager.apps.PrunedStaticFilesConfig",
     "kitchen",
     "crispy_forms",
     "crispy_bootstrap5",
@@ -42,20 +43,28 @@ INSTALLED_APPS = [
 MIDDLEWARE = [
     "django.middleware.security.SecurityMiddleware",
     "whitenoise.middleware.WhiteNoiseMiddleware",
-    "debug_toolbar.middleware.DebugToolbarMiddleware",
+    "kitchen.instrumentation.InstrumentationMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
-    "django.contrib.auth.middleware.AuthenticationMiddleware",
+    # Django's, moving sessions of the plain ModelBackend to the cached one.
+    "kitchen.auth.AuthenticationMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
 ]
 
+# WhiteNoise is sync-only middleware, which would send every request under
+# ASGI through a thread; restaurant_manager/asgi.py turns it off and serves
+# static files in front of Django (restaurant_manager.static_files).
+if os.environ.get("STATIC_FILES_MIDDLEWARE", "on") == "off":
+    MIDDLEWARE.remove("whitenoise.middleware.WhiteNoiseMiddleware")
+
 ROOT_URLCONF = "restaurant_manager.urls"
 
 TEMPLATES = [
     {
-        "BACKEND": "django.template.backends.django.DjangoTemplates",
+        # DjangoTemplates that reports render time to the instrumentation.
+        "BACKEND": "kitchen.instrumentation.DjangoTemplates",
         "DIRS": [BASE_DIR / "templates"],
         "APP_DIRS": True,
         "OPTIONS": {
@@ -63,7 +72,6 @@ TEMPLATES = [
                 "django.template.context_processors.request",
                 "django.contrib.auth.context_processors.auth",
                 "django.contrib.messages.context_processors.messages",
-                "kitchen.context_processors.cfg_assets_root",
             ],
         },
     },
@@ -72,6 +80,29 @@ TEMPLATES = [
 WSGI_APPLICATION = "restaurant_manager.wsgi.application"
 
 
+# Cache
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+
+# "templates" holds {% cache %} fragments of the page chrome. It is kept in
+# process memory on purpose: a restart (deploy) drops fragments that may
+# point at static files of the previous release.
+
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "restaurant-kitchen-manager",
+    },
+    "templates": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "restaurant-kitchen-manager-templates",
+    },
+    "users": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "restaurant-kitchen-manager-users",
+    },
+}
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 
@@ -109,8 +140,6 @@ USE_TZ = True
 STATIC_URL = "static/"
 STATIC_ROOT = "staticfiles/"
 
-ASSETS_ROOT = "static/assets"
-
 STATICFILES_DIRS = [
     BASE_DIR / "static",
 ]
@@ -121,12 +150,41 @@ DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
 AUTH_USER_MODEL = "kitchen.Cook"
 
+# Loads request.user from the in-process "users" cache (see kitchen.auth).
+# Sessions started under ModelBackend are moved to it by
+# kitchen.auth.AuthenticationMiddleware.
+AUTHENTICATION_BACKENDS = [
+    "kitchen.auth.CachedModelBackend",
+]
+
 LOGIN_URL = '/registration/login/'
 
 LOGIN_REDIRECT_URL = "/"
 
 CRISPY_TEMPLATE_PACK = "bootstrap5"
 
-INTERNAL_IPS = [
-    "127.0.0.1",
-]
\ No newline at end of file
+# Where the home page visit counter is stored: SignedCookieVisitCounter keeps
+# it client-side, CacheVisitCounter in the cache, SessionVisitCounter in the
+# session (one django_session UPDATE per visit with the database backend).
+VISIT_COUNTER_BACKEND = os.environ.get(
+    "VISIT_COUNTER_BACKEND", "kitchen.visits.SignedCookieVisitCounter"
+)
+
+# Seconds a rendered list/detail page stays cached (0 disables the cache).
+# Any menu change retires all cached pages at once, so this only bounds how
+# long stale generations occupy memory.
+KITCHEN_RESPONSE_CACHE_TIMEOUT = int(os.environ.get("KITCHEN_RESPONSE_CACHE_TIMEOUT", 600))
+
+# Seconds a logged-in cook is served from the "users" cache (0 disables it).
+# The worker that saves a cook drops its entry; the others see the change
+# (a new password, deactivation) once theirs expires, so keep this short.
+KITCHEN_USER_CACHE_TIMEOUT = int(os.environ.get("KITCHEN_USER_CACHE_TIMEOUT", 10))
+
+# Dish types with more dishes than this are deleted by a background job
+# (run_kitchen_worker) rather than inside the request.
+KITCHEN_BACKGROUND_DELETE_DISHES = int(os.environ.get("KITCHEN_BACKGROUND_DELETE_DISHES", 5000))
+
+# Who receives per-request query count, DB/template time and latency as a
+# Server-Timing header: "staff", "all" or "off" (kitchen.instrumentation
+# always logs and aggregates).
+KITCHEN_SERVER_TIMING = os.environ.get("KITCHEN_SERVER_TIMING", "staff")
@@ -1,3 +1,5 @@
+import os
+
 from .base import *
 
 # SECURITY WARNING: don't run with debug turned on in production!
@@ -5,6 +7,22 @@ DEBUG = True
 
 ALLOWED_HOSTS = []
 
+# Development-only tooling; production never imports it.
+
+INSTALLED_APPS = [*INSTALLED_APPS, "debug_toolbar"]
+
+# Same position the toolbar had in the shared stack: right after WhiteNoise
+# (which ASGI leaves out), ahead of the instrumentation.
+MIDDLEWARE = [*MIDDLEWARE]
+MIDDLEWARE.insert(
+    MIDDLEWARE.index("kitchen.instrumentation.InstrumentationMiddleware"),
+    "debug_toolbar.middleware.DebugToolbarMiddleware",
+)
+
+INTERNAL_IPS = [
+    "127.0.0.1",
+]
+
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
 
@@ -14,3 +32,16 @@ DATABASES = {
         "NAME": BASE_DIR / "db.sqlite3",
     }
 }
+
+# Timings for every request, whoever is logged in.
+KITCHEN_SERVER_TIMING = os.environ.get("KITCHEN_SERVER_TIMING", "all")
+
+# Cache
+# Template edits show up without a restart, so fragments are not cached.
+
+CACHES = {
+    **CACHES,
+    "templates": {
+        "BACKEND": "django.core.cache.backends.dummy.DummyCache",
+    },
+}
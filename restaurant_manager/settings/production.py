@@ -1,5 +1,7 @@
 import os
 
+from django.core.exceptions import ImproperlyConfigured
+
 from .base import *
 
 # SECURITY WARNING: don't run with debug turned on in production!
@@ -23,4 +25,117 @@ DATABASES = {
         "HOST": os.environ["POSTGRES_HOST"],
         "PORT": int(os.environ["POSTGRES_DB_PORT"]),
     }
-}
\ No newline at end of file
+}
+
+# Connection reuse
+# "persistent" keeps one connection per worker thread open for
+# DB_CONN_MAX_AGE seconds and checks it before reuse; "pool" shares a
+# psycopg 3 connection pool (requires psycopg[pool]) per process; "none"
+# reconnects on every request. restaurant_manager/asgi.py defaults to "none"
+# and refuses "persistent", whose per-thread connections leak under ASGI.
+# https://docs.djangoproject.com/en/5.2/ref/databases/#persistent-connections
+# https://docs.djangoproject.com/en/5.2/ref/databases/#connection-pool
+
+DB_CONNECTION_MODE = os.environ.get("DB_CONNECTION_MODE", "persistent")
+
+if DB_CONNECTION_MODE == "persistent":
+    DATABASES["default"]["CONN_MAX_AGE"] = int(os.environ.get("DB_CONN_MAX_AGE", 600))
+    DATABASES["default"]["CONN_HEALTH_CHECKS"] = True
+elif DB_CONNECTION_MODE == "pool":
+    DATABASES["default"]["OPTIONS"] = {
+        "pool": {
+            "min_size": int(os.environ.get("DB_POOL_MIN_SIZE", 2)),
+            "max_size": int(os.environ.get("DB_POOL_MAX_SIZE", 10)),
+            "timeout": float(os.environ.get("DB_POOL_TIMEOUT", 10)),
+        },
+    }
+elif DB_CONNECTION_MODE != "none":
+    raise ImproperlyConfigured(
+        f"DB_CONNECTION_MODE must be persistent, pool or none, not {DB_CONNECTION_MODE!r}."
+    )
+
+# Cache
+# Shared between gunicorn workers so incrementally maintained counters agree.
+# Past MAX_ENTRIES rows Django deletes every CULL_FREQUENCY-th row in key
+# order, so the board events, counters and response generation (which sort
+# before the per-user "kitchen:response:" pages) would go first. The default
+# leaves room for the page cache: about one entry per user and visited URL
+# per KITCHEN_RESPONSE_CACHE_TIMEOUT, e.g. 100 cooks opening 150 pages each,
+# plus the board events of the last five minutes.
+# https://docs.djangoproject.com/en/5.2/topics/cache/#database-caching
+# https://docs.djangoproject.com/en/5.2/topics/cache/#cache-arguments
+
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.db.DatabaseCache",
+        "LOCATION": "kitchen_cache",
+        "OPTIONS": {
+            "MAX_ENTRIES": int(os.environ.get("CACHE_MAX_ENTRIES", 20000)),
+            "CULL_FREQUENCY": 3,
+        },
+    },
+    "templates": CACHES["templates"],
+    "users": CACHES["users"],
+}
+
+# Templates
+# Compiled templates are kept for the life of the process; fragments of the
+# navigation, footer and scripts are cached in the "templates" cache.
+# https://docs.djangoproject.com/en/5.2/ref/templates/api/#django.template.loaders.cached.Loader
+
+TEMPLATES = [
+    {
+        **TEMPLATES[0],
+        "APP_DIRS": False,
+        "OPTIONS": {
+            **TEMPLATES[0]["OPTIONS"],
+            "loaders": [
+                (
+                    "django.template.loaders.cached.Loader",
+                    [
+                        "django.template.loaders.filesystem.Loader",
+                        "django.template.loaders.app_directories.Loader",
+                    ],
+                ),
+            ],
+        },
+    },
+]
+
+# Static files
+# collectstatic writes content-hashed copies with gzip and brotli variants;
+# WhiteNoise serves hashed names with a one-year immutable Cache-Control.
+# https://whitenoise.readthedocs.io/en/stable/django.html#add-compression-and-caching-support
+
+STORAGES = {
+    "default": {
+        "BACKEND": "django.core.files.storage.FileSystemStorage",
+    },
+    "staticfiles": {
+        "BACKEND": "whitenoise.storage.CompressedManifestStaticFilesStorage",
+    },
+}
+
+# Templates only link hashed names (enforced by kitchen.checks).
+WHITENOISE_KEEP_ONLY_HASHED_FILES = True
+
+# Logging
+# One line per request from kitchen.instrumentation; the measurements are
+# also attached to the record (view, status, queries, db_ms, template_ms,
+# total_ms) for structured handlers.
+# https://docs.djangoproject.com/en/5.2/topics/logging/
+
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "handlers": {
+        "console": {"class": "logging.StreamHandler"},
+    },
+    "loggers": {
+        "kitchen.instrumentation": {
+            "handlers": ["console"],
+            "level": os.environ.get("KITCHEN_INSTRUMENTATION_LOG_LEVEL", "INFO"),
+            "propagate": False,
+        },
+    },
+}
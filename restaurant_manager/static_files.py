@@ -0,0 +1,59 @@
+"""
+Static files for the ASGI application, served in front of Django.
+
+WhiteNoise's middleware is sync-only, so under ASGI Django adapts it, and
+with it every request, through ``sync_to_async`` and a thread. This wraps
+the ASGI application instead: it answers paths WhiteNoise knows with the
+same files and headers, and passes everything else straight to Django,
+whose middleware stack then runs without WhiteNoise (see settings.base).
+"""
+from whitenoise.middleware import WhiteNoiseMiddleware
+
+CHUNK_SIZE = 64 * 1024
+
+
+class StaticFilesApplication:
+    def __init__(self, application):
+        self.application = application
+        # Only its file index and response headers are used.
+        self.whitenoise = WhiteNoiseMiddleware()
+
+    def find_file(self, path):
+        if self.whitenoise.autorefresh:
+            return self.whitenoise.find_file(path)
+        return self.whitenoise.files.get(path)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http":
+            path = scope["path"]
+            root_path = scope.get("root_path", "")
+            if root_path and path.startswith(root_path):
+                path = path[len(root_path):]
+            static_file = self.find_file(path)
+            if static_file is not None:
+                await self.serve(static_file, scope, send)
+                return
+        await self.application(scope, receive, send)
+
+    @staticmethod
+    async def serve(static_file, scope, send):
+        headers = {
+            "HTTP_" + name.decode("latin-1").upper().replace("-", "_"): value.decode("latin-1")
+            for name, value in scope["headers"]
+        }
+        response = static_file.get_response(scope["method"], headers)
+        await send({
+            "type": "http.response.start",
+            "status": int(response.status),
+            "headers": [
+                (name.lower().encode("latin-1"), value.encode("latin-1"))
+                for name, value in response.headers
+            ],
+        })
+        if response.file is not None:
+            # Static assets are small and usually in the OS page cache, so
+            # they are read on the event loop rather than in a thread.
+            with response.file as file:
+                while chunk := file.read(CHUNK_SIZE):
+                    await send({"type": "http.response.body", "body": chunk, "more_body": True})
+        await send({"type": "http.response.body", "body": b""})
@@ -30,7 +30,11 @@ const paths = {
 
 // Compile SCSS
 gulp.task('scss', function() {
-    return gulp.src([paths.src.scss + '/material-kit.scss'])
+    return gulp.src([
+            paths.src.scss + '/material-kit.scss',
+            paths.src.scss + '/kitchen.scss',
+            paths.src.scss + '/auth.scss'
+        ])
         .pipe(wait(500))
         .pipe(sourcemaps.init())
         .pipe(sass().on('error', sass.logError))